@@ -0,0 +1,63 @@
+import argparse
+import importlib
+
+from SteamDBEngine import add_detail_args, add_session_args
+from SteamDBParse import BACKENDS
+
+# ===== 통합 CLI =====
+#   python SteamDB.py genre     [옵션]   장르별 인디 게임 상세 (SteamDBCollector)
+#   python SteamDB.py all-indie [옵션]   Indie 태그 전체 상세 (SteamDBCollector_AllIndie)
+#   python SteamDB.py yearly    [옵션]   장르별 연도별 게임 수 (SteamDBMaker)
+#   python SteamDB.py reprocess [옵션]   --archive 보관소만으로 상세 CSV 재추출 (SteamDBArchive, 네트워크 없음)
+# 모드 모듈(requests/세션 생성 포함)은 고른 하위 명령을 실행하기 직전에만 불러온다.
+# 기존 스크립트(python SteamDBCollector.py ...)는 같은 하위 명령으로 넘어오는 얇은 진입점이다.
+COMMANDS = {
+    "genre": "SteamDBCollector",
+    "all-indie": "SteamDBCollector_AllIndie",
+    "yearly": "SteamDBMaker",
+    "reprocess": "SteamDBArchive",
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Steam 인디 게임 수집기")
+    sub = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+
+    p = sub.add_parser("genre", help="장르별 인디 게임 상세 수집", description="Steam 장르별 인디 게임 상세 수집")
+    add_detail_args(p, "IndieGameDetailList", "장르")
+    p.add_argument("--merge-genres", action="store_true",
+                   help="앱당 한 행으로 출력하고 Genre 열에 모든 장르를 ';'로 표기")
+    add_session_args(p)
+
+    p = sub.add_parser("all-indie", help="Indie 태그 전체 상세 수집", description="Steam Indie 태그 전체 수집")
+    add_detail_args(p, "IndieGameDetailList_AllIndie", "'Indie'")
+    add_session_args(p)
+
+    p = sub.add_parser("yearly", help="장르별 연도별 게임 수", description="Steam 인디 장르별 연도별 게임 수")
+    p.add_argument("--output", default="IndieGenreYearlyCount.csv", help="출력 CSV 경로")
+    p.add_argument("--single-pass", action="store_true",
+                   help="장르마다 따로 검색하지 않고 Indie 전체를 한 번 훑어 행의 태그 목록으로 집계 "
+                        "(장르당 상한 없음, 검색 행에 실리는 상위 태그만 반영)")
+    p.add_argument("--workers", type=int, help="동시에 수집할 장르 수 (기본: SteamDBMaker.GENRE_WORKERS)")
+    add_session_args(p)
+
+    p = sub.add_parser("reprocess", help="보관소에서 상세 CSV 재추출",
+                       description="--archive 로 모아 둔 원본 응답만으로 추출을 CPU 코어 수만큼 나눠 다시 실행")
+    p.add_argument("--archive", metavar="DIR", required=True, help="수집할 때 --archive 로 지정한 디렉터리")
+    p.add_argument("--mode", choices=["all-indie", "genre"], default="all-indie", help="다시 만들 수집 모드")
+    p.add_argument("--output", help="출력 CSV 경로 (기본: 모드의 기본 출력 파일)")
+    p.add_argument("--processes", type=int, help="워커 프로세스 수 (기본: CPU 코어 수)")
+    p.add_argument("--pages-per-task", type=int, default=1, help="all-indie: 작업 하나에 묶을 검색 페이지 수")
+    p.add_argument("--parser", choices=sorted(BACKENDS), help="HTML 파서 백엔드")
+    return parser
+
+
+def main(argv=None, module=None):
+    """module: 이미 불러온 모드 모듈 (기존 스크립트를 직접 실행한 경우의 __main__)"""
+    args = build_parser().parse_args(argv)
+    module = module or importlib.import_module(COMMANDS[args.command])
+    module.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,97 +1,70 @@
-import requests
-from bs4 import BeautifulSoup
-import time
-from datetime import datetime
 import csv
+from contextlib import closing
 
-# 태그 ID
-TAG_INDY = 492
-GENRE_TAGS = {
-    'Action': 19,
-    'Adventure': 21,
-    'RPG': 122,
-    'Strategy': 9,
-    'Simulation': 599,
-    'Casual': 597,
-    'Racing': 699,
-    'Sports': 701,
-    'Puzzle': 1664,
-    'Platformer': 1625,
-    'Deckbuilding': 17389
-}
+from SteamDBBreaker import NegativeCache
+from SteamDBCommon import GENRE_TAGS, TAG_INDY, UNAVAILABLE, USER_AGENT, clean_price, try_parse_date
+from SteamDBEngine import fetch_steamspy_details, make_crawl_session
+from SteamDBRecord import intern_text
+from SteamDBSearch import HTML_PAGE_SIZE, iter_search_pages
+from SteamDBTransport import connection_summary
 
-USER_AGENT = {"User-Agent": "Mozilla/5.0"}
-SEARCH_URL = "https://store.steampowered.com/search/?tags={tag1},{tag2}&category1=998&page={page}"
-STEAMSPY_URL = "https://steamspy.com/api.php?request=appdetails&appid={appid}"
+SEARCH_QUERY_TMPL = "tags={tag1},{tag2}&category1=998"
+MAX_PAGES = 20  # 장르당 최대 20페이지 (25행 기준)
 
-def try_parse_date(text):
-    formats = ["%Y년 %m월 %d일", "%d %b, %Y", "%b %d, %Y"]
-    for fmt in formats:
-        try:
-            return datetime.strptime(text, fmt)
-        except ValueError:
-            continue
-    return None
+# 세션 + 호스트별 요청 예산(고정 sleep 대신)
+session, rate_limiter = make_crawl_session(1, headers=USER_AGENT, cookies=None)  # 요청을 하나씩 보내므로 연결 하나를 계속 재사용
+
+# 실패로 확인된 SteamSpy 조회 (이번 실행 안에서만, 다시 보내지 않음)
+negative_cache = NegativeCache()
 
 def fetch_reviews_from_steamspy(appid):
-    try:
-        url = STEAMSPY_URL.format(appid=appid)
-        response = requests.get(url, timeout=10)
-        data = response.json()
-        return data.get('positive', 0), data.get('negative', 0)
-    except:
-        return 0, 0
+    """(긍정, 부정) 리뷰 수. 조회 실패(차단기 열림 포함)는 0개와 구분해 UNAVAILABLE"""
+    data = fetch_steamspy_details(session, appid, negative_cache)
+    if data is None:
+        return UNAVAILABLE, UNAVAILABLE
+    return data.get('positive', 0), data.get('negative', 0)
 
-def clean_price(text):
-    if not text:
-        return "Unknown"
-    text = text.strip().replace('\n', '').replace('\r', '')
+def normalize_price(text):
+    """이 스크립트의 기존 Price 표기: 무료는 "Free", 원화는 마지막 ₩ 가격만 (할인 전/후가 같이 있을 때)"""
+    text = clean_price(text)
     if "무료" in text or "Free" in text:
         return "Free"
     if "₩" in text:
-        parts = text.split('₩')
-        return "₩" + parts[-1].strip()
+        return "₩" + text.split('₩')[-1].strip()
     return text.strip()
 
+def parse_search_items(items, year_range):
+    """검색 행 dict(SteamDBParse) → (appid, 제목, 연도, 가격) (연도 범위 밖/파싱 실패는 제외)"""
+    rows = []
+    for item in items:
+        try:
+            appid = item['href'].split("/app/")[1].split("/")[0]
+            title = item['title'].strip()
+            release_date = try_parse_date(item['released'])
+            if not release_date or release_date.year not in year_range:
+                continue
+            rows.append((appid, title, release_date.year, intern_text(normalize_price(item['price'] or ""))))
+        except Exception:
+            continue
+    return rows
+
 def collect_game_data():
     results = []
     year_range = range(2010, 2026)
 
     for genre_name, genre_id in GENRE_TAGS.items():
         print(f"\n▶ {genre_name} 장르 수집 중...")
-        for page in range(1, 21):  # 최대 20페이지
-            url = SEARCH_URL.format(tag1=TAG_INDY, tag2=genre_id, page=page)
-            print(f"요청 중: {url}")
-            try:
-                res = requests.get(url, headers=USER_AGENT, timeout=10)
-            except Exception as e:
-                print(f"요청 실패: {e}")
-                break
-
-            soup = BeautifulSoup(res.text, 'html.parser')
-            items = soup.select('.search_result_row')
-            if not items:
-                break
-
-            for item in items:
-                try:
-                    link = item['href']
-                    appid = link.split("/app/")[1].split("/")[0]
-                    title = item.select_one('.title').text.strip()
-                    release_text = item.select_one('.search_released').get_text(strip=True)
-                    release_date = try_parse_date(release_text)
-                    if not release_date or release_date.year not in year_range:
-                        continue
-                    year = release_date.year
-                    price_raw = item.select_one('.search_price')
-                    price = clean_price(price_raw.text if price_raw else "")
-
-                    pos, neg = fetch_reviews_from_steamspy(appid)
-                    results.append([appid, title, year, genre_name, price, pos, neg])
-                    time.sleep(0.5)
-                except Exception:
-                    continue
-            time.sleep(1)
+        # 검색은 다른 수집기와 같은 경로 (JSON 우선·HTML 폴백, 파서 백엔드, 계측)
+        query = SEARCH_QUERY_TMPL.format(tag1=TAG_INDY, tag2=genre_id)
+        try:
+            with closing(iter_search_pages(session, query, prefetch=1, page_size=HTML_PAGE_SIZE,
+                                           end_page=MAX_PAGES)) as pages:
+                for _, items in pages:
+                    for appid, title, year, price in parse_search_items(items, year_range):
+                        pos, neg = fetch_reviews_from_steamspy(appid)
+                        results.append((int(appid) if appid.isdigit() else appid, title, year, genre_name, price, pos, neg))
+        except Exception as e:
+            print(f"요청 실패: {e}")
 
     return results
 
@@ -104,3 +77,5 @@ if __name__ == "__main__":
         writer.writerow(header)
         writer.writerows(data)
     print("\n✅ IndieGameDetailList.csv 저장 완료!")
+    print(rate_limiter.summary())
+    print(connection_summary(session))
@@ -0,0 +1,316 @@
+import hashlib
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from SteamDBBreaker import FAILURE_STATUSES
+from SteamDBMetrics import metrics
+
+# ===== 원본 응답 보관소 (압축, 추가 전용) =====
+# 수집 중 받은 검색 페이지/API/앱 페이지 응답을 세그먼트 파일 끝에 WARC 레코드로 덧붙인다.
+# - 레코드마다 독립된 압축 프레임(gzip 멤버, zstandard 가 있으면 zstd 프레임)이라
+#   index.sqlite 의 (세그먼트, 오프셋, 길이)만으로 레코드 하나를 바로 풀 수 있다.
+#   .warc.gz 세그먼트는 일반 WARC 도구로도 읽힌다.
+# - 같은 URL 의 본문이 직전 레코드와 같으면(캐시 적중 등) 다시 쓰지 않는다.
+# - 같은 URL 이 여러 번 있으면 가장 최근 레코드를 쓴다.
+# reprocess 는 네트워크 없이 보관소만으로 추출(검색 행 파싱 → 리뷰 수 → 행)을 CPU 코어 수만큼 나눠 다시 돌린다.
+SEGMENT_BYTES = 512 * 1024 * 1024   # 세그먼트 하나의 최대 크기 (넘으면 다음 번호로)
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+INDEX_FILE = "index.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    url          TEXT NOT NULL,
+    fetched_at   REAL NOT NULL,
+    segment      TEXT NOT NULL,
+    offset       INTEGER NOT NULL,
+    length       INTEGER NOT NULL,   -- 압축된 레코드 길이
+    status       INTEGER NOT NULL,
+    content_type TEXT,
+    sha1         TEXT NOT NULL       -- 본문 해시 (중복 기록 방지)
+);
+CREATE INDEX IF NOT EXISTS records_url ON records (url, fetched_at);
+"""
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+def _compress(data, codec):
+    if codec == "zstd":
+        return _zstd().ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    c = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # wbits=31: gzip 멤버
+    return c.compress(data) + c.flush()
+
+
+def _decompress(data, codec):
+    if codec == "zstd":
+        zstandard = _zstd()
+        if zstandard is None:
+            raise RuntimeError("zstd 세그먼트를 읽으려면 zstandard 가 필요합니다 (pip install zstandard)")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data, 31)
+
+
+def _codec_of(segment):
+    return "zstd" if segment.endswith(".zst") else "gzip"
+
+
+def warc_record(url, status, content_type, body, fetched_at):
+    """WARC/1.1 response 레코드 (HTTP 블록은 상태 줄 + Content-Type + 본문)"""
+    try:
+        reason = HTTPStatus(status).phrase
+    except ValueError:
+        reason = ""
+    http = (f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type or 'application/octet-stream'}\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+    date = datetime.fromtimestamp(fetched_at, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    head = (f"WARC/1.1\r\nWARC-Type: response\r\nWARC-Record-ID: <urn:uuid:{uuid.uuid4()}>\r\n"
+            f"WARC-Date: {date}\r\nWARC-Target-URI: {url}\r\n"
+            f"Content-Type: application/http; msgtype=response\r\nContent-Length: {len(http)}\r\n\r\n")
+    return head.encode("utf-8") + http + b"\r\n\r\n"
+
+
+def warc_body(record):
+    """warc_record 의 역: HTTP 본문만"""
+    head_end = record.index(b"\r\n\r\n")
+    length = next(int(line.split(b":", 1)[1]) for line in record[:head_end].split(b"\r\n")
+                  if line.lower().startswith(b"content-length:"))
+    block = record[head_end + 4:head_end + 4 + length]
+    return block[block.index(b"\r\n\r\n") + 4:]
+
+
+class RawArchive:
+    """path 디렉터리의 세그먼트 + 색인. writable=False 면 읽기만 (reprocess 워커마다 하나씩)"""
+
+    def __init__(self, path, writable=True):
+        self.path = path
+        self.writable = writable
+        if writable:
+            os.makedirs(path, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(path, INDEX_FILE), check_same_thread=False)
+        if writable:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        # URL → 가장 최근 레코드 (segment, offset, length, status, content_type, sha1)
+        self.latest = {}
+        for url, *entry in self.conn.execute(
+                "SELECT url, segment, offset, length, status, content_type, sha1 FROM records ORDER BY fetched_at"):
+            self.latest[url] = tuple(entry)
+        self.codec = "zstd" if _zstd() is not None else "gzip"
+        self.segment = None
+        self.file = None
+        self.stats = {"records": 0, "duplicates": 0, "raw_bytes": 0, "stored_bytes": 0}
+
+    def __len__(self):
+        return len(self.latest)
+
+    # --- 쓰기 ---
+    def _open_segment(self):
+        """현재 세그먼트가 없거나 가득 찼으면 마지막 세그먼트(또는 다음 번호)를 이어서 엶"""
+        if self.file is not None and self.file.tell() < SEGMENT_BYTES:
+            return
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        ext = ".warc.zst" if self.codec == "zstd" else ".warc.gz"
+        names = sorted(name for name in os.listdir(self.path) if name.startswith("segment-"))
+        number = int(names[-1][len("segment-"):][:5]) if names else 0
+        if names and (names[-1] != f"segment-{number:05d}{ext}" or
+                      os.path.getsize(os.path.join(self.path, names[-1])) >= SEGMENT_BYTES):
+            number += 1
+        self.segment = f"segment-{number:05d}{ext}"
+        self.file = open(os.path.join(self.path, self.segment), "ab")
+
+    def add(self, url, status, content_type, body):
+        sha1 = hashlib.sha1(body).hexdigest()
+        fetched_at = time.time()
+        with self.lock:
+            previous = self.latest.get(url)
+            if previous is not None and previous[5] == sha1 and previous[3] == status:
+                self.stats["duplicates"] += 1
+                metrics.count("archive.duplicate")
+                return
+            data = _compress(warc_record(url, status, content_type, body, fetched_at), self.codec)
+            self._open_segment()
+            offset = self.file.tell()
+            self.file.write(data)
+            self.file.flush()
+            entry = (self.segment, offset, len(data), status, content_type or "", sha1)
+            with self.conn:
+                self.conn.execute("INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (url, fetched_at, *entry))
+            self.latest[url] = entry
+            self.stats["records"] += 1
+            self.stats["raw_bytes"] += len(body)
+            self.stats["stored_bytes"] += len(data)
+        metrics.count("archive.record")
+
+    # --- 읽기 ---
+    def load(self, url):
+        """(status, content_type, body) 또는 None (FixtureStore.load 와 같은 꼴)"""
+        entry = self.latest.get(url)
+        if entry is None:
+            return None
+        segment, offset, length, status, content_type, _ = entry
+        with open(os.path.join(self.path, segment), "rb") as f:
+            f.seek(offset)
+            data = f.read(length)
+        return status, content_type, warc_body(_decompress(data, _codec_of(segment)))
+
+    def summary(self):
+        s = self.stats
+        ratio = s["stored_bytes"] / s["raw_bytes"] if s["raw_bytes"] else 0.0
+        return (f"[보관소] {self.path}: 새 레코드 {s['records']}개 (같은 본문 건너뜀 {s['duplicates']}) / "
+                f"원본 {s['raw_bytes'] / 1e6:.1f}MB → {self.codec} {s['stored_bytes'] / 1e6:.1f}MB ({ratio:.0%}), "
+                f"전체 URL {len(self.latest)}개")
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+            self.conn.close()
+
+
+# ===== requests 어댑터 =====
+class ArchivingAdapter(BaseAdapter):
+    """안쪽 체인(캐시 포함)의 GET 응답 본문을 보관소에 덧붙임 — 파서가 본 것과 같은 바이트.
+    재시도 후에도 429/5xx 인 응답은 남기지 않음 (앞서 받은 정상 레코드를 가리지 않도록)"""
+
+    def __init__(self, archive, inner):
+        super().__init__()
+        self.archive = archive
+        self.inner = inner
+
+    def send(self, request, **kwargs):
+        resp = self.inner.send(request, **kwargs)
+        if request.method == "GET" and resp.status_code not in FAILURE_STATUSES:
+            self.archive.add(request.url, resp.status_code, resp.headers.get("Content-Type"), resp.content)
+        return resp
+
+    def close(self):
+        self.inner.close()
+
+
+class ArchiveAdapter(BaseAdapter):
+    """네트워크 대신 보관소의 최근 레코드로 응답 (없으면 404, 녹화 재생 서버와 같음)"""
+
+    def __init__(self, archive):
+        super().__init__()
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        found = self.archive.load(request.url)
+        status, content_type, body = found if found is not None else (404, "text/plain", b"not archived")
+        metrics.count("archive.served" if found is not None else "archive.missing")
+        resp = Response()
+        resp.status_code = status
+        resp.headers = CaseInsensitiveDict({"Content-Type": content_type, "Content-Length": str(len(body))})
+        resp.encoding = get_encoding_from_headers(resp.headers)  # HTTPAdapter.build_response 와 같게
+        resp._content = body
+        resp.url = request.url
+        resp.request = request
+        resp.reason = "OK" if status < 400 else "Not Found"
+        return resp
+
+    def close(self):
+        pass
+
+
+def install_archiver(session, path):
+    """세션의 현재 어댑터 체인 바깥에 보관 어댑터를 씌움 (계측 설치 전에 호출)"""
+    archive = RawArchive(path)
+    adapter = ArchivingAdapter(archive, session.get_adapter("https://"))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    print(f"[보관소] 원본 응답을 {path} 에 {archive.codec} 세그먼트로 덧붙입니다 (기존 URL {len(archive)}개)")
+    return archive
+
+
+def install_archive_reader(session, archive):
+    """세션 전체(요청 예산/캐시/차단기 포함)를 보관소 읽기 어댑터로 바꿈 — 대기도 네트워크도 없음"""
+    adapter = ArchiveAdapter(archive)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
+# ===== reprocess: 보관소만으로 추출을 병렬로 다시 실행 =====
+# SteamDBShard 의 작업 분할(pages: Indie 검색 페이지 구간 / genre: 장르별)과 결정적 병합을 그대로 쓰고,
+# 워커 프로세스마다 두 수집기 세션을 보관소 읽기 어댑터로 바꾼다.
+SPLITS = {"all-indie": "pages", "genre": "genre"}
+OUTPUTS = {"all-indie": "IndieGameDetailList_AllIndie.csv", "genre": "IndieGameDetailList.csv"}
+_worker_archive = None
+
+
+def _init_worker(path, parser):
+    global _worker_archive
+    import SteamDBCollector
+    import SteamDBCollector_AllIndie
+    from SteamDBParse import set_parser
+    set_parser(parser)
+    _worker_archive = RawArchive(path, writable=False)
+    # 원래 실행처럼 SteamSpy 대량 색인도 보관소에서 채움 (없으면 appdetails 레코드로)
+    for module, tags in ((SteamDBCollector, list(SteamDBCollector.GENRE_TAGS)),
+                         (SteamDBCollector_AllIndie, [SteamDBCollector_AllIndie.SCOPE])):
+        install_archive_reader(module.session, _worker_archive)
+        module.steamspy_index.load_tags(module.session, tags)
+
+
+class _Rows(list):
+    write = list.append
+
+
+def _run_task(task):
+    from SteamDBShard import RUNNERS
+    rows = _Rows()
+    RUNNERS[task["kind"]](task, rows)
+    return rows
+
+
+def reprocess(path, mode, out_path, processes=None, pages_per_task=1, parser=None):
+    """보관소 → out_path CSV (네트워크 없음). 행 순서/중복 제거는 순차 수집과 같음."""
+    import SteamDBCollector
+    import SteamDBCollector_AllIndie
+    from SteamDBShard import merge_rows, plan_tasks, task_header
+
+    if not os.path.exists(os.path.join(path, INDEX_FILE)):
+        raise SystemExit(f"보관소가 없습니다: {path} (수집할 때 --archive {path})")
+    archive = RawArchive(path, writable=False)
+    for module in (SteamDBCollector, SteamDBCollector_AllIndie):
+        install_archive_reader(module.session, archive)
+    split = SPLITS[mode]
+    tasks, scope = plan_tasks(split, pages_per_task)
+    processes = processes or os.cpu_count() or 1
+    print(f"[재처리] {path} (URL {len(archive)}개) → 작업 {len(tasks)}개, 프로세스 {processes}개")
+    start = time.monotonic()
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(path, parser)) as pool:
+        rows = [row for part in pool.imap(_run_task, tasks) for row in part]
+    written = merge_rows(rows, task_header(split), scope, out_path)
+    print(f"[재처리] {written}행, {time.monotonic() - start:.1f}초")
+    archive.close()
+    return written
+
+
+def run(args):
+    """SteamDB.py reprocess (옵션은 SteamDB.build_parser)"""
+    reprocess(args.archive, args.mode, args.output or OUTPUTS[args.mode], args.processes, args.pages_per_task,
+              args.parser)
@@ -0,0 +1,193 @@
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.adapters import BaseAdapter
+
+from SteamDBMetrics import endpoint_of, metrics
+
+# ===== 엔드포인트별 차단기 =====
+# 같은 엔드포인트(SteamSpy appdetails / appreviews / 앱 페이지 ...)가 연속 FAIL_THRESHOLD번 실패하면
+# (연결 오류·타임아웃, 또는 요청 예산의 재시도 후에도 429/5xx) 일정 시간 요청을 보내지 않고 바로 실패시킨다.
+# 남은 앱마다 10초 타임아웃을 기다리지 않게 하려는 것.
+# 열린 시간이 지나면 요청 하나만 시험으로 보내(half-open) 성공하면 닫고, 실패하면 두 배로 더 오래 연다.
+FAIL_THRESHOLD = 5
+OPEN_SECONDS = 30.0
+MAX_OPEN_SECONDS = 600.0
+FAILURE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """차단기가 열려 있어 요청을 보내지 않음"""
+
+
+class CircuitBreakers:
+    def __init__(self, threshold=FAIL_THRESHOLD, open_seconds=OPEN_SECONDS, max_open_seconds=MAX_OPEN_SECONDS,
+                 clock=time.monotonic):
+        self.threshold = threshold
+        self.open_seconds = open_seconds
+        self.max_open_seconds = max_open_seconds
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.states = {}  # 엔드포인트 → 상태 dict
+
+    def _state(self, endpoint):
+        st = self.states.get(endpoint)
+        if st is None:
+            st = self.states[endpoint] = {"failures": 0, "open_until": None, "open_for": self.open_seconds,
+                                          "probing": False, "opened": 0, "rejected": 0}
+        return st
+
+    def before(self, endpoint):
+        """요청 직전: 열려 있으면 CircuitOpenError, 열린 시간이 지났으면 시험 요청 하나만 통과"""
+        with self.lock:
+            st = self._state(endpoint)
+            if st["open_until"] is None:
+                return
+            remaining = st["open_until"] - self.clock()
+            if remaining > 0 or st["probing"]:
+                st["rejected"] += 1
+                metrics.count(f"breaker.{endpoint}.rejected")
+                raise CircuitOpenError(f"{endpoint} 차단기 열림 ({max(0.0, remaining):.0f}초 남음)")
+            st["probing"] = True
+
+    def record(self, endpoint, ok):
+        with self.lock:
+            st = self._state(endpoint)
+            if ok:
+                if st["open_until"] is not None:
+                    print(f"[차단기] {endpoint} 시험 요청 성공 → 닫힘")
+                st.update(failures=0, open_until=None, open_for=self.open_seconds, probing=False)
+                return
+            st["failures"] += 1
+            if st["probing"]:
+                st["open_for"] = min(st["open_for"] * 2, self.max_open_seconds)
+            elif st["open_until"] is not None or st["failures"] < self.threshold:
+                return
+            st.update(open_until=self.clock() + st["open_for"], probing=False)
+            st["opened"] += 1
+            metrics.count(f"breaker.{endpoint}.opened")
+            print(f"[차단기] {endpoint} 연속 실패 {st['failures']}회 → {st['open_for']:.0f}초 동안 요청 중단")
+
+    def is_open(self, endpoint):
+        with self.lock:
+            st = self.states.get(endpoint)
+            return st is not None and st["open_until"] is not None
+
+    def summary(self):
+        with self.lock:
+            lines = [f"[차단기] {endpoint}: 열림 {st['opened']}회 / 빠른 실패 {st['rejected']}회"
+                     f"{' (지금 열림)' if st['open_until'] is not None else ''}"
+                     for endpoint, st in sorted(self.states.items()) if st["opened"]]
+        return "\n".join(lines) or "[차단기] 열린 엔드포인트 없음"
+
+
+class CircuitBreakerAdapter(BaseAdapter):
+    """캐시 안쪽, 요청 예산 바깥에서 엔드포인트별 차단기를 적용 (캐시 적중은 막지 않음)"""
+
+    def __init__(self, breakers, inner):
+        super().__init__()
+        self.breakers = breakers
+        self.inner = inner
+
+    def send(self, request, **kwargs):
+        endpoint = endpoint_of(request.url)
+        self.breakers.before(endpoint)
+        try:
+            resp = self.inner.send(request, **kwargs)
+        except Exception:
+            self.breakers.record(endpoint, False)
+            raise
+        self.breakers.record(endpoint, resp.status_code not in FAILURE_STATUSES)
+        return resp
+
+    def close(self):
+        self.inner.close()
+
+
+breakers = CircuitBreakers()
+
+
+def install_circuit_breaker(session, breakers_=None):
+    """세션의 현재 어댑터(요청 예산 포함)를 차단기로 감싼다. 제한기 설치 후, 캐시 설치 전에 호출."""
+    breakers_ = breakers_ or breakers
+    adapter = CircuitBreakerAdapter(breakers_, session.get_adapter("https://"))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return breakers_
+
+
+# ===== 실패 캐시 (negative cache) =====
+# 조회에 실패했거나 데이터가 없다고 확인된 (조회 종류, appid) 를 기억해 다시 묻지 않는다.
+#   failed  : 요청 오류/타임아웃 — 짧게 (일시 장애일 수 있음)
+#   no_data : 앱 페이지에 리뷰 요약이 없음 — 길게 (무거운 HTML 폴백을 매번 하지 않도록)
+# path 를 주면 SQLite 에 남겨 다음 실행에서도 쓴다.
+FAILED = "failed"
+NO_DATA = "no_data"
+NEGATIVE_TTLS = {FAILED: 3600, NO_DATA: 7 * 24 * 3600}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS negative (
+    lookup     TEXT NOT NULL,
+    appid      TEXT NOT NULL,
+    reason     TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (lookup, appid)
+) WITHOUT ROWID;
+"""
+
+
+class NegativeCache:
+    def __init__(self, path=None, ttls=NEGATIVE_TTLS):
+        self.ttls = ttls
+        self.entries = {}  # (lookup, appid) → (reason, expires_at)
+        self.conn = None
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, FAILED: 0, NO_DATA: 0}
+        if path:
+            self.open(path)
+
+    def open(self, path):
+        """SQLite 파일을 붙이고 만료 안 된 항목을 읽어 옴"""
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        now = time.time()
+        with conn:
+            conn.execute("DELETE FROM negative WHERE expires_at <= ?", (now,))
+        with self.lock:
+            for lookup, appid, reason, expires_at in conn.execute("SELECT * FROM negative"):
+                self.entries[(lookup, appid)] = (reason, expires_at)
+            self.conn = conn
+        if self.entries:
+            print(f"[실패 캐시] {path}: 건너뛸 조회 {len(self.entries)}개")
+
+    def get(self, lookup, appid):
+        """기억된 이유(FAILED / NO_DATA), 없거나 만료됐으면 None"""
+        with self.lock:
+            entry = self.entries.get((lookup, str(appid)))
+            if entry is None or entry[1] <= time.time():
+                return None
+            self.stats["hits"] += 1
+            return entry[0]
+
+    def add(self, lookup, appid, reason):
+        expires_at = time.time() + self.ttls[reason]
+        with self.lock:
+            self.entries[(lookup, str(appid))] = (reason, expires_at)
+            self.stats[reason] += 1
+            if self.conn is not None:
+                with self.conn:
+                    self.conn.execute("INSERT OR REPLACE INTO negative VALUES (?, ?, ?, ?)",
+                                      (lookup, str(appid), reason, expires_at))
+
+    def summary(self):
+        s = self.stats
+        return f"[실패 캐시] 건너뛴 조회 {s['hits']}회 / 새로 기록: 실패 {s[FAILED]}개, 데이터 없음 {s[NO_DATA]}개"
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
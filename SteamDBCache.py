@@ -0,0 +1,152 @@
+import json
+import sqlite3
+import threading
+import time
+
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# ===== 설정 =====
+# 엔드포인트별 TTL(초): URL에 부분 문자열이 포함되면 적용, 위에서부터 먼저 매칭
+ENDPOINT_TTLS = [
+    ("steamspy.com/api.php", 24 * 3600),          # SteamSpy 집계는 하루 단위 갱신
+    ("store.steampowered.com/appreviews/", 6 * 3600),
+    ("store.steampowered.com/app/", 24 * 3600),
+    ("store.steampowered.com/api/appdetails", 3600),  # 가격/할인은 세일 중 수시로 바뀜
+    ("store.steampowered.com/search/", 3600),     # 검색 목록은 자주 변함
+]
+# 캐시 응답에 남길 헤더 (본문은 이미 디코딩된 상태로 저장)
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Date")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url           TEXT PRIMARY KEY,
+    status        INTEGER,
+    headers       TEXT,
+    body          BLOB,
+    fetched_at    REAL,
+    etag          TEXT,
+    last_modified TEXT
+);
+"""
+
+
+def ttl_for(url, ttls=ENDPOINT_TTLS):
+    for pattern, ttl in ttls:
+        if pattern in url:
+            return ttl
+    return None
+
+
+# ===== 디스크 캐시 (SQLite) =====
+class ResponseCache:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.stats = {"hits": 0, "misses": 0, "revalidated": 0, "bypass": 0}
+
+    def get(self, url):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT status, headers, body, fetched_at, etag, last_modified FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, headers, body, fetched_at, etag, last_modified = row
+        return {"status": status, "headers": json.loads(headers), "body": body,
+                "fetched_at": fetched_at, "etag": etag, "last_modified": last_modified}
+
+    def put(self, url, status, headers, body):
+        kept = {k: headers[k] for k in KEPT_HEADERS if k in headers}
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (url, status, headers, body, fetched_at, etag, last_modified) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, status, json.dumps(kept), body, time.time(), kept.get("ETag"), kept.get("Last-Modified")),
+            )
+
+    def touch(self, url):
+        with self.lock, self.conn:
+            self.conn.execute("UPDATE responses SET fetched_at = ? WHERE url = ?", (time.time(), url))
+
+    def count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def summary(self):
+        s = self.stats
+        total = s["hits"] + s["misses"] + s["revalidated"]
+        rate = (s["hits"] + s["revalidated"]) / total * 100 if total else 0.0
+        return (f"[캐시] 적중 {s['hits']} / 재검증(304) {s['revalidated']} / 미스 {s['misses']} "
+                f"/ 캐시 제외 {s['bypass']} → 적중률 {rate:.1f}%")
+
+    def close(self):
+        self.conn.close()
+
+
+# ===== requests 어댑터 =====
+class CachingAdapter(BaseAdapter):
+    """내부 어댑터 앞단의 캐시. 신선한 응답은 네트워크(및 요청 예산) 없이 반환하고,
+    만료된 응답은 ETag/Last-Modified가 있으면 조건부 요청으로 재검증한다."""
+
+    def __init__(self, inner, cache, ttls=ENDPOINT_TTLS):
+        super().__init__()
+        self.inner = inner
+        self.cache = cache
+        self.ttls = ttls
+
+    def _from_cache(self, request, entry):
+        resp = Response()
+        resp.status_code = entry["status"]
+        resp.headers = CaseInsensitiveDict(entry["headers"])
+        resp._content = entry["body"]
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp.url = request.url
+        resp.request = request
+        resp.reason = "OK (cache)"
+        resp.from_cache = True
+        return resp
+
+    def send(self, request, **kwargs):
+        ttl = ttl_for(request.url, self.ttls)
+        if request.method != "GET" or ttl is None:
+            self.cache.count("bypass")
+            return self.inner.send(request, **kwargs)
+
+        entry = self.cache.get(request.url)
+        if entry and time.time() - entry["fetched_at"] < ttl:
+            self.cache.count("hits")
+            return self._from_cache(request, entry)
+
+        if entry and entry["etag"]:
+            request.headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            request.headers["If-Modified-Since"] = entry["last_modified"]
+
+        resp = self.inner.send(request, **kwargs)
+        if resp.status_code == 304 and entry:
+            self.cache.count("revalidated")
+            self.cache.touch(request.url)
+            resp.close()
+            return self._from_cache(request, entry)
+
+        self.cache.count("misses")
+        if resp.status_code == 200:
+            self.cache.put(request.url, resp.status_code, resp.headers, resp.content)
+        return resp
+
+    def close(self):
+        self.inner.close()
+
+
+def install_cache(session, path):
+    """세션의 현재 어댑터(요청 예산 포함)를 캐시로 감싼다. 반드시 제한기 설치 후 호출."""
+    cache = ResponseCache(path)
+    for prefix in ("https://", "http://"):
+        session.mount(prefix, CachingAdapter(session.get_adapter(prefix), cache))
+    return cache
@@ -0,0 +1,122 @@
+import json
+import sqlite3
+import threading
+
+from SteamDBSearch import SEARCH_PAGE_SIZE
+
+# ===== 크롤 체크포인트 (SQLite) =====
+# - pages   : 끝까지 파싱된 검색 페이지 (scope = 장르명 등)
+# - listing : 각 페이지에서 보강 대상으로 뽑힌 행 (검색 순서 유지)
+# - seen    : 이미 본 appid (중복 제거용, 제외된 무료 게임 포함)
+# - enriched: 리뷰 수 조회가 끝난 appid
+# - scopes  : 마지막 페이지까지 도달한 scope
+# - meta    : 페이지 번호의 기준인 검색 페이지 크기 등 (크기가 다른 체크포인트로는 재개하지 않음)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages    (scope TEXT, page INTEGER, PRIMARY KEY (scope, page));
+CREATE TABLE IF NOT EXISTS listing  (scope TEXT, page INTEGER, pos INTEGER, appid TEXT, data TEXT,
+                                     PRIMARY KEY (scope, page, pos));
+CREATE TABLE IF NOT EXISTS seen     (appid TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS enriched (appid TEXT PRIMARY KEY, total_ss INTEGER, total_store INTEGER);
+CREATE TABLE IF NOT EXISTS scopes   (scope TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS meta     (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class CrawlCheckpoint:
+    def __init__(self, path, resume=False, page_size=SEARCH_PAGE_SIZE):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        if resume:
+            self._check_page_size(page_size)
+        else:
+            self.reset()
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('page_size', ?)", (str(page_size),))
+
+    def _check_page_size(self, page_size):
+        """페이지 번호가 다른 크기(예: 예전 25행 HTML 페이지)로 매겨진 체크포인트면 재개 거부"""
+        with self.lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'page_size'").fetchone()
+            has_pages = self.conn.execute("SELECT 1 FROM pages LIMIT 1").fetchone() is not None
+        saved = int(row[0]) if row else None
+        if has_pages and saved != page_size:
+            raise SystemExit(f"체크포인트 {self.path} 의 검색 페이지 크기({saved or '기록 없음'})가 "
+                             f"현재({page_size}행)와 달라 재개할 수 없습니다. --resume 없이 다시 수집하세요.")
+
+    def reset(self):
+        with self.lock, self.conn:
+            for table in ("pages", "listing", "seen", "enriched", "scopes"):
+                self.conn.execute(f"DELETE FROM {table}")
+
+    def close(self):
+        self.conn.close()
+
+    # ----- 검색 페이지 -----
+    def last_page(self, scope):
+        with self.lock:
+            row = self.conn.execute("SELECT MAX(page) FROM pages WHERE scope = ?", (scope,)).fetchone()
+        return row[0] or 0
+
+    def iter_pages(self, scope):
+        """완료된 페이지를 순서대로 (page, [행 데이터...]) 로 돌려줌"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT p.page, l.data FROM pages p LEFT JOIN listing l ON l.scope = p.scope AND l.page = p.page "
+                "WHERE p.scope = ? ORDER BY p.page, l.pos", (scope,)
+            ).fetchall()
+        current, entries = None, []
+        for page, data in rows:
+            if page != current:
+                if current is not None:
+                    yield current, entries
+                current, entries = page, []
+            if data is not None:
+                entries.append(json.loads(data))
+        if current is not None:
+            yield current, entries
+
+    def save_page(self, scope, page, entries, seen_appids=()):
+        """페이지 하나의 파싱 결과를 원자적으로 기록"""
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO listing (scope, page, pos, appid, data) VALUES (?, ?, ?, ?, ?)",
+                [(scope, page, pos, str(e[0]), json.dumps(e, ensure_ascii=False)) for pos, e in enumerate(entries)],
+            )
+            self.conn.executemany("INSERT OR IGNORE INTO seen (appid) VALUES (?)", [(str(a),) for a in seen_appids])
+            self.conn.execute("INSERT OR IGNORE INTO pages (scope, page) VALUES (?, ?)", (scope, page))
+
+    def mark_done(self, scope):
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO scopes (scope) VALUES (?)", (scope,))
+
+    def is_done(self, scope):
+        with self.lock:
+            return self.conn.execute("SELECT 1 FROM scopes WHERE scope = ?", (scope,)).fetchone() is not None
+
+    def seen_appids(self):
+        with self.lock:
+            return {r[0] for r in self.conn.execute("SELECT appid FROM seen")}
+
+    # ----- 리뷰 수 보강 -----
+    def get_enriched(self, appids):
+        appids = [str(a) for a in appids]
+        found = {}
+        with self.lock:
+            for i in range(0, len(appids), 500):
+                chunk = appids[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                for appid, ss, store in self.conn.execute(
+                    f"SELECT appid, total_ss, total_store FROM enriched WHERE appid IN ({marks})", chunk
+                ):
+                    found[appid] = (ss, store)
+        return found
+
+    def save_enriched(self, enriched):
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO enriched (appid, total_ss, total_store) VALUES (?, ?, ?)",
+                [(str(appid), ss, store) for appid, (ss, store) in enriched.items()],
+            )
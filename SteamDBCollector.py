@@ -1,12 +1,17 @@
-import requests
-from bs4 import BeautifulSoup
-import time
-from datetime import datetime
-import csv
-import re
+import sys
+
+from SteamDBBreaker import NegativeCache
+from SteamDBCommon import LOCALE_QS, clean_price, extract_discount_percent, fmt_money, parse_price, try_parse_date
+from SteamDBEngine import fetch_steamspy_total, fetch_store_total, make_crawl_session, run_detail
+from SteamDBEnrich import enrich_appids
+from SteamDBMetrics import metrics
+from SteamDBPrices import PriceIndex
+from SteamDBRecord import GameRecord, intern_text
+from SteamDBSources import ReviewSources
+from SteamDBSearch import PREFETCH_PAGES, SEARCH_PAGE_SIZE, iter_search_pages
+from SteamDBSteamSpy import SteamSpyIndex
 
 # ===== 설정 =====
-TAG_INDY = 492
 GENRE_TAGS = {
     #'Deckbuilding': 17389,
     'Metroidvania': 1628,
@@ -16,214 +21,239 @@ GENRE_TAGS = {
     'Souls-like' : 29482
 }
 
-# 로케일 고정: 영어/미국
-LOCALE_QS = "l=english&cc=US"
-HEADERS = {
-    "User-Agent": "Mozilla/5.0",
-    "Accept-Language": "en-US,en;q=0.8",
-}
+SEARCH_QUERY_TMPL = "tags={tag1}&category1=998&" + LOCALE_QS  # 검색 JSON/HTML 공통 쿼리
 
-SEARCH_URL_TMPL   = "https://store.steampowered.com/search/?tags={tag1}&category1=998&page={page}&" + LOCALE_QS
-APP_URL_TMPL      = "https://store.steampowered.com/app/{appid}/?" + LOCALE_QS
-APPREVIEWS_TMPL   = "https://store.steampowered.com/appreviews/{appid}?json=1&filter=all&language=all&review_type=all&purchase_type=all"
-STEAMSPY_URL      = "https://steamspy.com/api.php?request=appdetails&appid={appid}"
+# 리뷰 수 병렬 조회: 호스트별 동시 요청 수 (1이면 순차 실행)
+ENRICH_WORKERS = {"steamspy": 4, "store": 8}
 
-# 세션(헤더/쿠키)
-session = requests.Session()
-session.headers.update(HEADERS)
-session.cookies.set("Steam_Language", "english", domain=".steampowered.com")
-session.cookies.set("wants_mature_content", "1", domain=".steampowered.com")
-session.cookies.set("birthtime", "568022401", domain=".steampowered.com")  # 성인 통과용 타임스탬프
+# 세션(헤더/쿠키) + 호스트별 요청 예산 + 429/5xx 백오프
+session, rate_limiter = make_crawl_session(ENRICH_WORKERS["store"] + PREFETCH_PAGES)
 
-# ===== 유틸 =====
-def try_parse_date(text):
-    for fmt in ["%Y년 %m월 %d일", "%d %b, %Y", "%b %d, %Y"]:
-        try:
-            return datetime.strptime(text, fmt)
-        except ValueError:
-            continue
-    return None
+# SteamSpy 대량 색인 (실행 시 한 번 채움, 비어 있으면 모두 appdetails로)
+steamspy_index = SteamSpyIndex()
+# 실패/데이터 없음으로 확인된 리뷰 조회 (다시 보내지 않음, 실행 시 파일을 붙임)
+negative_cache = NegativeCache()
+# 스토어 appdetails 가격 일괄 조회 (--prices api 일 때만, 검색 페이지마다 요청 1회)
+price_index = PriceIndex()
+# 리뷰 수 출처 정책 (--review-source) + 값마다 출처 기록
+review_sources = ReviewSources(steamspy_index)
+ENRICH_BATCH = 100  # 한 번에 병렬 보강할 고유 appid 수
 
+# ===== 유틸 =====
 def fetch_total_reviews_from_steamspy(appid):
-    try:
-        r = session.get(STEAMSPY_URL.format(appid=appid), timeout=10)
-        data = r.json()
-        return data.get("positive", 0) + data.get("negative", 0)
-    except:
-        return 0
-
-def _largest_int_in(text: str):
-    nums = re.findall(r'[\d,]+', text or "")
-    if not nums:
-        return None
-    return max(int(n.replace(",", "")) for n in nums)
+    return fetch_steamspy_total(session, steamspy_index, appid, negative_cache, review_sources)
 
 # === 핵심: 모든 언어(All languages) 총 리뷰 수 ===
 def fetch_total_reviews_from_store_html(appid):
-    # 1) 공식 JSON(API)로 모든 언어 총 리뷰 수 우선 획득
-    try:
-        r = session.get(APPREVIEWS_TMPL.format(appid=appid), timeout=10)
-        j = r.json()
-        total = j.get("query_summary", {}).get("total_reviews", 0)
-        if isinstance(total, int) and total > 0:
-            return total
-    except Exception as e:
-        print(f"[appreviews API 실패] appid={appid}: {e}")
-
-    # 2) 폴백: 상세 페이지(영문/US) 두 번째 요약행(= All Reviews)에서 추출
-    try:
-        res = session.get(APP_URL_TMPL.format(appid=appid), timeout=10)
-        soup = BeautifulSoup(res.text, "html.parser")
-        rows = soup.select("a.user_reviews_summary_row")
-        if not rows:
-            return 0
-        target = rows[1] if len(rows) >= 2 else rows[0]
-
-        # (a) schema.org 메타
-        meta = target.select_one('meta[itemprop="ratingCount"], meta[itemprop="reviewCount"]')
-        if meta and meta.get("content"):
-            return int(meta["content"].replace(",", ""))
-
-        # (b) 툴팁/텍스트의 숫자들 중 가장 큰 값
-        tooltip = target.get("data-tooltip-html", "") or ""
-        val = _largest_int_in(tooltip)
-        if val is not None:
-            return val
-        txt = target.get_text(" ", strip=True)
-        val = _largest_int_in(txt)
-        if val is not None:
-            return val
-    except Exception as e:
-        print(f"[HTML 리뷰 파싱 오류] appid={appid}: {e}")
-
-    return 0
-
-def clean_price(text):
-    if not text:
-        return "Unknown"
-    return text.strip().replace("\n", "").replace("\r", "")
-
-# 통화/숫자 파싱 (₩/$/€/£ 지원) + 무료 판정
-def parse_price(price_text):
-    if not price_text:
-        return None, None
-    low = price_text.lower()
-    if "free" in low or "무료" in low or "free to play" in low:
-        return 0, None  # 무료
-    m = re.search(r'([$\£€₩])\s*([0-9][0-9,]*(?:\.[0-9]+)?)', price_text)
-    if not m:
-        return None, None
-    symbol = m.group(1)
-    num = float(m.group(2).replace(",", "")) if "." in m.group(2) else int(m.group(2).replace(",", ""))
-    return num, symbol
-
-def extract_discount_percent(item):
-    try:
-        orig = item.select_one(".discount_original_price")
-        disc = item.select_one(".discount_final_price")
-        if orig and disc and "₩" in orig.text and "₩" in disc.text:
-            o = int(orig.text.replace("₩", "").replace(",", "").strip())
-            d = int(disc.text.replace("₩", "").replace(",", "").strip())
-            if o > 0 and d < o:
-                return f"{int((1 - d / o) * 100)}%"
-    except:
-        pass
-    return "0%"
-
-def estimate_revenue(total_reviews, price_value):
-    if not price_value or total_reviews <= 0:
-        return 0
-    return total_reviews * 50 * price_value
-
-def fmt_money(amount, symbol):
-    if symbol == "₩":
-        return f"₩{int(round(amount)):,}"
-    if symbol in ("$", "€", "£"):
-        return f"{symbol}{amount:,.2f}"
-    return str(amount)
+    return fetch_store_total(session, appid, negative_cache, review_sources)
 
 # ===== 수집 =====
-def collect_game_data():
-    results = []
-    year_range = range(2013, 2026) # 2011,2012는 스팀에서 깽판내놨음
+YEAR_RANGE = range(2013, 2026) # 2011,2012는 스팀에서 깽판내놨음
+
+# 1) 검색 행 파싱 (네트워크 없음)
+def parse_search_items(items):
+    candidates = []
+    for item in items:
+        try:
+            link = item["href"]
+            appid = link.split("/app/")[1].split("/")[0]
+            title = item["title"].strip()
+
+            release_text = item["released"]
+            release_date = try_parse_date(release_text)
+            if not release_date or release_date.year not in YEAR_RANGE:
+                continue
+            year = release_date.year
+
+            price_str = clean_price(item["price"] or "")
+            price_value, currency = parse_price(price_str)
+
+            # 무료 게임 제외
+            if price_value == 0:
+                print(f"{title} - Free (excluded)")
+                continue
+
+            discount_percent = extract_discount_percent(item)
+            # 가격 표기/통화/할인율은 몇 종류뿐이라 intern 해서 목록 전체가 같은 객체를 공유
+            candidates.append((appid, title, year, intern_text(price_str), price_value,
+                               intern_text(currency), intern_text(discount_percent)))
+        except Exception as e:
+            print(f"게임 처리 오류: {e}")
+            continue
+    return candidates
+
+# 2) 리뷰 수 병렬 조회 (SteamSpy / All languages)
+#    planner(증분 모드)가 있으면 갱신 주기가 안 된 앱은 이전 값을 이월
+#    filters 에 SteamSpy 조건이 있으면 통과한 앱만 스토어 조회 (떨어진 앱은 결과에서 빠짐)
+def enrich_candidates(candidates, checkpoint=None, planner=None, filters=None):
+    if planner is None:
+        to_fetch, carried = [c[0] for c in candidates], {}
+    else:
+        to_fetch, carried = planner.split(candidates)
+    enriched = enrich_appids(
+        to_fetch,
+        fetch_total_reviews_from_steamspy,
+        fetch_total_reviews_from_store_html,  # ← All languages 총합
+        ENRICH_WORKERS,
+        checkpoint=checkpoint,
+        keep_ss=filters.steamspy_check(candidates) if filters else None,
+        complete=review_sources.complete,
+    )
+    if planner is not None:
+        planner.record(enriched, review_sources.complete)
+    return {**carried, **enriched}
+
+# 3) 행 조립: (장르 표기, 후보) 순서대로
+def build_rows(memberships, enriched):
+    for genre_name, c in memberships:
+        try:
+            total_ss, total_html = enriched[c[0]]
+            record = GameRecord.from_candidate(genre_name, c, total_ss, total_html, review_sources.get(c[0]))
+            row = record.to_row(fmt_money, review_sources.with_columns)
+            print(f"{row[1]} - 리뷰(SS) {row[6]} / 리뷰(ALL) {row[8]} - 수익(SS) {row[7]}, 수익(ALL) {row[9]}")
+            yield row
+        except Exception as e:
+            print(f"게임 처리 오류: {e}")
+            continue
+
+# 3') 레코드 (Parquet/Arrow, collect_game_records): 수익·할인율은 필요할 때 계산
+def build_records(memberships, enriched):
+    for genre_name, c in memberships:
+        total_ss, total_html = enriched[c[0]]
+        print(f"{c[1]} - 리뷰(SS) {total_ss} / 리뷰(ALL) {total_html}")
+        yield GameRecord.from_candidate(genre_name, c, total_ss, total_html, review_sources.get(c[0]))
 
+# ===== 1단계: 장르별 검색 목록 수집 (리뷰 조회 없음) =====
+def iter_listing(checkpoint=None, prices=None, progress=False):
+    """(장르명, 후보) 를 검색 순서대로 돌려줌 (prices: PriceIndex 면 가격 필드를 appdetails 값으로)
+    progress=True 면 진행률을 검색 결과 개수 기준으로 (장르마다 남은 결과 수를 전체에 더하고 받은 행만큼 진행)"""
     for genre_name, genre_id in GENRE_TAGS.items():
-        print(f"\n{genre_name} 장르 수집 중...")
         page = 1
+
+        # 체크포인트 재개: 끝난 페이지는 저장된 목록으로 재생
+        if checkpoint is not None:
+            done_page = checkpoint.last_page(genre_name)
+            if done_page:
+                print(f"\n{genre_name}: 체크포인트에서 재개 ({done_page}페이지까지 완료)")
+            for _, candidates in checkpoint.iter_pages(genre_name):
+                for c in candidates:
+                    yield genre_name, tuple(c)
+            if checkpoint.is_done(genre_name):
+                continue
+            page = done_page + 1
+
+        print(f"\n{genre_name} 장르 수집 중...")
+        skipped = (page - 1) * SEARCH_PAGE_SIZE  # 체크포인트에서 재생한 결과는 진행률에 넣지 않음
+        on_total = (lambda total: metrics.progress.add_total(max(total - skipped, 0))) if progress else None
+        pages = iter_search_pages(session, SEARCH_QUERY_TMPL.format(tag1=genre_id), start_page=page,
+                                  on_total=on_total)
         while True:
-            url = SEARCH_URL_TMPL.format(tag1=genre_id, page=page)
-            print(f"[페이지 {page}] 요청 중: {url}")
             try:
-                res = session.get(url, timeout=10)
+                page, items = next(pages)
+            except StopIteration:
+                print("마지막 페이지 도달.")
+                if checkpoint is not None:
+                    checkpoint.mark_done(genre_name)
+                break
             except Exception as e:
                 print(f"요청 실패: {e}")
                 break
 
-            soup = BeautifulSoup(res.text, "html.parser")
-            items = soup.select(".search_result_row")
-            if not items:
-                print("마지막 페이지 도달.")
-                break
+            candidates = parse_search_items(items)
+            if prices is not None:
+                candidates = prices.fetch(session, candidates)
+            if checkpoint is not None:
+                checkpoint.save_page(genre_name, page, candidates)
+            for c in candidates:
+                yield genre_name, c
+            if progress:
+                metrics.progress.advance(len(items))
+
+# ===== 2단계: 고유 appid만 한 번씩 보강 후 장르 행에 다시 결합 =====
+def iter_game_rows(checkpoint=None, merge_genres=False, planner=None, records=False, filters=None, prices=None):
+    """merge_genres=False: 장르당 한 행 (기존 출력과 동일)
+    merge_genres=True : 앱당 한 행, Genre 열에 "A;B" 형태로 모든 장르 표기 (목록 전체를 메모리에 모음)
+    records=True      : CSV 행 대신 build_records 의 GameRecord
+    filters           : SteamDBFilter.FilterPlan (검색 행 조건은 보강 전에 적용)
+    prices            : SteamDBPrices.PriceIndex (가격/할인율을 appdetails 일괄 조회 값으로)"""
+    build = build_records if records else build_rows
+    memberships = iter_listing(checkpoint, prices, progress=not merge_genres)
+    if filters:
+        memberships = ((genre_name, c) for genre_name, c in memberships if filters.search([c]))
+    if merge_genres:
+        yield from _iter_merged_rows(build, list(memberships), checkpoint, planner, filters)
+        return
 
-            for item in items:
-                try:
-                    link = item["href"]
-                    appid = link.split("/app/")[1].split("/")[0]
-                    title = item.select_one(".title").text.strip()
-
-                    release_text = item.select_one(".search_released").get_text(strip=True)
-                    release_date = try_parse_date(release_text)
-                    if not release_date or release_date.year not in year_range:
-                        continue
-                    year = release_date.year
-
-                    price_tag = item.select_one(".discount_final_price") or item.select_one(".search_price")
-                    price_str = clean_price(price_tag.text if price_tag else "")
-                    price_value, currency = parse_price(price_str)
-
-                    # 무료 게임 제외
-                    if price_value == 0:
-                        print(f"{title} - Free (excluded)")
-                        continue
-
-                    discount_percent = extract_discount_percent(item)
-
-                    total_ss = fetch_total_reviews_from_steamspy(appid)
-                    total_html = fetch_total_reviews_from_store_html(appid)  # ← All languages 총합
-
-                    revenue_ss = estimate_revenue(total_ss, price_value) if currency else 0
-                    revenue_html = estimate_revenue(total_html, price_value) if currency else 0
-
-                    rev_ss_str = fmt_money(revenue_ss, currency) if currency else "0"
-                    rev_html_str = fmt_money(revenue_html, currency) if currency else "0"
-
-                    print(f"{title} - 리뷰(SS) {total_ss} / 리뷰(ALL) {total_html} - 수익(SS) {rev_ss_str}, 수익(ALL) {rev_html_str}")
-
-                    results.append([
-                        appid, title, year, genre_name,
-                        price_str, discount_percent,
-                        total_ss, rev_ss_str,
-                        total_html, rev_html_str
-                    ])
-                    time.sleep(0.5)
-                except Exception as e:
-                    print(f"게임 처리 오류: {e}")
-                    continue
-            page += 1
-            time.sleep(1)
-    return results
+    # 목록을 흘려보내며 처음 보는 앱이 ENRICH_BATCH 개 모이면 한꺼번에 보강하고, 그때까지 쌓인 행을 순서대로 내보냄
+    # (SteamSpy 조건에서 떨어진 앱은 enriched 에 없으므로 본 appid 는 따로 기억)
+    enriched = {}
+    seen = set()
+    pending, batch = [], []
+    listed = 0
+    for genre_name, c in memberships:
+        listed += 1
+        if c[0] not in seen:
+            seen.add(c[0])
+            batch.append(c)
+        pending.append((genre_name, c))
+        if len(batch) >= ENRICH_BATCH:
+            enriched.update(enrich_candidates(batch, checkpoint, planner, filters))
+            yield from _emit_rows(build, pending, enriched, filters, advance=False)
+            pending, batch = [], []
+    if batch:
+        enriched.update(enrich_candidates(batch, checkpoint, planner, filters))
+    yield from _emit_rows(build, pending, enriched, filters, advance=False)
+    print(f"\n목록 {listed}행 / 고유 앱 {len(seen)}개 → 중복 보강 {listed - len(seen)}회 절약")
+
+def _iter_merged_rows(build, memberships, checkpoint, planner, filters):
+    """앱당 한 행: 모든 장르를 알아야 하므로 목록 전체를 모은 뒤 처음 등장한 순서대로 보강"""
+    order = list(dict.fromkeys(c[0] for _, c in memberships))  # 처음 등장한 순서
+    print(f"\n목록 {len(memberships)}행 / 고유 앱 {len(order)}개 → 중복 보강 {len(memberships) - len(order)}회 절약")
+
+    first = {}
+    genres = {}
+    for genre_name, c in memberships:
+        first.setdefault(c[0], c)
+        genres.setdefault(c[0], []).append(genre_name)
+    metrics.progress.set_total(len(order))
+
+    for i in range(0, len(order), ENRICH_BATCH):
+        batch = order[i:i + ENRICH_BATCH]
+        enriched = enrich_candidates([first[a] for a in batch], checkpoint, planner, filters)
+        yield from _emit_rows(build, [(intern_text(";".join(genres[a])), first[a]) for a in batch], enriched, filters)
+
+def _emit_rows(build, memberships, enriched, filters, advance=True):
+    """보강이 끝난 (장르, 후보) 를 행으로 (SteamSpy 조건/행 조건에서 떨어진 앱은 건너뜀)
+    advance=False: 진행률은 iter_listing 이 검색 결과 기준으로 셈"""
+    for genre_name, c in memberships:
+        if c[0] in enriched and (not filters or filters.keep_row(c, *enriched[c[0]])):
+            yield from build([(genre_name, c)], enriched)
+        if advance:
+            metrics.progress.advance()
+
+def collect_game_data(checkpoint=None, merge_genres=False, planner=None, filters=None):
+    """전체 결과를 CSV 행 list 로 메모리에 모음"""
+    return list(iter_game_rows(checkpoint, merge_genres, planner, filters=filters))
+
+def collect_game_records(checkpoint=None, merge_genres=False, planner=None, filters=None):
+    """collect_game_data 와 같은 결과를 GameRecord 로 (행보다 작음, CSV 행은 record.to_row(fmt_money))"""
+    return list(iter_game_rows(checkpoint, merge_genres, planner, records=True, filters=filters))
+
+HEADER = [
+    "AppID", "Name", "ReleaseYear", "Genre",
+    "Price", "DiscountPercent",
+    "TotalReviews_SteamSpy", "EstimatedRevenue_SteamSpy",
+    "TotalReviews_AllLanguages", "EstimatedRevenue_AllLanguages"
+]
 
 # ===== 실행 & 저장 =====
+def run(args):
+    """SteamDB.py genre (옵션은 SteamDB.build_parser)"""
+    run_detail(args, session, HEADER,
+               lambda **kw: iter_game_rows(merge_genres=args.merge_genres, **kw),
+               rate_limiter, steamspy_index, list(GENRE_TAGS), price_index,
+               negative_cache, review_sources)
+
 if __name__ == "__main__":
-    data = collect_game_data()
-    header = [
-        "AppID", "Name", "ReleaseYear", "Genre",
-        "Price", "DiscountPercent",
-        "TotalReviews_SteamSpy", "EstimatedRevenue_SteamSpy",
-        "TotalReviews_AllLanguages", "EstimatedRevenue_AllLanguages"
-    ]
-    with open("IndieGameDetailList.csv", "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(header)
-        writer.writerows(data)
-    print("IndieGameDetailList.csv 저장 완료.")
+    from SteamDB import main
+    main(["genre", *sys.argv[1:]], sys.modules[__name__])
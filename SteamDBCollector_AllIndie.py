@@ -1,238 +1,207 @@
-import requests
-from bs4 import BeautifulSoup
-import time
-from datetime import datetime
-import csv
 import re
+import sys
+
+from SteamDBBreaker import NegativeCache
+from SteamDBCommon import (LOCALE_QS, TAG_INDY, clean_price, extract_discount_percent, extract_year_fallback,
+                           fmt_money, parse_price, try_parse_date)
+from SteamDBEngine import fetch_steamspy_total, fetch_store_total, make_crawl_session, run_detail
+from SteamDBEnrich import enrich_appids
+from SteamDBMetrics import metrics
+from SteamDBPrices import PriceIndex
+from SteamDBRecord import GameRecord, intern_text
+from SteamDBSources import ReviewSources
+from SteamDBSearch import PREFETCH_PAGES, SEARCH_PAGE_SIZE, iter_search_pages
+from SteamDBSteamSpy import SteamSpyIndex
 
 # ===== 설정 =====
-TAG_INDY = 492  # Indie
-# 로케일 고정: 영어/미국
-LOCALE_QS = "l=english&cc=US"
-HEADERS = {
-    "User-Agent": "Mozilla/5.0",
-    "Accept-Language": "en-US,en;q=0.8",
-}
-
-SEARCH_URL_TMPL = "https://store.steampowered.com/search/?category1=998&tags={tag}&page={page}&" + LOCALE_QS
-APP_URL_TMPL    = "https://store.steampowered.com/app/{appid}/?" + LOCALE_QS
-APPREVIEWS_TMPL = "https://store.steampowered.com/appreviews/{appid}?json=1&filter=all&language=all&review_type=all&purchase_type=all"
-STEAMSPY_URL    = "https://steamspy.com/api.php?request=appdetails&appid={appid}"
-
-# 세션(헤더/쿠키)
-session = requests.Session()
-session.headers.update(HEADERS)
-session.cookies.set("Steam_Language", "english", domain=".steampowered.com")
-session.cookies.set("wants_mature_content", "1", domain=".steampowered.com")
-session.cookies.set("birthtime", "568022401", domain=".steampowered.com")  # 성인 통과용
+SEARCH_QUERY_TMPL = "category1=998&tags={tag}&" + LOCALE_QS  # 검색 JSON/HTML 공통 쿼리
 
-# ===== 유틸 =====
-def try_parse_date(text):
-    for fmt in ["%Y년 %m월 %d일", "%d %b, %Y", "%b %d, %Y"]:
-        try:
-            return datetime.strptime(text, fmt)
-        except ValueError:
-            continue
-    return None
+# 리뷰 수 병렬 조회: 호스트별 동시 요청 수 (1이면 순차 실행)
+ENRICH_WORKERS = {"steamspy": 4, "store": 8}
 
-def extract_year_fallback(text):
-    m = re.search(r'\b(19|20)\d{2}\b', text or "")
-    return int(m.group(0)) if m else ""
+# 세션(헤더/쿠키) + 호스트별 요청 예산 + 429/5xx 백오프
+session, rate_limiter = make_crawl_session(ENRICH_WORKERS["store"] + PREFETCH_PAGES)
 
+# SteamSpy 대량 색인 (실행 시 한 번 채움, 비어 있으면 모두 appdetails로)
+steamspy_index = SteamSpyIndex()
+# 실패/데이터 없음으로 확인된 리뷰 조회 (다시 보내지 않음, 실행 시 파일을 붙임)
+negative_cache = NegativeCache()
+# 스토어 appdetails 가격 일괄 조회 (--prices api 일 때만, 검색 페이지마다 요청 1회)
+price_index = PriceIndex()
+# 리뷰 수 출처 정책 (--review-source) + 값마다 출처 기록
+review_sources = ReviewSources(steamspy_index)
+
+# ===== 유틸 =====
 def fetch_total_reviews_from_steamspy(appid):
-    try:
-        r = session.get(STEAMSPY_URL.format(appid=appid), timeout=10)
-        data = r.json()
-        return data.get("positive", 0) + data.get("negative", 0)
-    except:
-        return 0
-
-def _largest_int_in(text: str):
-    nums = re.findall(r'[\d,]+', text or "")
-    if not nums:
-        return None
-    return max(int(n.replace(",", "")) for n in nums)
+    return fetch_steamspy_total(session, steamspy_index, appid, negative_cache, review_sources)
 
 # === 모든 언어(All languages) 총 리뷰 수 ===
 def fetch_total_reviews_from_store_alllangs(appid):
-    # 1) 공식 JSON(API) 우선
-    try:
-        r = session.get(APPREVIEWS_TMPL.format(appid=appid), timeout=10)
-        j = r.json()
-        total = j.get("query_summary", {}).get("total_reviews", 0)
-        if isinstance(total, int) and total > 0:
-            return total
-    except Exception as e:
-        print(f"[appreviews API 실패] appid={appid}: {e}")
-
-    # 2) 폴백: 상세 페이지 두 번째 요약행(= All Reviews)에서 추출
-    try:
-        res = session.get(APP_URL_TMPL.format(appid=appid), timeout=10)
-        soup = BeautifulSoup(res.text, "html.parser")
-        rows = soup.select("a.user_reviews_summary_row")
-        if not rows:
-            return 0
-        target = rows[1] if len(rows) >= 2 else rows[0]
-
-        # (a) schema.org 메타
-        meta = target.select_one('meta[itemprop="ratingCount"], meta[itemprop="reviewCount"]')
-        if meta and meta.get("content"):
-            return int(meta["content"].replace(",", ""))
-
-        # (b) 툴팁/텍스트의 숫자들 중 가장 큰 값
-        tooltip = target.get("data-tooltip-html", "") or ""
-        val = _largest_int_in(tooltip)
-        if val is not None:
-            return val
-        txt = target.get_text(" ", strip=True)
-        val = _largest_int_in(txt)
-        if val is not None:
-            return val
-    except Exception as e:
-        print(f"[HTML 리뷰 파싱 오류] appid={appid}: {e}")
-
-    return 0
-
-def clean_price(text):
-    if not text:
-        return "Unknown"
-    return text.strip().replace("\n", "").replace("\r", "")
-
-# 통화/숫자 파싱 (₩/$/€/£ 지원) + 무료 판정
-def parse_price(price_text):
-    if not price_text:
-        return None, None
-    low = price_text.lower()
-    if "free to play" in low or "free" in low or "무료" in low:
-        return 0, None  # 무료
-    m = re.search(r'([$\£€₩])\s*([0-9][0-9,]*(?:\.[0-9]+)?)', price_text)
-    if not m:
-        return None, None
-    symbol = m.group(1)
-    num = float(m.group(2).replace(",", "")) if "." in m.group(2) else int(m.group(2).replace(",", ""))
-    return num, symbol
-
-# 통화 무관 할인율 계산
-def extract_discount_percent(item):
-    try:
-        orig = item.select_one(".discount_original_price")
-        disc = item.select_one(".discount_final_price")
-        if orig and disc:
-            def _num(s):
-                m = re.search(r'([0-9][0-9,]*(?:\.[0-9]+)?)', s or "")
-                return float(m.group(1).replace(",", "")) if (m and "." in m.group(1)) else (int(m.group(1).replace(",", "")) if m else None)
-            o = _num(orig.text)
-            d = _num(disc.text)
-            if o and d and d < o:
-                return f"{int((1 - d / o) * 100)}%"
-    except:
-        pass
-    return "0%"
-
-def estimate_revenue(total_reviews, price_value):
-    if not price_value or total_reviews <= 0:
-        return 0
-    return total_reviews * 50 * price_value
-
-def fmt_money(amount, symbol):
-    if symbol == "₩":
-        return f"₩{int(round(amount)):,}"
-    if symbol in ("$", "€", "£"):
-        return f"{symbol}{amount:,.2f}"
-    return str(amount)
+    return fetch_store_total(session, appid, negative_cache, review_sources)
 
 # ===== 수집: Indie 태그 단일 =====
-def collect_game_data():
-    results = []
-    page = 1
-    seen_appids = set()
+SCOPE = "Indie"
 
-    print("\nIndie 태그 전체 수집 중...")
-    while True:
-        url = SEARCH_URL_TMPL.format(tag=TAG_INDY, page=page)
-        print(f"[페이지 {page}] 요청 중: {url}")
+# 1) 검색 행 파싱 (네트워크 없음) → (보강 대상, 이번 페이지에서 새로 본 appid)
+def parse_search_items(items, seen_appids):
+    candidates = []
+    new_seen = []
+    for item in items:
         try:
-            res = session.get(url, timeout=10)
-        except Exception as e:
-            print(f"요청 실패: {e}")
-            break
-
-        soup = BeautifulSoup(res.text, "html.parser")
-        items = soup.select(".search_result_row")
-        if not items:
-            print("마지막 페이지 도달.")
-            break
-
-        for item in items:
-            try:
-                # AppID 추출 (우선 data-ds-appid, 폴백 href)
-                appid = item.get("data-ds-appid")
-                if not appid:
-                    href = item.get("href", "")
-                    m = re.search(r"/app/(\d+)", href)
-                    if not m:
-                        continue
-                    appid = m.group(1)
-
-                if appid in seen_appids:
+            # AppID 추출 (우선 data-ds-appid, 폴백 href)
+            appid = item["ds_appid"]
+            if not appid:
+                href = item["href"] or ""
+                m = re.search(r"/app/(\d+)", href)
+                if not m:
                     continue
-                seen_appids.add(appid)
-
-                title = item.select_one(".title").text.strip() if item.select_one(".title") else ""
+                appid = m.group(1)
 
-                release_text = item.select_one(".search_released").get_text(strip=True) if item.select_one(".search_released") else ""
-                dt = try_parse_date(release_text)
-                year = dt.year if dt else extract_year_fallback(release_text)
-
-                price_tag = item.select_one(".discount_final_price") or item.select_one(".search_price")
-                price_str = clean_price(price_tag.text if price_tag else "")
-                price_value, currency = parse_price(price_str)
+            if appid in seen_appids:
+                continue
+            seen_appids.add(appid)
+            new_seen.append(appid)
 
-                # 무료 게임 제외
-                if price_value == 0:
-                    print(f"{title} - Free (excluded)")
-                    continue
+            title = item["title"].strip() if item["title"] is not None else ""
 
-                discount_percent = extract_discount_percent(item)
+            release_text = item["released"] or ""
+            dt = try_parse_date(release_text)
+            year = dt.year if dt else extract_year_fallback(release_text)
 
-                total_ss = fetch_total_reviews_from_steamspy(appid)
-                total_all = fetch_total_reviews_from_store_alllangs(appid)  # 모든 언어 총합
+            price_str = clean_price(item["price"] or "")
+            price_value, currency = parse_price(price_str)
 
-                revenue_ss = estimate_revenue(total_ss, price_value) if currency else 0
-                revenue_all = estimate_revenue(total_all, price_value) if currency else 0
+            # 무료 게임 제외
+            if price_value == 0:
+                print(f"{title} - Free (excluded)")
+                continue
 
-                rev_ss_str = fmt_money(revenue_ss, currency) if currency else "0"
-                rev_all_str = fmt_money(revenue_all, currency) if currency else "0"
+            discount_percent = extract_discount_percent(item)
+            # 가격 표기/통화/할인율은 몇 종류뿐이라 intern 해서 목록 전체가 같은 객체를 공유
+            candidates.append((appid, title, year, intern_text(price_str), price_value,
+                               intern_text(currency), intern_text(discount_percent)))
+        except Exception as e:
+            print(f"게임 처리 오류: {e}")
+            continue
+    return candidates, new_seen
+
+# 2) 리뷰 수 병렬 조회 (SteamSpy / 모든 언어 총합)
+#    planner(증분 모드)가 있으면 갱신 주기가 안 된 앱은 이전 값을 이월
+#    filters 에 SteamSpy 조건이 있으면 통과한 앱만 스토어 조회 (떨어진 앱은 결과에서 빠짐)
+def enrich_candidates(candidates, checkpoint=None, planner=None, filters=None):
+    if planner is None:
+        to_fetch, carried = [c[0] for c in candidates], {}
+    else:
+        to_fetch, carried = planner.split(candidates)
+    enriched = enrich_appids(
+        to_fetch,
+        fetch_total_reviews_from_steamspy,
+        fetch_total_reviews_from_store_alllangs,
+        ENRICH_WORKERS,
+        checkpoint=checkpoint,
+        keep_ss=filters.steamspy_check(candidates) if filters else None,
+        complete=review_sources.complete,
+    )
+    if planner is not None:
+        planner.record(enriched, review_sources.complete)
+    return {**carried, **enriched}
+
+# 3) 행 조립 (검색 결과 순서 유지)
+def build_rows(candidates, enriched):
+    for c in candidates:
+        try:
+            total_ss, total_all = enriched[c[0]]
+            record = GameRecord.from_candidate(SCOPE, c, total_ss, total_all, review_sources.get(c[0]))
+            row = record.to_row(fmt_money, review_sources.with_columns)  # 장르는 고정
+            print(f"{row[1]} - 리뷰(SS) {row[6]} / 리뷰(ALL) {row[8]} - 수익(SS) {row[7]}, 수익(ALL) {row[9]}")
+            yield row
+        except Exception as e:
+            print(f"게임 처리 오류: {e}")
+            continue
 
-                print(f"{title} - 리뷰(SS) {total_ss} / 리뷰(ALL) {total_all} - 수익(SS) {rev_ss_str}, 수익(ALL) {rev_all_str}")
+# 레코드 (Parquet/Arrow, collect_game_records): 수익·할인율은 필요할 때 계산
+def build_records(candidates, enriched):
+    for c in candidates:
+        total_ss, total_all = enriched[c[0]]
+        print(f"{c[1]} - 리뷰(SS) {total_ss} / 리뷰(ALL) {total_all}")
+        yield GameRecord.from_candidate(SCOPE, c, total_ss, total_all, review_sources.get(c[0]))
+
+# 한 페이지 분량: 검색 행 조건 → 보강(SteamSpy 조건 통과 앱만 스토어) → 남은 조건 → 행
+def build_page(build, candidates, checkpoint=None, planner=None, filters=None):
+    if filters:
+        candidates = filters.search(candidates)
+    enriched = enrich_candidates(candidates, checkpoint, planner, filters)
+    if filters:
+        candidates = [c for c in candidates if c[0] in enriched and filters.keep_row(c, *enriched[c[0]])]
+    return build(candidates, enriched)
+
+def iter_game_rows(checkpoint=None, planner=None, records=False, filters=None, prices=None):
+    """records=True 이면 CSV 행 대신 build_records 의 GameRecord
+    filters: SteamDBFilter.FilterPlan (검색 행 조건은 보강 전에 적용)
+    prices : SteamDBPrices.PriceIndex (가격/할인율을 appdetails 일괄 조회 값으로)"""
+    build = build_records if records else build_rows
+    page = 1
+    seen_appids = set()
 
-                results.append([
-                    appid, title, year, "Indie",        # 장르는 고정
-                    price_str, discount_percent,
-                    total_ss, rev_ss_str,
-                    total_all, rev_all_str
-                ])
-                time.sleep(0.5)
-            except Exception as e:
-                print(f"게임 처리 오류: {e}")
-                continue
+    # 체크포인트 재개: 끝난 페이지는 저장된 행으로 재생(보강 안 된 appid만 조회)
+    if checkpoint is not None:
+        seen_appids = checkpoint.seen_appids()
+        done_page = checkpoint.last_page(SCOPE)
+        if done_page:
+            print(f"체크포인트에서 재개: {done_page}페이지까지 완료, 본 appid {len(seen_appids)}개")
+        for _, candidates in checkpoint.iter_pages(SCOPE):
+            yield from build_page(build, candidates, checkpoint, planner, filters)
+            metrics.progress.advance(SEARCH_PAGE_SIZE)
+        if checkpoint.is_done(SCOPE):
+            return
+        page = done_page + 1
 
-        page += 1
-        time.sleep(1)
+    print("\nIndie 태그 전체 수집 중...")
+    # 검색 페이지는 백그라운드에서 미리 가져오고, 여기서는 받은 순서대로 보강
+    # 진행률은 검색 결과 개수 기준 (연도 필터 전이라 실제 행 수보다 많음)
+    pages = iter_search_pages(session, SEARCH_QUERY_TMPL.format(tag=TAG_INDY), start_page=page,
+                              on_total=metrics.progress.set_total)
+    while True:
+        try:
+            page, items = next(pages)
+        except StopIteration:
+            print("마지막 페이지 도달.")
+            if checkpoint is not None:
+                checkpoint.mark_done(SCOPE)
+            break
+        except Exception as e:
+            print(f"요청 실패: {e}")
+            break
 
-    return results
+        candidates, new_seen = parse_search_items(items, seen_appids)
+        if prices is not None:
+            candidates = prices.fetch(session, candidates)
+        if checkpoint is not None:
+            checkpoint.save_page(SCOPE, page, candidates, new_seen)
+        yield from build_page(build, candidates, checkpoint, planner, filters)
+        metrics.progress.advance(len(items))
+
+def collect_game_data(checkpoint=None, planner=None, filters=None):
+    """전체 결과를 CSV 행 list 로 메모리에 모음"""
+    return list(iter_game_rows(checkpoint, planner, filters=filters))
+
+def collect_game_records(checkpoint=None, planner=None, filters=None):
+    """collect_game_data 와 같은 결과를 GameRecord 로 (행보다 작음, CSV 행은 record.to_row(fmt_money))"""
+    return list(iter_game_rows(checkpoint, planner, records=True, filters=filters))
+
+HEADER = [
+    "AppID", "Name", "ReleaseYear", "Genre",
+    "Price", "DiscountPercent",
+    "TotalReviews_SteamSpy", "EstimatedRevenue_SteamSpy",
+    "TotalReviews_AllLanguages", "EstimatedRevenue_AllLanguages"
+]
 
 # ===== 실행 & 저장 =====
+def run(args):
+    """SteamDB.py all-indie (옵션은 SteamDB.build_parser)"""
+    run_detail(args, session, HEADER, iter_game_rows, rate_limiter, steamspy_index, [SCOPE], price_index,
+               negative_cache, review_sources)
+
 if __name__ == "__main__":
-    data = collect_game_data()
-    header = [
-        "AppID", "Name", "ReleaseYear", "Genre",
-        "Price", "DiscountPercent",
-        "TotalReviews_SteamSpy", "EstimatedRevenue_SteamSpy",
-        "TotalReviews_AllLanguages", "EstimatedRevenue_AllLanguages"
-    ]
-    with open("IndieGameDetailList_AllIndie.csv", "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(header)
-        writer.writerows(data)
-    print("IndieGameDetailList_AllIndie.csv 저장 완료.")
+    from SteamDB import main
+    main(["all-indie", *sys.argv[1:]], sys.modules[__name__])
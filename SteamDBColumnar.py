@@ -0,0 +1,241 @@
+import sys
+import time
+
+from SteamDBCommon import PRICE_RE, REVIEW_MULTIPLIER, SS_COLUMNS, STORE_COLUMNS, UNAVAILABLE
+from SteamDBMetrics import metrics
+
+# ===== 타입 있는 열 형식 출력 (Parquet / Arrow) =====
+# CSV는 "$368,299,491.50", "0%" 같은 표시용 문자열이라 분석할 때마다 다시 파싱해야 한다.
+# 여기서는 수치 열(가격/통화/할인율/리뷰 수/추정 수익)을 그대로 저장한다.
+# 수집 루프는 원시 값만 넘기고, 수익/할인율 계산은 묶음 단위로 한꺼번에(pandas 벡터 연산) 한다.
+# pandas / pyarrow 는 이 형식을 쓸 때만 필요하다:  pip install pandas pyarrow
+BATCH_ROWS = 5000        # 이 행 수마다 한 묶음(row group)으로 기록
+
+# 수집 루프가 넘기는 레코드(SteamDBRecord.GameRecord) 속성 → 저장 열
+RECORD_ATTRS = (
+    ("AppID", "appid"), ("Name", "title"), ("ReleaseYear", "year"), ("Genre", "genre"),
+    ("Price", "price_value"), ("Currency", "currency"), ("DiscountPercent", "discount"),
+    ("TotalReviews_SteamSpy", "total_ss"), ("TotalReviews_AllLanguages", "total_store"),
+)
+RECORD_FIELDS = tuple(col for col, _ in RECORD_ATTRS)
+# 저장 열: 레코드 + 벡터 연산으로 채우는 추정 수익
+COLUMNS = RECORD_FIELDS + ("EstimatedRevenue_SteamSpy", "EstimatedRevenue_AllLanguages")
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+
+def _require():
+    try:
+        import pandas as pd
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError("Parquet/Arrow 출력에는 pandas, pyarrow 가 필요합니다: pip install pandas pyarrow") from e
+    return pd, pa
+
+
+def arrow_schema():
+    _, pa = _require()
+    return pa.schema([
+        ("AppID", pa.int64()),
+        ("Name", pa.string()),
+        ("ReleaseYear", pa.int16()),
+        ("Genre", pa.string()),
+        ("Price", pa.float64()),
+        ("Currency", pa.string()),
+        ("DiscountPercent", pa.int8()),
+        ("TotalReviews_SteamSpy", pa.int64()),
+        ("TotalReviews_AllLanguages", pa.int64()),
+        ("EstimatedRevenue_SteamSpy", pa.float64()),
+        ("EstimatedRevenue_AllLanguages", pa.float64()),
+    ])
+
+
+# ===== 벡터 연산 =====
+def discount_to_number(series):
+    """"50%" 형태 문자열 열 → 정수 열 (빈 값은 0)"""
+    pd, _ = _require()
+    text = series.astype("string").str.rstrip("%")
+    return pd.to_numeric(text, errors="coerce").fillna(0).astype("int8")
+
+
+def parse_price_column(series):
+    """가격 문자열 열 → (수치 열, 통화 열). 무료는 0, 알 수 없으면 NaN/None"""
+    pd, _ = _require()
+    text = series.astype("string")
+    parts = text.str.extract(PRICE_RE)
+    value = pd.to_numeric(parts[1].str.replace(",", "", regex=False), errors="coerce")
+    free = text.str.lower().str.contains("free|무료", na=False)
+    value = value.mask(free, 0.0)
+    return value.astype("float64"), parts[0].astype(object).where(parts[0].notna(), None)
+
+
+def add_revenue(df):
+    """EstimatedRevenue_* = 리뷰 수 × REVIEW_MULTIPLIER × 가격 (통화가 있고 가격 > 0 일 때만)"""
+    priced = df["Currency"].notna() & (df["Price"].fillna(0) > 0)
+    for source in ("SteamSpy", "AllLanguages"):
+        reviews = df[f"TotalReviews_{source}"].clip(lower=0)
+        df[f"EstimatedRevenue_{source}"] = (reviews * REVIEW_MULTIPLIER * df["Price"]).where(priced, 0.0)
+    return df
+
+
+def records_to_frame(records):
+    """수집 레코드(GameRecord) → 타입이 정해진 DataFrame"""
+    pd, _ = _require()
+    records = list(records)
+    df = pd.DataFrame({col: [getattr(r, attr) for r in records] for col, attr in RECORD_ATTRS},
+                      columns=list(RECORD_FIELDS))
+    appid = pd.to_numeric(df["AppID"], errors="coerce")
+    if appid.isna().any():
+        print(f"[변환] AppID가 숫자가 아닌 행 {int(appid.isna().sum())}개 제외 (번들 등)")
+        df, appid = df[appid.notna()].reset_index(drop=True), appid[appid.notna()]
+    df["AppID"] = appid.astype("int64").to_numpy()
+    df["ReleaseYear"] = pd.to_numeric(df["ReleaseYear"], errors="coerce").astype("Int16")  # 연도 모름은 null
+    df["Price"] = pd.to_numeric(df["Price"], errors="coerce").astype("float64")
+    df["Currency"] = df["Currency"].astype(object).where(df["Currency"].notna(), None)
+    df["DiscountPercent"] = discount_to_number(df["DiscountPercent"])
+    for col in ("TotalReviews_SteamSpy", "TotalReviews_AllLanguages"):
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")  # 조회 실패는 null
+    return add_revenue(df)[list(COLUMNS)]
+
+
+def _column(df, names):
+    return next((c for c in names if c in df.columns), None)
+
+
+def _review_counts(pd, values):
+    """CSV 리뷰 수 열 → Int64 (조회 실패/묻지 않은 값은 null, 그 밖의 이상값은 기존처럼 0)"""
+    values = values.str.replace(",", "", regex=False)
+    unknown = values.isin((UNAVAILABLE, ""))
+    return pd.to_numeric(values, errors="coerce").fillna(0).astype("Int64").mask(unknown)
+
+
+def csv_to_frame(path):
+    """기존 CSV 출력(예전 덤프 형식 포함) → 타입이 정해진 DataFrame. 수익은 다시 계산."""
+    pd, _ = _require()
+    raw = pd.read_csv(path, dtype=str, keep_default_na=False)
+    appid = pd.to_numeric(raw["AppID"], errors="coerce")
+    valid = appid.notna()
+    if not valid.all():
+        print(f"[변환] AppID가 숫자가 아닌 행 {int((~valid).sum())}개 제외 (번들 등)")
+        raw, appid = raw[valid].reset_index(drop=True), appid[valid]
+    df = pd.DataFrame({
+        "AppID": appid.astype("int64").to_numpy(),
+        "Name": raw["Name"],
+        # 연도 모름은 행을 버리지 않고 null (records_to_frame 과 같음)
+        "ReleaseYear": pd.to_numeric(raw["ReleaseYear"], errors="coerce").astype("Int16"),
+        "Genre": raw["Genre"],
+    })
+    df["Price"], df["Currency"] = parse_price_column(raw["Price"])
+    df["DiscountPercent"] = discount_to_number(raw["DiscountPercent"]) if "DiscountPercent" in raw else 0
+    for col, names in (("TotalReviews_SteamSpy", SS_COLUMNS), ("TotalReviews_AllLanguages", STORE_COLUMNS)):
+        src = _column(raw, names)
+        if src:
+            df[col] = _review_counts(pd, raw[src])
+        elif col == "TotalReviews_SteamSpy" and "PositiveReviews" in raw:
+            # SteamDBAll 출력: SteamSpy 긍정 + 부정 (SteamDBStore.snapshot_from_csv 와 같은 규칙)
+            total = _review_counts(pd, raw["PositiveReviews"])
+            if "NegativeReviews" in raw:
+                total = total + _review_counts(pd, raw["NegativeReviews"]).fillna(0)
+            df[col] = total
+        else:
+            df[col] = pd.array([0] * len(raw), dtype="Int64")
+    df["DiscountPercent"] = df["DiscountPercent"].astype("int8")
+    return add_revenue(df)[list(COLUMNS)]
+
+
+# ===== 저장 / 읽기 =====
+def write_frame(df, path, fmt=None):
+    _, pa = _require()
+    fmt = fmt or ("arrow" if path.endswith((".arrow", ".feather")) else "parquet")
+    table = pa.Table.from_pandas(df, schema=arrow_schema(), preserve_index=False)
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        pq.write_table(table, path)
+    else:
+        import pyarrow.feather as feather
+        feather.write_feather(table, path)
+
+
+def load(path):
+    """Parquet / Arrow 파일 → DataFrame"""
+    pd, _ = _require()
+    if path.endswith((".arrow", ".feather")):
+        return pd.read_feather(path)
+    return pd.read_parquet(path)
+
+
+class ColumnarWriter:
+    """StreamingCsvWriter 와 같은 사용법의 Parquet/Arrow 싱크.
+
+    GameRecord 를 모아 batch_rows 마다 벡터 연산 후 한 묶음으로 기록한다.
+    """
+
+    def __init__(self, path, fmt="parquet", batch_rows=BATCH_ROWS):
+        _, pa = _require()
+        self.path = path
+        self.fmt = fmt
+        self.batch_rows = batch_rows
+        self.schema = arrow_schema()
+        self.buffer = []
+        self.rows = 0
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+            self.writer = pq.ParquetWriter(path, self.schema)
+        else:
+            self.sink = pa.OSFile(path, "wb")
+            self.writer = pa.ipc.new_file(self.sink, self.schema)
+
+    def _flush(self):
+        if not self.buffer:
+            return
+        _, pa = _require()
+        with metrics.timer("write", self.fmt):
+            df = records_to_frame(self.buffer)
+            self.writer.write_table(pa.Table.from_pandas(df, schema=self.schema, preserve_index=False))
+        self.buffer = []
+
+    def write(self, record):
+        self.buffer.append(record)
+        self.rows += 1
+        metrics.progress.add_rows()
+        if len(self.buffer) >= self.batch_rows:
+            self._flush()
+
+    def write_all(self, records):
+        for record in records:
+            self.write(record)
+        return self.rows
+
+    def close(self):
+        if self.writer is None:
+            return
+        self._flush()
+        self.writer.close()
+        if self.fmt != "parquet":
+            self.sink.close()
+        self.writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def output_path(csv_path, fmt):
+    """CSV 경로의 확장자를 형식에 맞게 바꿈 (IndieGameDetailList.csv → IndieGameDetailList.parquet)"""
+    base = csv_path[:-4] if csv_path.endswith(".csv") else csv_path
+    return base + FORMATS[fmt]
+
+
+# ===== 기존 CSV 변환 =====
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("사용법: python SteamDBColumnar.py 입력.csv [출력.parquet|출력.arrow]")
+        sys.exit(1)
+    src = sys.argv[1]
+    dst = sys.argv[2] if len(sys.argv) > 2 else output_path(src, "parquet")
+    start = time.perf_counter()
+    frame = csv_to_frame(src)
+    write_frame(frame, dst)
+    print(f"{src} → {dst} ({len(frame)}행, {time.perf_counter() - start:.2f}초)")
@@ -0,0 +1,111 @@
+import re
+from datetime import datetime
+
+# ===== 공통 설정 =====
+# 네 수집 모드가 같이 쓰는 태그/로케일/URL/파싱 도우미 (표준 라이브러리만 사용 → CLI 도움말이 바로 뜸)
+TAG_INDY = 492  # Indie
+GENRE_TAGS = {
+    'Action': 19,
+    'Adventure': 21,
+    'RPG': 122,
+    'Strategy': 9,
+    'Simulation': 599,
+    'Casual': 597,
+    'Racing': 699,
+    'Sports': 701,
+    'Puzzle': 1664,
+    'Platformer': 1625,
+    'Deckbuilding': 17389
+}
+
+# 로케일 고정: 영어/미국
+LOCALE_QS = "l=english&cc=US"
+USER_AGENT = {"User-Agent": "Mozilla/5.0"}
+HEADERS = {
+    **USER_AGENT,
+    "Accept-Language": "en-US,en;q=0.8",
+}
+STORE_COOKIES = {
+    "Steam_Language": "english",
+    "wants_mature_content": "1",
+    "birthtime": "568022401",  # 성인 통과용 타임스탬프
+}
+
+APP_URL_TMPL    = "https://store.steampowered.com/app/{appid}/?" + LOCALE_QS
+APPREVIEWS_TMPL = "https://store.steampowered.com/appreviews/{appid}?json=1&filter=all&language=all&review_type=all&purchase_type=all"
+STEAMSPY_URL    = "https://steamspy.com/api.php?request=appdetails&appid={appid}"
+
+DATE_FORMATS = ["%Y년 %m월 %d일", "%d %b, %Y", "%b %d, %Y"]
+
+# ===== 가격/리뷰 수 열 규칙 (출력·이력 DB·증분 모듈이 모두 이것을 가져다 씀) =====
+PRICE_RE = r"([$£€₩])\s*([0-9][0-9,]*(?:\.[0-9]+)?)"
+REVIEW_MULTIPLIER = 50   # 리뷰 1개당 판매량 추정
+# 이전 출력 파일의 리뷰 수 열 (예전 덤프 형식 포함)
+SS_COLUMNS = ("TotalReviews_SteamSpy",)
+STORE_COLUMNS = ("TotalReviews_AllLanguages", "TotalReviews_HTML")
+UNAVAILABLE = "N/A"  # 조회 실패(차단기 열림 등)로 모르는 리뷰 수/수익의 CSV 표기
+
+
+# ===== 유틸 =====
+def try_parse_date(text):
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            continue
+    return None
+
+def extract_year_fallback(text):
+    m = re.search(r'\b(19|20)\d{2}\b', text or "")
+    return int(m.group(0)) if m else ""
+
+def clean_price(text):
+    if not text:
+        return "Unknown"
+    return text.strip().replace("\n", "").replace("\r", "")
+
+def _number(text):
+    """"1,234" → 1234, "19.99" → 19.99"""
+    text = text.replace(",", "")
+    return float(text) if "." in text else int(text)
+
+# 통화/숫자 파싱 (₩/$/€/£ 지원) + 무료 판정
+def parse_price(price_text):
+    if not price_text:
+        return None, None
+    low = price_text.lower()
+    if "free" in low or "무료" in low:
+        return 0, None  # 무료
+    m = re.search(PRICE_RE, price_text)
+    if not m:
+        return None, None
+    return _number(m.group(2)), m.group(1)
+
+# 통화 무관 할인율 계산
+def extract_discount_percent(row):
+    try:
+        orig = row["orig_price"]
+        disc = row["final_price"]
+        if orig and disc:
+            def _num(s):
+                m = re.search(r'([0-9][0-9,]*(?:\.[0-9]+)?)', s or "")
+                return _number(m.group(1)) if m else None
+            o = _num(orig)
+            d = _num(disc)
+            if o and d and d < o:
+                return f"{int((1 - d / o) * 100)}%"
+    except:
+        pass
+    return "0%"
+
+def estimate_revenue(total_reviews, price_value):
+    if not price_value or total_reviews <= 0:
+        return 0
+    return total_reviews * REVIEW_MULTIPLIER * price_value
+
+def fmt_money(amount, symbol):
+    if symbol == "₩":
+        return f"₩{int(round(amount)):,}"
+    if symbol in ("$", "€", "£"):
+        return f"{symbol}{amount:,.2f}"
+    return str(amount)
@@ -0,0 +1,329 @@
+import argparse
+import os
+
+from SteamDBColumnar import FORMATS, output_path
+from SteamDBCommon import APP_URL_TMPL, APPREVIEWS_TMPL, HEADERS, STEAMSPY_URL, STORE_COOKIES
+from SteamDBFilter import FIELDS as FILTER_FIELDS, Condition, FilterPlan
+from SteamDBMetrics import install_metrics, metrics
+from SteamDBParse import BACKENDS, parse_review_count, set_parser
+from SteamDBSources import POLICIES as REVIEW_POLICIES, RECONCILE_MIN_GAP, RECONCILE_THRESHOLD, SOURCE_HEADER, STEAMSPY
+from SteamDBStore import DEFAULT_DB as STORE_DB
+
+# ===== 공유 수집 엔진 =====
+# 세 모드(장르 상세 / Indie 전체 / 장르별 연도 집계)가 같은 경로로 세션을 만들고 옵션을 받고 실행한다.
+# 이 모듈은 표준 라이브러리와 가벼운 SteamDB* 모듈만 불러오고,
+# requests/캐시/재생처럼 무거운 모듈은 세션을 실제로 만들 때 불러온다 (SteamDB.py --help 가 바로 뜸).
+DEFAULT_CACHE = "steam_http_cache.sqlite"
+DEFAULT_NEGATIVE_CACHE = "steam_negative_cache.sqlite"
+
+
+# ===== 세션 =====
+def make_crawl_session(concurrency, headers=HEADERS, cookies=STORE_COOKIES):
+    """공유 전송 어댑터 + 호스트별 요청 예산(429/5xx 백오프) + 엔드포인트별 차단기를 장착한 세션
+    → (session, rate_limiter)"""
+    from SteamDBBreaker import install_circuit_breaker
+    from SteamDBRateLimit import install_rate_limiter
+    from SteamDBTransport import make_session
+    session = make_session(headers, concurrency=concurrency)
+    for name, value in (cookies or {}).items():
+        session.cookies.set(name, value, domain=".steampowered.com")
+    rate_limiter = install_rate_limiter(session)
+    install_circuit_breaker(session)
+    return session, rate_limiter
+
+
+class SessionSetup:
+    """prepare_session 이 장착한 캐시/보관소/재생 서버 (실행이 끝나면 close 로 요약 출력 후 정리)"""
+
+    def __init__(self, cache=None, replay=None, archive=None):
+        self.cache = cache
+        self.replay = replay
+        self.archive = archive
+
+    def close(self):
+        if self.cache is not None:
+            print(self.cache.summary())
+            self.cache.close()
+        if self.archive is not None:
+            print(self.archive.summary())
+            self.archive.close()
+        if self.replay is not None:
+            self.replay.stop()
+
+
+def prepare_session(session, args, concurrency=None):
+    """--parser/--http2/--cache/--record/--replay/--archive 를 세션에 적용
+    (전송 → 캐시 → 녹화 → 재생 → 보관소 → 계측 순서, 보관소는 캐시 적중 응답까지 받음)"""
+    from SteamDBArchive import install_archiver
+    from SteamDBCache import install_cache
+    from SteamDBReplay import FixtureStore, ReplayServer, install_recorder, install_replay
+    from SteamDBTransport import install_transport
+
+    print(f"HTML 파서: {set_parser(args.parser).name}")
+    if concurrency is not None or args.http2:
+        install_transport(session, concurrency=concurrency, http2=args.http2)
+    cache = None if args.no_cache else install_cache(session, args.cache)
+    if args.record:
+        install_recorder(session, args.record)
+    replay = ReplayServer(FixtureStore(args.replay)).start() if args.replay else None
+    if replay is not None:
+        install_replay(session, replay.url)
+    archive = install_archiver(session, args.archive) if args.archive else None
+    install_metrics(session)
+    return SessionSetup(cache, replay, archive)
+
+
+# ===== 리뷰 수 조회 =====
+# 값을 모르면(요청 실패, 차단기 열림) 0 대신 None 을 돌려주고, 행에는 "N/A"로 남는다.
+# negative(SteamDBBreaker.NegativeCache)가 있으면 실패/데이터 없음으로 기억된 조회는 다시 보내지 않는다.
+# sources(SteamDBSources.ReviewSources)가 있으면 정책상 묻지 않는 출처는 건너뛰고(None), 값마다 출처를 기록한다.
+def _raise_for_failure(res):
+    """요청 예산의 재시도 후에도 429/5xx 면 실패 (404 등은 '데이터 없음'으로 파싱 단계에서 처리)"""
+    from SteamDBBreaker import FAILURE_STATUSES
+    if res.status_code in FAILURE_STATUSES:
+        res.raise_for_status()
+
+def _noted(sources, appid, column, source, value):
+    if sources is not None:
+        sources.note(appid, column, source)
+    return value
+
+def fetch_steamspy_details(session, appid, negative=None):
+    """SteamSpy appdetails 응답 dict. 실패(차단기 열림 포함)나 실패 캐시에 있는 앱은 None (실패는 negative 에 기록)"""
+    from SteamDBBreaker import FAILED, CircuitOpenError
+
+    if negative is not None and negative.get("steamspy", appid):
+        metrics.count("steamspy.negative_hit")
+        return None
+    metrics.count("steamspy.appdetails")
+    try:
+        r = session.get(STEAMSPY_URL.format(appid=appid), timeout=10)
+        _raise_for_failure(r)
+        return r.json()
+    except CircuitOpenError:
+        metrics.count("steamspy.breaker_open")
+    except Exception as e:
+        print(f"[SteamSpy 실패] appid={appid}: {e}")
+        if negative is not None:
+            negative.add("steamspy", appid, FAILED)
+    return None
+
+def fetch_steamspy_total(session, steamspy_index, appid, negative=None, sources=None):
+    from SteamDBSources import SKIPPED, SS_API, SS_BULK
+
+    if sources is not None and not sources.produces(STEAMSPY):
+        return _noted(sources, appid, STEAMSPY, SKIPPED, None)
+    # 대량 색인에 있으면 요청 없이 사용
+    total = steamspy_index.get(appid)
+    if total is not None:
+        metrics.count("steamspy.index_hit")
+        return _noted(sources, appid, STEAMSPY, SS_BULK, total)
+    if sources is not None and not sources.asks(STEAMSPY):
+        return _noted(sources, appid, STEAMSPY, SKIPPED, None)
+    data = fetch_steamspy_details(session, appid, negative)
+    if data is None:
+        return None
+    return _noted(sources, appid, STEAMSPY, SS_API, data.get("positive", 0) + data.get("negative", 0))
+
+# === 모든 언어(All languages) 총 리뷰 수 ===
+def fetch_store_total(session, appid, negative=None, sources=None):
+    from SteamDBBreaker import FAILED, NO_DATA, CircuitOpenError
+    from SteamDBSources import NEGATIVE, SKIPPED, STORE, STORE_API, STORE_PAGE
+
+    if sources is not None and not sources.asks(STORE):
+        return _noted(sources, appid, STORE, SKIPPED, None)
+
+    # 1) 공식 JSON(API) 우선 (api_total: API가 답한 개수, 답이 없으면 None)
+    api_total = None
+    if negative is None or not negative.get("appreviews", appid):
+        try:
+            r = session.get(APPREVIEWS_TMPL.format(appid=appid), timeout=10)
+            j = r.json()
+            total = j.get("query_summary", {}).get("total_reviews", 0)
+            if isinstance(total, int):
+                api_total = total
+        except CircuitOpenError:
+            metrics.count("store_reviews.breaker_open")
+        except Exception as e:
+            print(f"[appreviews API 실패] appid={appid}: {e}")
+            if negative is not None:
+                negative.add("appreviews", appid, FAILED)
+    # API 값은 양수면 그대로, 0개면 앱 페이지로 확인
+    # (cheapest: SteamSpy 값과 임계값 넘게 어긋날 때만 — 양수여도 확인, 맞으면 0개도 그대로)
+    if api_total is not None and not (sources.needs_page(appid, api_total) if sources is not None else api_total == 0):
+        metrics.count("store_reviews.appreviews" if api_total else "store_reviews.page_skipped")
+        return _noted(sources, appid, STORE, STORE_API, api_total)
+
+    def page_failed():
+        """앱 페이지로 확인하지 못했을 때: API 가 답한 값, 없으면 모름"""
+        return _noted(sources, appid, STORE, STORE_API, api_total) if api_total is not None else None
+
+    # 2) 폴백: 상세 페이지 두 번째 요약행(= All Reviews)에서 추출 (요약행 구간만 파싱)
+    reason = negative.get("app_page", appid) if negative is not None else None
+    if reason is not None:
+        metrics.count("store_reviews.negative_hit")
+        if reason == NO_DATA and not api_total:
+            return _noted(sources, appid, STORE, NEGATIVE, 0)
+        return page_failed()
+    metrics.count("store_reviews.html_fallback")
+    try:
+        res = session.get(APP_URL_TMPL.format(appid=appid), timeout=10)
+        _raise_for_failure(res)
+        val = parse_review_count(res.text)
+        if val is not None:
+            return _noted(sources, appid, STORE, STORE_PAGE, val)
+    except CircuitOpenError:
+        metrics.count("store_reviews.breaker_open")
+        return page_failed()
+    except Exception as e:
+        print(f"[HTML 리뷰 파싱 오류] appid={appid}: {e}")
+        if negative is not None:
+            negative.add("app_page", appid, FAILED)
+        return page_failed()
+
+    metrics.count("store_reviews.not_found")
+    if negative is not None:
+        negative.add("app_page", appid, NO_DATA)
+    return page_failed() if api_total else _noted(sources, appid, STORE, STORE_PAGE, 0)
+
+
+# ===== 옵션 =====
+def filter_spec(text):
+    """--filter 값 검사 (형식 오류는 argparse 오류로)"""
+    try:
+        Condition(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+    return text
+
+
+def add_session_args(parser):
+    """모든 모드 공통: 파서 백엔드 / 응답 캐시 / 전송 / 녹화·재생"""
+    parser.add_argument("--parser", choices=sorted(BACKENDS), help="HTML 파서 백엔드 (기본: 설치된 것 중 가장 빠른 것)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="HTTP 응답 캐시 파일 경로")
+    parser.add_argument("--no-cache", action="store_true", help="응답 캐시 사용 안 함")
+    parser.add_argument("--http2", action="store_true",
+                        help='httpx 로 HTTP/2 연결 사용 (호스트당 연결 하나에 다중화, pip install "httpx[http2]")')
+    parser.add_argument("--record", metavar="DIR", help="모든 HTTP 응답을 DIR에 녹화 (오프라인 재생용)")
+    parser.add_argument("--replay", metavar="DIR", help="네트워크 대신 DIR에 녹화된 응답으로 실행")
+    parser.add_argument("--archive", metavar="DIR",
+                        help="받은 원본 응답을 DIR 의 압축 WARC 세그먼트에 덧붙임 (SteamDB.py reprocess 로 재추출)")
+
+
+def add_detail_args(parser, name, steamspy_scope):
+    """상세 수집 모드 공통 (name: 출력 파일 이름 앞부분, 체크포인트/증분/계측 파일도 이 이름을 따름)"""
+    parser.add_argument("--output", default=f"{name}.csv", help="출력 파일 경로 (parquet/arrow 는 확장자만 바뀜)")
+    parser.add_argument("--checkpoint", default=f"{name}.checkpoint.sqlite", help="체크포인트 파일 경로")
+    parser.add_argument("--resume", action="store_true", help="체크포인트에서 이어서 수집")
+    parser.add_argument("--incremental", metavar="BASELINE_CSV", nargs="?", const=f"{name}.csv",
+                        help=f"이전 출력을 기준으로 신규/갱신 주기가 된 앱만 조회 (기본: {name}.csv)")
+    parser.add_argument("--refresh-state", default=f"{name}.refresh.sqlite",
+                        help="증분 모드의 앱별 조회 시각/증가 속도 기록 파일")
+    parser.add_argument("--no-steamspy-bulk", action="store_true",
+                        help=f"SteamSpy {steamspy_scope} 태그 대량 조회를 끄고 앱마다 appdetails 호출")
+    parser.add_argument("--steamspy-all-pages", type=int, default=0,
+                        help="SteamSpy request=all 을 N페이지(페이지당 1000개, 분당 1회)까지 추가로 색인")
+    parser.add_argument("--filter", metavar="EXPR", type=filter_spec, action="append", default=[],
+                        help="추가 조건 (여러 번 지정하면 AND), 예: year>=2018, price<=20, reviews_ss>=100. "
+                             f"필드: {', '.join(FILTER_FIELDS)} — 검색 행 → SteamSpy → 스토어 순으로 평가해 "
+                             "앞 단계에서 떨어진 앱은 뒤 단계 요청을 하지 않음")
+    parser.add_argument("--prices", choices=["search", "api"], default="search",
+                        help="가격/할인율 출처: search(검색 행 HTML, 추가 요청 없음) / "
+                             "api(스토어 appdetails price_overview 를 검색 페이지마다 한 번에 일괄 조회)")
+    parser.add_argument("--review-source", choices=list(REVIEW_POLICIES), default="both",
+                        help="리뷰 수 출처: both(SteamSpy+스토어) / store / steamspy (한쪽만 조회, 요청 절반) / "
+                             "cheapest(SteamSpy 대량 색인 + 스토어 JSON, 앱 페이지는 두 값이 어긋날 때만). "
+                             "both 가 아니면 값마다 출처 열을 붙임")
+    parser.add_argument("--reconcile-threshold", type=float, default=RECONCILE_THRESHOLD,
+                        help="cheapest: appreviews 값과 SteamSpy 값이 이 비율(큰 쪽 기준) 넘게 다르면 앱 페이지로 확인 "
+                             f"(차이가 {RECONCILE_MIN_GAP}개 이하면 같은 값으로 봄)")
+    parser.add_argument("--negative-cache", default=DEFAULT_NEGATIVE_CACHE,
+                        help="실패/데이터 없음으로 확인된 리뷰 조회를 기억해 다시 보내지 않을 파일")
+    parser.add_argument("--no-negative-cache", action="store_true", help="실패 캐시를 파일에 남기지 않음 (이번 실행 안에서만)")
+    parser.add_argument("--store", default=STORE_DB,
+                        help="수집 결과를 (appid, 수집일) 스냅샷으로 쌓아 둘 이력 DB (SteamDBStore.py 로 질의)")
+    parser.add_argument("--no-store", action="store_true", help="이력 DB에 기록하지 않음")
+    parser.add_argument("--format", choices=["csv", *FORMATS], default="csv",
+                        help="출력 형식: csv(표시용 문자열) / parquet, arrow(수치 열, pandas+pyarrow 필요)")
+    parser.add_argument("--metrics-json", default=f"{name}.metrics.json",
+                        help="단계별 지연 히스토그램/카운터 요약을 저장할 JSON 경로")
+    parser.add_argument("--progress-interval", type=float, default=5.0,
+                        help="진행 줄(행/초, 남은 시간) 출력 간격(초), 0이면 끔")
+
+
+# ===== 상세 수집 실행 =====
+def run_detail(args, session, header, iter_rows, rate_limiter, steamspy_index, steamspy_tags, price_index=None,
+               negative_cache=None, review_sources=None):
+    """상세 수집 모드의 실행 & 저장.
+
+    iter_rows(checkpoint=, planner=, records=, filters=, prices=) 는 모드별 행(또는 GameRecord) 생성기.
+    negative_cache 는 모드의 리뷰 조회 함수가 쓰는 SteamDBBreaker.NegativeCache (여기서 파일을 붙임).
+    review_sources 는 같은 함수들이 쓰는 SteamDBSources.ReviewSources (여기서 --review-source 를 적용).
+    """
+    from SteamDBBreaker import breakers
+    from SteamDBCheckpoint import CrawlCheckpoint
+    from SteamDBColumnar import ColumnarWriter
+    from SteamDBIncremental import RefreshPlanner
+    from SteamDBStore import SnapshotStore
+    from SteamDBTransport import connection_summary
+    from SteamDBWriter import StreamingCsvWriter
+
+    filters = FilterPlan(args.filter, steamspy_index)
+    if review_sources is not None:
+        review_sources.configure(args.review_source, args.reconcile_threshold)
+        unasked = [c.text for c in filters.conditions if c.stage != "search" and not review_sources.asks(c.stage)]
+        if unasked:
+            raise SystemExit(f"--review-source {args.review_source} 로는 조회하지 않는 리뷰 수 조건: {', '.join(unasked)}")
+        if review_sources.with_columns:
+            header = header + SOURCE_HEADER
+    prices = price_index if args.prices == "api" else None
+    setup = prepare_session(session, args)
+    if negative_cache is not None and not args.no_negative_cache:
+        negative_cache.open(args.negative_cache)
+
+    # 기준 CSV는 출력 파일을 열기 전에 메모리로 읽어 둔다 (같은 파일이어도 됨)
+    planner = RefreshPlanner(args.incremental, args.refresh_state) if args.incremental else None
+    if review_sources is None or review_sources.produces(STEAMSPY):
+        if not args.no_steamspy_bulk:
+            steamspy_index.load_tags(session, steamspy_tags)
+        steamspy_index.load_all(session, args.steamspy_all_pages)
+    checkpoint = CrawlCheckpoint(args.checkpoint, resume=args.resume)
+    store = None if args.no_store else SnapshotStore(args.store)
+    metrics.progress.reset()
+    metrics.start_display(args.progress_interval)
+    out_path = args.output if args.format == "csv" else output_path(args.output, args.format)
+    sink = StreamingCsvWriter(out_path, header) if args.format == "csv" else ColumnarWriter(out_path, args.format)
+    with sink:
+        try:
+            rows = iter_rows(checkpoint=checkpoint, planner=planner, records=args.format != "csv", filters=filters,
+                             prices=prices)
+            sink.write_all(store.tee(rows, header, os.path.basename(out_path)) if store else rows)
+        finally:
+            checkpoint.close()
+            if store is not None:
+                store.close()
+            metrics.stop_display()
+    print(f"{out_path} 저장 완료. ({sink.rows}행)")
+    print(rate_limiter.summary())
+    print(breakers.summary())
+    print(connection_summary(session))
+    if review_sources is None or review_sources.produces(STEAMSPY):
+        print(steamspy_index.summary())
+    if prices is not None:
+        print(prices.summary())
+    if review_sources is not None:
+        print(review_sources.summary())
+    if negative_cache is not None:
+        print(negative_cache.summary())
+        negative_cache.close()
+    if store is not None:
+        print(store.summary())
+    if filters:
+        print(filters.summary())
+    if planner is not None:
+        print(planner.summary())
+        planner.close()
+    setup.close()
+    print(metrics.summary())
+    metrics.write_json(args.metrics_json)
+    print(f"계측 요약 저장: {args.metrics_json}")
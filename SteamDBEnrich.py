@@ -0,0 +1,83 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from SteamDBMetrics import metrics
+
+# ===== 설정 =====
+# 호스트별 동시 요청 수 (SteamSpy는 느리고 빡빡하므로 낮게)
+ENRICH_WORKERS = {
+    "steamspy": 4,
+    "store": 8,
+}
+
+# ===== 병렬 보강(리뷰 수 조회) =====
+def enrich_appids(appids, fetch_ss, fetch_store, workers=None, checkpoint=None, keep_ss=None, complete=None):
+    """appid 목록에 대해 SteamSpy/스토어 조회를 호스트별 풀에서 동시에 실행.
+
+    반환값은 {appid: (total_ss, total_store)} 이며, 각 값은 순차 경로에서
+    fetch_ss(appid), fetch_store(appid)를 차례로 부른 결과와 같다.
+    checkpoint가 주어지면 이미 보강된 appid는 건너뛰고, 새 결과는 앱마다 끝나는 대로 기록한다
+    (중단돼도 묶음 전체가 아니라 진행 중이던 앱만 다시 조회).
+    keep_ss(appid, total_ss)가 주어지면 SteamSpy 값이 나온 앱부터 검사해 통과한 앱만
+    스토어를 조회하고, 떨어진 앱은 결과(와 체크포인트)에서 빠진다.
+    complete((total_ss, total_store))는 체크포인트에 남길 값인지 판단 (기본: None 이 없는 값,
+    출처 정책으로 한쪽을 묻지 않으면 ReviewSources.complete).
+    """
+    appids = list(dict.fromkeys(appids))  # 순서 유지 + 중복 제거
+    if checkpoint is None:
+        return _enrich(appids, fetch_ss, fetch_store, workers, keep_ss)
+
+    done = checkpoint.get_enriched(appids)
+    # 조회에 실패한 값(None)은 남기지 않아 재개할 때 다시 조회
+    complete = complete or (lambda v: None not in v)
+
+    def save(appid, value):
+        if complete(value):
+            checkpoint.save_enriched({appid: value})
+
+    fresh = _enrich([a for a in appids if a not in done], fetch_ss, fetch_store, workers, keep_ss, save)
+    return {appid: done[appid] if appid in done else fresh[appid]
+            for appid in appids if appid in done or appid in fresh}
+
+
+def _enrich(appids, fetch_ss, fetch_store, workers, keep_ss=None, on_result=None):
+    """on_result(appid, (total_ss, total_store))는 앱 하나의 두 값이 모두 나올 때마다 호출"""
+    workers = {**ENRICH_WORKERS, **(workers or {})}
+    if not appids:
+        return {}
+    fetch_ss = metrics.wrap("enrich", "steamspy", fetch_ss)
+    fetch_store = metrics.wrap("enrich", "store", fetch_store)
+
+    # 워커 수가 1 이하이면 순차 경로 그대로 실행
+    if workers["steamspy"] <= 1 and workers["store"] <= 1:
+        result = {}
+        for appid in appids:
+            total_ss = fetch_ss(appid)
+            if keep_ss is None or keep_ss(appid, total_ss):
+                result[appid] = (total_ss, fetch_store(appid))
+                if on_result is not None:
+                    on_result(appid, result[appid])
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, workers["steamspy"]), thread_name_prefix="steamspy") as ss_pool, \
+         ThreadPoolExecutor(max_workers=max(1, workers["store"]), thread_name_prefix="store") as store_pool:
+        ss_futs = {appid: ss_pool.submit(fetch_ss, appid) for appid in appids}
+        if keep_ss is None:
+            # 조건이 없으면 두 호스트 풀을 처음부터 동시에
+            store_futs = {appid: store_pool.submit(fetch_store, appid) for appid in appids}
+        else:
+            # SteamSpy 값이 끝나는 순서대로 검사해 통과한 앱만 스토어 풀에 넣음 (느린 앱 하나가 뒤를 막지 않도록)
+            store_futs = {}
+            appid_of = {fut: appid for appid, fut in ss_futs.items()}
+            for fut in as_completed(appid_of):
+                appid = appid_of[fut]
+                if keep_ss(appid, fut.result()):
+                    store_futs[appid] = store_pool.submit(fetch_store, appid)
+        # 스토어 값이 끝나는 순서대로 결과를 넘김
+        result = {}
+        appid_of = {fut: appid for appid, fut in store_futs.items()}
+        for fut in as_completed(appid_of):
+            appid = appid_of[fut]
+            result[appid] = (ss_futs[appid].result(), fut.result())
+            if on_result is not None:
+                on_result(appid, result[appid])
+        return {appid: result[appid] for appid in appids if appid in result}
@@ -0,0 +1,143 @@
+import operator
+import re
+import threading
+
+from SteamDBCommon import REVIEW_MULTIPLIER
+
+# ===== 단계별 필터 =====
+# "year>=2018", "price<=20", "reviews_ss>=100" 같은 조건을 값을 얻는 비용 순서대로 평가한다.
+#   search   : 검색 행 값만 사용 (요청 0회)
+#   steamspy : SteamSpy 리뷰 수 (대량 색인이면 0회, 아니면 appdetails 1회)
+#   store    : 스토어 전체 언어 리뷰 수 (appreviews, 실패 시 상세 페이지까지)
+# 앞 단계에서 떨어진 앱은 뒤 단계 요청을 하지 않으며, 단계별로 아낀 요청 수를 센다.
+STAGES = ("search", "steamspy", "store")
+
+
+def _discount(c):
+    text = (c[6] or "").rstrip("%")
+    return int(text) if text.isdigit() else 0
+
+
+def _revenue(total, c):
+    if total is None:  # 조회 실패: 조건을 통과시키지 않음
+        return None
+    return total * REVIEW_MULTIPLIER * c[4] if c[5] and c[4] else 0
+
+
+# 필드: (단계, 값 함수(후보, SteamSpy 리뷰 수, 전체 언어 리뷰 수))
+# 후보 = (appid, title, year, price_str, price_value, currency, discount_percent)
+FIELDS = {
+    "year":       ("search", lambda c, ss, store: c[2]),
+    "price":      ("search", lambda c, ss, store: c[4]),
+    "currency":   ("search", lambda c, ss, store: c[5]),
+    "discount":   ("search", lambda c, ss, store: _discount(c)),
+    "reviews_ss": ("steamspy", lambda c, ss, store: ss),
+    "revenue_ss": ("steamspy", lambda c, ss, store: _revenue(ss, c)),
+    "reviews":    ("store", lambda c, ss, store: store),
+    "revenue":    ("store", lambda c, ss, store: _revenue(store, c)),
+}
+OPS = {">=": operator.ge, "<=": operator.le, "==": operator.eq, "!=": operator.ne, ">": operator.gt, "<": operator.lt}
+CONDITION_RE = re.compile(r"^\s*(\w+)\s*(>=|<=|==|!=|>|<)\s*(.+?)\s*$")
+
+
+class Condition:
+    def __init__(self, text):
+        m = CONDITION_RE.match(text)
+        if not m or m.group(1) not in FIELDS:
+            raise ValueError(f"필터 형식 오류: {text!r} (예: year>=2018, 필드: {', '.join(FIELDS)})")
+        self.text = text.strip()
+        self.field, op, raw = m.groups()
+        self.stage, self.get = FIELDS[self.field]
+        self.op = OPS[op]
+        try:
+            self.value = float(raw)
+        except ValueError:
+            self.value = raw.strip("'\"")
+
+    def __call__(self, c, ss=None, store=None):
+        """값을 모르거나(가격 Unknown 등) 비교할 수 없으면 통과시키지 않음"""
+        value = self.get(c, ss, store)
+        if value is None or value == "" or isinstance(value, str) != isinstance(self.value, str):
+            return False
+        return self.op(value, self.value)
+
+
+class FilterPlan:
+    """조건 목록을 단계별로 나눠 평가하고 단계별 제외 수/절약 요청 수를 센다.
+
+    같은 앱이 여러 장르/페이지에 나와도 앱당 한 번만 센다.
+    """
+
+    def __init__(self, specs=(), steamspy_index=None):
+        self.conditions = [Condition(s) for s in specs]
+        self.by_stage = {stage: [c for c in self.conditions if c.stage == stage] for stage in STAGES}
+        self.steamspy_index = steamspy_index
+        self.stats = {stage: {"checked": 0, "dropped": 0} for stage in STAGES}
+        self.saved = {"steamspy": 0, "store": 0}
+        self.decided = {stage: {} for stage in STAGES}  # 단계 → {appid: 통과 여부}
+        self.lock = threading.Lock()
+
+    def __bool__(self):
+        return bool(self.conditions)
+
+    def _decide(self, stage, c, ss=None, store=None):
+        appid = c[0]
+        with self.lock:
+            if appid in self.decided[stage]:
+                return self.decided[stage][appid], False
+        keep = all(cond(c, ss, store) for cond in self.by_stage[stage])
+        with self.lock:
+            first = appid not in self.decided[stage]
+            if first:
+                self.decided[stage][appid] = keep
+                self.stats[stage]["checked"] += 1
+                self.stats[stage]["dropped"] += not keep
+        return keep, first
+
+    def search(self, candidates):
+        """검색 행 조건을 통과한 후보만 (보강 전)"""
+        if not self.by_stage["search"]:
+            return list(candidates)
+        kept = []
+        for c in candidates:
+            keep, first = self._decide("search", c)
+            if keep:
+                kept.append(c)
+            elif first:
+                with self.lock:
+                    self.saved["store"] += 1
+                    if self.steamspy_index is None or str(c[0]) not in self.steamspy_index.totals:
+                        self.saved["steamspy"] += 1
+        return kept
+
+    def steamspy_check(self, candidates):
+        """enrich_appids 의 keep_ss: SteamSpy 조건이 없으면 None (두 조회를 그대로 동시에)"""
+        if not self.by_stage["steamspy"]:
+            return None
+        by_appid = {c[0]: c for c in candidates}
+
+        def keep_ss(appid, total_ss):
+            keep, first = self._decide("steamspy", by_appid[appid], total_ss)
+            if not keep and first:
+                with self.lock:
+                    self.saved["store"] += 1
+            return keep
+        return keep_ss
+
+    def keep_row(self, c, total_ss, total_store):
+        """행을 내보내기 직전: SteamSpy/스토어 조건 (이월·체크포인트 값 포함)"""
+        return (self._decide("steamspy", c, total_ss)[0] if self.by_stage["steamspy"] else True) and \
+               (self._decide("store", c, total_ss, total_store)[0] if self.by_stage["store"] else True)
+
+    def summary(self):
+        if not self.conditions:
+            return ""
+        with self.lock:
+            s, saved = self.stats, self.saved
+            return "\n".join([
+                f"[필터] {' AND '.join(c.text for c in self.conditions)}",
+                f"[필터] 검색 단계: {s['search']['checked']}개 중 {s['search']['dropped']}개 제외",
+                f"[필터] SteamSpy 단계: {s['steamspy']['checked']}개 중 {s['steamspy']['dropped']}개 제외",
+                f"[필터] 스토어 단계: {s['store']['checked']}개 중 {s['store']['dropped']}개 제외",
+                f"[필터] 절약한 요청: SteamSpy appdetails {saved['steamspy']}회 / 스토어 리뷰 조회 {saved['store']}회",
+            ])
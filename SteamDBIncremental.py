@@ -0,0 +1,145 @@
+import csv
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from SteamDBCommon import SS_COLUMNS, STORE_COLUMNS, UNAVAILABLE
+
+# ===== 증분 갱신 정책 =====
+# 앱마다 마지막 조회 시각과 리뷰 증가 속도(리뷰/일)를 기록해 두고,
+# 데이터 나이가 아래 주기를 넘은 앱만 다시 조회한다. 나머지는 이전 값을 그대로 쓴다.
+REFRESH_DAYS = 14          # 기본 주기
+RECENT_RELEASE_DAYS = 1    # 올해/작년 출시작
+HOT_VELOCITY = 20.0        # 하루 리뷰 20개 이상 → 매일
+HOT_DAYS = 1
+WARM_VELOCITY = 2.0        # 하루 리뷰 2개 이상 → 3일
+WARM_DAYS = 3
+
+DAY = 86400.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS refresh_state (
+    appid        TEXT PRIMARY KEY,
+    refreshed_at REAL,
+    total        INTEGER,
+    velocity     REAL
+);
+"""
+
+
+def _int_or_zero(value):
+    try:
+        return int(str(value).replace(",", ""))
+    except (TypeError, ValueError):
+        return 0
+
+
+def review_total(total_ss, total_store):
+    """증가 속도를 잴 리뷰 수: 스토어 값, 없으면 SteamSpy 값 (둘 다 없으면 0)"""
+    return total_store or total_ss or 0
+
+
+def load_baseline(path):
+    """이전 CSV → {appid: (total_ss, total_store)}"""
+    baseline = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        ss_col = next((c for c in SS_COLUMNS if c in reader.fieldnames), None)
+        store_col = next((c for c in STORE_COLUMNS if c in reader.fieldnames), None)
+        for row in reader:
+            if UNAVAILABLE in (row.get(ss_col), row.get(store_col)):
+                continue  # 값을 몰랐던 앱은 이월하지 않고 새로 조회
+            # 빈 칸은 출처 정책(--review-source)상 묻지 않았던 값
+            baseline[row["AppID"]] = tuple(
+                (None if row[col] == "" else _int_or_zero(row[col])) if col else 0 for col in (ss_col, store_col)
+            )
+    return baseline
+
+
+class RefreshPlanner:
+    def __init__(self, baseline_path, state_path, now=None):
+        self.now = now or time.time()
+        self.baseline = load_baseline(baseline_path)
+        self.baseline_time = os.path.getmtime(baseline_path)
+        self.current_year = datetime.fromtimestamp(self.now).year
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(state_path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.stats = {"new": 0, "refreshed": 0, "carried": 0}
+        print(f"증분 모드: 기준 파일 {baseline_path} ({len(self.baseline)}개 앱)")
+
+    def _state(self, appid):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT refreshed_at, total, velocity FROM refresh_state WHERE appid = ?", (appid,)
+            ).fetchone()
+
+    def interval_days(self, year, velocity):
+        if velocity >= HOT_VELOCITY:
+            return HOT_DAYS
+        if isinstance(year, int) and year >= self.current_year - 1:
+            return RECENT_RELEASE_DAYS
+        if velocity >= WARM_VELOCITY:
+            return WARM_DAYS
+        return REFRESH_DAYS
+
+    def split(self, candidates):
+        """후보 목록 → (새로 조회할 appid 목록, {appid: 이전 값} 이월분)"""
+        to_fetch, carried, first_seen = [], {}, []
+        for c in candidates:
+            appid, year = c[0], c[2]
+            if appid not in self.baseline:
+                to_fetch.append(appid)
+                self.stats["new"] += 1
+                continue
+            state = self._state(appid)
+            if state is None:
+                # 처음 보는 앱: 기준 파일이 만들어진 시각을 조회 시각으로 간주
+                refreshed_at, velocity = self.baseline_time, 0.0
+                first_seen.append((appid, refreshed_at, review_total(*self.baseline[appid]), velocity))
+            else:
+                refreshed_at, _, velocity = state
+            age_days = (self.now - refreshed_at) / DAY
+            if age_days >= self.interval_days(year, velocity or 0.0):
+                to_fetch.append(appid)
+                self.stats["refreshed"] += 1
+            else:
+                carried[appid] = self.baseline[appid]
+                self.stats["carried"] += 1
+        if first_seen:
+            with self.lock, self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO refresh_state (appid, refreshed_at, total, velocity) VALUES (?, ?, ?, ?)",
+                    first_seen,
+                )
+        return to_fetch, carried
+
+    def record(self, enriched, complete=None):
+        """새로 조회한 값으로 조회 시각/증가 속도 갱신
+        complete: 값이 다 나왔는지 판단 (기본: None 이 없음, SteamDBEnrich.enrich_appids 와 같음)"""
+        complete = complete or (lambda v: None not in v)
+        updates = []
+        for appid, (total_ss, total_store) in enriched.items():
+            if not complete((total_ss, total_store)):
+                continue  # 조회 실패: 다음 실행에서 다시
+            total = review_total(total_ss, total_store)
+            state = self._state(appid)
+            velocity = 0.0
+            if state is not None and state[1] is not None:
+                days = max((self.now - state[0]) / DAY, 1 / 24)
+                velocity = max(0.0, (total - state[1]) / days)
+            updates.append((appid, self.now, total, velocity))
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO refresh_state (appid, refreshed_at, total, velocity) VALUES (?, ?, ?, ?)",
+                updates,
+            )
+
+    def summary(self):
+        s = self.stats
+        return f"[증분] 신규 {s['new']} / 재조회 {s['refreshed']} / 이월 {s['carried']}"
+
+    def close(self):
+        self.conn.close()
@@ -1,92 +1,116 @@
-import requests
-from bs4 import BeautifulSoup
-import time
-from datetime import datetime
 import csv
-
-# 태그 ID
-TAG_INDY = 492
-GENRE_TAGS = {
-    'Action': 19,
-    'Adventure': 21,
-    'RPG': 122,
-    'Strategy': 9,
-    'Simulation': 599,
-    'Casual': 597,
-    'Racing': 699,
-    'Sports': 701,
-    'Puzzle': 1664,
-    'Platformer': 1625,
-    'Deckbuilding': 17389
-}
-
-USER_AGENT = {"User-Agent": "Mozilla/5.0"}
-URL_TEMPLATE = "https://store.steampowered.com/search/?tags={tag1},{tag2}&category1=998&page={page}"
-
-# 날짜 파싱 함수
-def try_parse_date(text):
-    formats = ["%Y년 %m월 %d일", "%d %b, %Y", "%b %d, %Y"]
-    for fmt in formats:
-        try:
-            return datetime.strptime(text, fmt)
-        except ValueError:
-            continue
-    return None
-
-# 연도별 카운트 함수
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+from SteamDBCommon import GENRE_TAGS, LOCALE_QS, TAG_INDY, USER_AGENT, try_parse_date
+from SteamDBEngine import make_crawl_session, prepare_session
+from SteamDBMetrics import metrics
+from SteamDBSearch import HTML_PAGE_SIZE, PREFETCH_PAGES, SEARCH_PAGE_SIZE, iter_search_pages
+from SteamDBTransport import connection_summary
+
+GENRE_QUERY_TMPL = "tags={tag1},{tag2}&category1=998&" + LOCALE_QS
+INDIE_QUERY_TMPL = "category1=998&tags={tag}&" + LOCALE_QS  # SteamDBCollector_AllIndie 와 같은 쿼리 (캐시 공유)
+MAX_RESULTS = 30 * HTML_PAGE_SIZE  # 장르당 상한: 기존 HTML 30페이지
+YEAR_RANGE = list(range(2010, 2026))
+GENRE_WORKERS = 4  # 동시에 수집할 장르 수 (요청 속도는 호스트 예산이 제한)
+
+# 세션 + 호스트별 요청 예산(고정 sleep 대신)
+# 연결 풀 = 동시 요청 수: 장르 워커마다 검색 페이지를 PREFETCH_PAGES 장씩 미리 가져옴
+session, rate_limiter = make_crawl_session(GENRE_WORKERS * PREFETCH_PAGES, headers=USER_AGENT, cookies=None)
+
+def release_year(item):
+    """검색 행의 출시 연도 (출시 예정/파싱 실패는 None)"""
+    release_text = item["released"]
+    if not release_text or "출시" in release_text or "Coming" in release_text:
+        return None
+    release_date = try_parse_date(release_text)
+    return release_date.year if release_date else None
+
+def parse_tagids(text):
+    """data-ds-tagids 속성("[492,1628,...]") → 태그 id 목록"""
+    try:
+        return json.loads(text or "[]")
+    except ValueError:
+        return []
+
+# 연도별 카운트 함수 (장르 1개, 상위 MAX_RESULTS개까지)
 def count_games_by_year(indie_tag, genre_tag, year_range):
     year_counts = {year: 0 for year in year_range}
-    max_pages = 30
-
-    for page in range(1, max_pages + 1):
-        url = URL_TEMPLATE.format(tag1=indie_tag, tag2=genre_tag, page=page)
-        print(f"요청 중: {url}")
-        try:
-            res = requests.get(url, headers=USER_AGENT, timeout=10)
-        except Exception as e:
-            print(f"요청 실패: {e}")
-            break
-
-        soup = BeautifulSoup(res.text, 'html.parser')
-        items = soup.select('.search_result_row')
-        if not items:
-            break
-
-        for item in items:
-            release = item.select_one('.search_released')
-            if not release:
-                continue
-            release_text = release.get_text(strip=True)
-            if "출시" in release_text or "Coming" in release_text:
-                continue
-
-            release_date = try_parse_date(release_text)
-            if release_date and release_date.year in year_counts:
-                year_counts[release_date.year] += 1
-
-        time.sleep(1)
-
+    query = GENRE_QUERY_TMPL.format(tag1=indie_tag, tag2=genre_tag)
+    seen = 0
+    try:
+        # MAX_RESULTS 를 덮는 페이지까지만 요청 (그 뒤 페이지는 미리 받지도 않음)
+        end_page = -(-MAX_RESULTS // SEARCH_PAGE_SIZE)
+        with closing(iter_search_pages(session, query, end_page=end_page)) as pages:
+            for _, items in pages:
+                for item in items[:MAX_RESULTS - seen]:
+                    year = release_year(item)
+                    if year in year_counts:
+                        year_counts[year] += 1
+                seen += len(items)
+    except Exception as e:
+        print(f"요청 실패: {e}")
     return year_counts
 
+# Indie 전체를 한 번만 훑고, 행마다 붙은 태그 목록으로 장르×연도 집계
+def count_all_genres_single_pass(indie_tag, genre_tags, year_range):
+    counts = {genre_name: {year: 0 for year in year_range} for genre_name in genre_tags}
+    genre_of = {tag: genre_name for genre_name, tag in genre_tags.items()}
+    try:
+        for _, items in iter_search_pages(session, INDIE_QUERY_TMPL.format(tag=indie_tag)):
+            for item in items:
+                year = release_year(item)
+                if year not in year_range:
+                    continue
+                for tag in parse_tagids(item["tagids"]):
+                    genre_name = genre_of.get(tag)
+                    if genre_name is not None:
+                        counts[genre_name][year] += 1
+    except Exception as e:
+        print(f"요청 실패: {e}")
+    return counts
+
 # 전체 실행
-def run_all():
-    year_range = list(range(2010, 2026))
+def run_all(single_pass=False, workers=GENRE_WORKERS, out_path="IndieGenreYearlyCount.csv"):
+    year_range = YEAR_RANGE
     result_rows = []
 
     header = ["Genre"] + year_range
     result_rows.append(header)
 
-    for genre_name, genre_id in GENRE_TAGS.items():
-        print(f"\n▶ {genre_name} 장르 처리 중...")
-        counts = count_games_by_year(TAG_INDY, genre_id, year_range)
+    if single_pass:
+        print("\n▶ Indie 전체 한 번 수집 → 태그 목록으로 장르별 집계")
+        by_genre = count_all_genres_single_pass(TAG_INDY, GENRE_TAGS, year_range)
+    else:
+        print(f"\n▶ {len(GENRE_TAGS)}개 장르 동시 처리 중 (최대 {workers}개)...")
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="genre") as pool:
+            counts = pool.map(lambda tag: count_games_by_year(TAG_INDY, tag, year_range), GENRE_TAGS.values())
+            by_genre = dict(zip(GENRE_TAGS, counts))
+
+    for genre_name in GENRE_TAGS:
+        counts = by_genre[genre_name]
         row = [genre_name] + [counts[y] for y in year_range]
         result_rows.append(row)
 
-    with open("IndieGenreYearlyCount.csv", "w", newline='', encoding="utf-8") as f:
+    with open(out_path, "w", newline='', encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerows(result_rows)
 
-    print("\nIndieGenreYearlyCount.csv 저장 완료!")
+    print(f"\n{out_path} 저장 완료!")
+    print(rate_limiter.summary())
+    print(connection_summary(session))
 
 # 실행
-run_all()
+def run(args):
+    """SteamDB.py yearly (옵션은 SteamDB.build_parser)"""
+    workers = GENRE_WORKERS if args.workers is None else args.workers
+    setup = prepare_session(session, args, concurrency=(1 if args.single_pass else max(1, workers)) * PREFETCH_PAGES)
+    run_all(single_pass=args.single_pass, workers=workers, out_path=args.output)
+    setup.close()
+    print(metrics.summary())
+
+if __name__ == "__main__":
+    from SteamDB import main
+    main(["yearly", *sys.argv[1:]], sys.modules[__name__])
@@ -0,0 +1,266 @@
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+
+# ===== 단계별 계측 =====
+# 단계(stage) × 라벨(label)마다 지연 히스토그램, 이름별 카운터를 모은다.
+#   request: 엔드포인트별로 호출 측이 체감한 시간 (캐시 적중, 예산 대기, 재시도 포함)
+#   fetch  : 엔드포인트별 실제 네트워크 왕복 (시도 1회 단위)
+#   wait   : 요청 예산 때문에 잠든 시간 (호스트별)
+#   parse  : HTML 파싱 (검색 행 / 앱 페이지 리뷰 요약)
+#   enrich : 앱 1개의 SteamSpy / 스토어 리뷰 수 조회 전체
+#   write  : CSV 한 행 기록
+# 모듈 전역 metrics 하나를 모든 모듈이 공유하고, 끝에 JSON으로 내보낸다.
+
+# 히스토그램 구간 상한(ms). 마지막은 그 이상 전부
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+# URL → 엔드포인트 이름 (위에서부터 먼저 매칭)
+ENDPOINTS = [
+    ("steamspy.com/api.php?request=appdetails", "steamspy_appdetails"),
+    ("steamspy.com/api.php?request=tag", "steamspy_tag"),
+    ("steamspy.com/api.php?request=all", "steamspy_all"),
+    ("store.steampowered.com/appreviews/", "appreviews"),
+    ("store.steampowered.com/api/appdetails", "store_appdetails"),
+    ("store.steampowered.com/app/", "app_page"),
+    ("store.steampowered.com/search/results/", "search_json"),
+    ("store.steampowered.com/search/", "search_html"),
+]
+
+# 폴백 비율: 이름 → (폴백 카운터, 분모 카운터들)
+FALLBACK_RATES = {
+    "search_html_fallback": ("search.html_fallback", ("search.json", "search.html_fallback")),
+    "store_reviews_html_fallback": ("store_reviews.html_fallback",
+                                    ("store_reviews.appreviews", "store_reviews.html_fallback")),
+    "store_reviews_not_found": ("store_reviews.not_found",
+                                ("store_reviews.appreviews", "store_reviews.html_fallback")),
+    "steamspy_appdetails_fallback": ("steamspy.appdetails", ("steamspy.index_hit", "steamspy.appdetails")),
+    "price_search_fallback": ("prices.search_fallback", ("prices.api", "prices.search_fallback")),
+}
+
+
+def endpoint_of(url):
+    for pattern, name in ENDPOINTS:
+        if pattern in url:
+            return name
+    return "other"
+
+
+class Histogram:
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.buckets[bisect.bisect_left(BUCKETS_MS, seconds * 1000)] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def quantile_ms(self, q):
+        """구간 상한으로 어림한 분위수(ms)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return float(min(BUCKETS_MS[i], self.max * 1000)) if i < len(BUCKETS_MS) else self.max * 1000
+        return self.max * 1000
+
+    def to_dict(self):
+        labels = [f"<={b}ms" for b in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        return {
+            "count": self.count,
+            "total_sec": round(self.total, 4),
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "min_ms": round((self.min or 0.0) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "p50_ms": self.quantile_ms(0.5),
+            "p95_ms": self.quantile_ms(0.95),
+            "p99_ms": self.quantile_ms(0.99),
+            "buckets": {label: n for label, n in zip(labels, self.buckets) if n},
+        }
+
+
+# ===== 진행 표시 =====
+def _fmt_duration(seconds):
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}시간 {seconds % 3600 // 60}분"
+    if seconds >= 60:
+        return f"{seconds // 60}분 {seconds % 60}초"
+    return f"{seconds}초"
+
+
+class Progress:
+    """done/total(작업 단위)과 기록된 행 수로 행/초와 남은 시간을 계산"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started = time.monotonic()
+            self.total = None
+            self.done = 0
+            self.rows = 0
+
+    def set_total(self, total):
+        with self.lock:
+            self.total = total
+
+    def add_total(self, n):
+        """전체 작업량을 나눠서 알게 될 때 (예: 장르마다 검색 결과 개수)"""
+        with self.lock:
+            self.total = (self.total or 0) + n
+
+    def advance(self, n=1):
+        with self.lock:
+            self.done += n
+
+    def add_rows(self, n=1):
+        with self.lock:
+            self.rows += n
+
+    def line(self):
+        with self.lock:
+            elapsed = max(time.monotonic() - self.started, 1e-9)
+            text = f"[진행] {self.rows:,}행 ({self.rows / elapsed:.1f}행/초, 경과 {_fmt_duration(elapsed)})"
+            if self.total:
+                text += f" / {min(self.done, self.total):,}/{self.total:,} ({self.done / self.total:.0%})"
+                if self.done:
+                    remaining = max(self.total - self.done, 0) * elapsed / self.done
+                    text += f" / 남은 시간 약 {_fmt_duration(remaining)}"
+            return text
+
+
+# ===== 계측 모음 =====
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.progress = Progress()
+        self._display = None
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.started = time.time()
+            self.histograms = {}   # stage → {label: Histogram}
+            self.counters = {}
+        self.progress.reset()
+
+    def observe(self, stage, label, seconds):
+        with self.lock:
+            labels = self.histograms.setdefault(stage, {})
+            if label not in labels:
+                labels[label] = Histogram()
+            labels[label].observe(seconds)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    @contextmanager
+    def timer(self, stage, label="all"):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, label, time.perf_counter() - start)
+
+    def wrap(self, stage, label, fn):
+        """fn 호출마다 시간을 재는 함수를 반환"""
+        def timed(*args, **kwargs):
+            with self.timer(stage, label):
+                return fn(*args, **kwargs)
+        return timed
+
+    def fallback_rates(self):
+        rates = {}
+        with self.lock:
+            for name, (hit, totals) in FALLBACK_RATES.items():
+                denom = sum(self.counters.get(t, 0) for t in totals)
+                if denom:
+                    rates[name] = round(self.counters.get(hit, 0) / denom, 4)
+        return rates
+
+    def snapshot(self):
+        rates = self.fallback_rates()
+        with self.lock:
+            stages = {stage: {label: h.to_dict() for label, h in sorted(labels.items())}
+                      for stage, labels in sorted(self.histograms.items())}
+            counters = dict(sorted(self.counters.items()))
+        p = self.progress
+        return {
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "elapsed_sec": round(time.time() - self.started, 3),
+            "rows": p.rows,
+            "progress": {"done": p.done, "total": p.total},
+            "stages": stages,
+            "counters": counters,
+            "fallback_rates": rates,
+        }
+
+    def write_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+
+    def summary(self):
+        snap = self.snapshot()
+        lines = [f"[계측] {snap['rows']:,}행 / {snap['elapsed_sec']:.1f}초"]
+        for stage, labels in snap["stages"].items():
+            for label, h in labels.items():
+                lines.append(f"[계측] {stage:<7} {label:<22} {h['count']:>7}회 합계 {h['total_sec']:>8.2f}초 "
+                             f"p50 {h['p50_ms']:.1f}ms p95 {h['p95_ms']:.1f}ms 최대 {h['max_ms']:.1f}ms")
+        for name, rate in snap["fallback_rates"].items():
+            lines.append(f"[계측] {name}: {rate:.1%}")
+        return "\n".join(lines)
+
+    # ----- 실시간 진행 표시 -----
+    def start_display(self, interval=5.0):
+        """interval초마다 진행 줄을 출력하는 백그라운드 스레드 (0이면 끔)"""
+        if interval <= 0 or self._display is not None:
+            return
+        stop = threading.Event()
+
+        def loop():
+            last = None
+            while not stop.wait(interval):
+                p = self.progress
+                if (p.rows, p.done) != last:  # 멈춰 있으면 같은 줄 반복 안 함
+                    print(p.line(), flush=True)
+                    last = (p.rows, p.done)
+
+        thread = threading.Thread(target=loop, name="progress", daemon=True)
+        thread.start()
+        self._display = (stop, thread)
+
+    def stop_display(self):
+        if self._display is not None:
+            stop, thread = self._display
+            stop.set()
+            thread.join()
+            self._display = None
+            print(self.progress.line(), flush=True)
+
+
+metrics = Metrics()
+
+
+def install_metrics(session, metrics_=None):
+    """세션의 현재 어댑터(캐시/요청 예산 포함)를 계측 어댑터로 감싼다. 캐시 설치 후 호출."""
+    from SteamDBTransport import MetricsAdapter  # requests 는 실제로 세션을 쓸 때만 불러옴
+    metrics_ = metrics_ or metrics
+    for prefix in ("https://", "http://"):
+        session.mount(prefix, MetricsAdapter(session.get_adapter(prefix), metrics_))
+    return metrics_
@@ -0,0 +1,244 @@
+import os
+import re
+
+from SteamDBMetrics import metrics
+
+# ===== HTML 파싱 백엔드 =====
+# 검색 행 / 리뷰 요약행 추출을 백엔드와 무관한 dict로 돌려준다.
+# - selectolax : Lexbor(C) 기반, 가장 빠름
+# - lxml       : libxml2(C) 기반
+# - bs4        : BeautifulSoup + html.parser (순수 파이썬, 기준 구현)
+# STEAMDB_PARSER 환경변수 또는 set_parser()로 고를 수 있고, 기본값은 설치된 것 중 가장 빠른 것.
+PARSER_PREFERENCE = ("selectolax", "lxml", "bs4")
+
+REVIEW_ROW_RE = re.compile(r'<a\b[^>]*class="[^"]*\buser_reviews_summary_row\b', re.I)
+
+
+# ----- BeautifulSoup (html.parser) -----
+class Bs4Backend:
+    name = "bs4"
+
+    def __init__(self):
+        from bs4 import BeautifulSoup
+        self._soup = BeautifulSoup
+
+    def search_rows(self, html):
+        soup = self._soup(html, "html.parser")
+        rows = []
+        for item in soup.select(".search_result_row"):
+            title = item.select_one(".title")
+            released = item.select_one(".search_released")
+            price = item.select_one(".discount_final_price") or item.select_one(".search_price")
+            orig = item.select_one(".discount_original_price")
+            final = item.select_one(".discount_final_price")
+            rows.append({
+                "href": item.get("href"),
+                "ds_appid": item.get("data-ds-appid"),
+                "tagids": item.get("data-ds-tagids"),
+                "title": title.text if title else None,
+                "released": released.get_text(strip=True) if released else None,
+                "price": price.text if price else None,
+                "orig_price": orig.text if orig else None,
+                "final_price": final.text if final else None,
+            })
+        soup.decompose()
+        return rows
+
+    def review_rows(self, html):
+        soup = self._soup(html, "html.parser")
+        rows = []
+        for a in soup.select("a.user_reviews_summary_row"):
+            meta = a.select_one('meta[itemprop="ratingCount"], meta[itemprop="reviewCount"]')
+            rows.append({
+                "meta": meta.get("content") if meta else None,
+                "tooltip": a.get("data-tooltip-html", "") or "",
+                "text": a.get_text(" ", strip=True),
+            })
+        soup.decompose()
+        return rows
+
+
+# ----- lxml -----
+class LxmlBackend:
+    name = "lxml"
+
+    def __init__(self):
+        import lxml.html
+        self._html = lxml.html
+
+    def _root(self, html):
+        if not html or not html.strip():
+            return None
+        return self._html.fromstring(html)
+
+    @staticmethod
+    def _first(el, cls):
+        found = el.find_class(cls)
+        return found[0] if found else None
+
+    def search_rows(self, html):
+        root = self._root(html)
+        if root is None:
+            return []
+        rows = []
+        for item in root.find_class("search_result_row"):
+            title = self._first(item, "title")
+            released = self._first(item, "search_released")
+            final = self._first(item, "discount_final_price")
+            price = final if final is not None else self._first(item, "search_price")
+            orig = self._first(item, "discount_original_price")
+            rows.append({
+                "href": item.get("href"),
+                "ds_appid": item.get("data-ds-appid"),
+                "tagids": item.get("data-ds-tagids"),
+                "title": title.text_content() if title is not None else None,
+                "released": "".join(t.strip() for t in released.itertext()) if released is not None else None,
+                "price": price.text_content() if price is not None else None,
+                "orig_price": orig.text_content() if orig is not None else None,
+                "final_price": final.text_content() if final is not None else None,
+            })
+        return rows
+
+    def review_rows(self, html):
+        root = self._root(html)
+        if root is None:
+            return []
+        rows = []
+        for a in root.iter("a"):
+            if "user_reviews_summary_row" not in (a.get("class") or "").split():
+                continue
+            meta = a.xpath('.//meta[@itemprop="ratingCount" or @itemprop="reviewCount"]')
+            rows.append({
+                "meta": meta[0].get("content") if meta else None,
+                "tooltip": a.get("data-tooltip-html", "") or "",
+                "text": " ".join(t.strip() for t in a.itertext() if t.strip()),
+            })
+        return rows
+
+
+# ----- selectolax -----
+class SelectolaxBackend:
+    name = "selectolax"
+
+    def __init__(self):
+        try:
+            from selectolax.lexbor import LexborHTMLParser as HTMLParser
+        except ImportError:  # selectolax < 0.3 (Modest 백엔드만 있음)
+            from selectolax.parser import HTMLParser
+        self._parser = HTMLParser
+
+    def search_rows(self, html):
+        tree = self._parser(html)
+        rows = []
+        for item in tree.css(".search_result_row"):
+            title = item.css_first(".title")
+            released = item.css_first(".search_released")
+            final = item.css_first(".discount_final_price")
+            price = final if final is not None else item.css_first(".search_price")
+            orig = item.css_first(".discount_original_price")
+            attrs = item.attributes
+            rows.append({
+                "href": attrs.get("href"),
+                "ds_appid": attrs.get("data-ds-appid"),
+                "tagids": attrs.get("data-ds-tagids"),
+                "title": title.text() if title is not None else None,
+                "released": released.text(strip=True) if released is not None else None,
+                "price": price.text() if price is not None else None,
+                "orig_price": orig.text() if orig is not None else None,
+                "final_price": final.text() if final is not None else None,
+            })
+        return rows
+
+    def review_rows(self, html):
+        tree = self._parser(html)
+        rows = []
+        for a in tree.css("a.user_reviews_summary_row"):
+            meta = a.css_first('meta[itemprop="ratingCount"], meta[itemprop="reviewCount"]')
+            rows.append({
+                "meta": meta.attributes.get("content") if meta is not None else None,
+                "tooltip": a.attributes.get("data-tooltip-html", "") or "",
+                "text": a.text(separator=" ", strip=True),
+            })
+        return rows
+
+
+BACKENDS = {
+    "selectolax": SelectolaxBackend,
+    "lxml": LxmlBackend,
+    "bs4": Bs4Backend,
+}
+
+_active = None
+
+
+def get_parser(name=None):
+    """이름으로 백엔드 생성. 이름이 없으면 설치된 것 중 선호 순서대로."""
+    if name:
+        return BACKENDS[name]()
+    for candidate in PARSER_PREFERENCE:
+        try:
+            return BACKENDS[candidate]()
+        except ImportError:
+            continue
+    raise ImportError("사용 가능한 HTML 파서가 없습니다 (bs4 / lxml / selectolax)")
+
+
+def set_parser(name=None):
+    global _active
+    _active = get_parser(name)
+    return _active
+
+
+def active_parser():
+    if _active is None:
+        set_parser(os.environ.get("STEAMDB_PARSER") or None)
+    return _active
+
+
+# ===== 공개 추출 함수 =====
+def parse_search_rows(html):
+    """검색 결과(전체 페이지 또는 results_html 조각)의 행 목록"""
+    with metrics.timer("parse", "search"):
+        return active_parser().search_rows(html)
+
+
+def review_summary_fragment(html):
+    """앱 페이지에서 리뷰 요약행(<a class="user_reviews_summary_row">)이 있는 구간만 잘라냄"""
+    starts = [m.start() for m in REVIEW_ROW_RE.finditer(html or "")]
+    if not starts:
+        return ""
+    end = html.find("</a>", starts[-1])
+    return html[starts[0]:] if end < 0 else html[starts[0]:end + len("</a>")]
+
+
+def _largest_int_in(text: str):
+    nums = re.findall(r'[\d,]+', text or "")
+    if not nums:
+        return None
+    return max(int(n.replace(",", "")) for n in nums)
+
+
+def parse_review_count(html, partial=True):
+    """앱 페이지의 두 번째 요약행(= All Reviews)에서 총 리뷰 수. 없으면 None.
+
+    partial=True 이면 요약행 구간만 파싱한다(페이지 전체 대비 수백 분의 1 크기).
+    """
+    fragment = html
+    if partial:
+        # 따옴표 형식이 달라 구간을 못 찾으면 전체 파싱으로
+        fragment = review_summary_fragment(html) or (html if "user_reviews_summary_row" in (html or "") else "")
+    with metrics.timer("parse", "app_reviews"):
+        rows = active_parser().review_rows(fragment) if fragment else []
+    if not rows:
+        return None
+    target = rows[1] if len(rows) >= 2 else rows[0]
+
+    # (a) schema.org 메타
+    if target["meta"]:
+        return int(target["meta"].replace(",", ""))
+
+    # (b) 툴팁/텍스트의 숫자들 중 가장 큰 값
+    val = _largest_int_in(target["tooltip"])
+    if val is not None:
+        return val
+    return _largest_int_in(target["text"])
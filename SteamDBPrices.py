@@ -0,0 +1,119 @@
+import threading
+from dataclasses import dataclass
+
+from SteamDBCommon import LOCALE_QS
+from SteamDBMetrics import metrics
+from SteamDBRecord import intern_text
+
+# ===== 스토어 appdetails 가격 일괄 조회 =====
+# 검색 행 HTML의 가격 문자열을 긁는 대신, appdetails 에 appid 를 쉼표로 묶어 물어
+# 정가/판매가(센트 단위 정수)/할인율/통화를 한 번에 받는다.
+# appdetails 는 filters=price_overview 일 때만 여러 appid 를 받는다.
+# price_overview 가 없는 앱(무료, 판매 안 함, 지역 제한)은 색인에 넣지 않고 검색 행 값을 쓴다.
+APPDETAILS_PRICE_TMPL = ("https://store.steampowered.com/api/appdetails"
+                         "?appids={appids}&filters=price_overview&" + LOCALE_QS)
+PRICE_BATCH = 100  # 요청 하나에 묶을 appid 수 (검색 JSON 한 페이지와 같음)
+CURRENCY_SYMBOLS = {"USD": "$", "EUR": "€", "GBP": "£", "KRW": "₩"}
+
+
+@dataclass(slots=True, frozen=True)
+class PriceInfo:
+    currency: str           # ISO 코드 ("USD")
+    initial: int            # 정가, 최소 단위 (1999 = $19.99)
+    final: int              # 판매가, 최소 단위
+    discount_percent: int
+    final_formatted: str    # "$9.99"
+
+    @classmethod
+    def from_overview(cls, po):
+        return cls(intern_text(po["currency"]), int(po["initial"]), int(po["final"]),
+                   int(po.get("discount_percent") or 0), intern_text(po.get("final_formatted") or ""))
+
+    @property
+    def symbol(self):
+        return CURRENCY_SYMBOLS.get(self.currency)
+
+    @property
+    def price_value(self):
+        """판매가 (검색 행 parse_price 와 같은 꼴: 원화는 정수, 그 외 소수)"""
+        return self.final // 100 if self.currency == "KRW" else self.final / 100
+
+
+class PriceIndex:
+    """appid → PriceInfo. load() 로 여러 앱을 묶어 채우고, apply() 로 후보 튜플의 가격 필드를 바꾼다."""
+
+    def __init__(self, batch=PRICE_BATCH):
+        self.batch = batch
+        self.prices = {}
+        self.asked = set()  # 한 번 물어본 appid (가격이 없어도 다시 묻지 않음)
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "failed": 0, "apps": 0, "priced": 0}
+
+    def _merge(self, data):
+        priced = 0
+        for appid, entry in (data or {}).items():
+            if not isinstance(entry, dict) or not entry.get("success"):
+                continue
+            po = entry.get("data") or {}
+            po = po.get("price_overview") if isinstance(po, dict) else None
+            if not po:
+                continue
+            try:
+                self.prices[str(appid)] = PriceInfo.from_overview(po)
+            except (KeyError, TypeError, ValueError):
+                continue
+            priced += 1
+        return priced
+
+    def load(self, session, appids):
+        """아직 묻지 않은 appid 만 batch 개씩 묶어 조회 (요청 실패한 묶음은 검색 행 값으로)"""
+        with self.lock:
+            todo = [a for a in dict.fromkeys(map(str, appids)) if a not in self.asked]
+            self.asked.update(todo)
+        for i in range(0, len(todo), self.batch):
+            chunk = todo[i:i + self.batch]
+            url = APPDETAILS_PRICE_TMPL.format(appids=",".join(chunk))
+            try:
+                res = session.get(url, timeout=20)
+                res.raise_for_status()
+                data = res.json()
+            except Exception as e:
+                print(f"[가격 일괄] {len(chunk)}개 조회 실패: {e}")
+                with self.lock:
+                    self.stats["failed"] += 1
+                continue
+            with self.lock:
+                priced = self._merge(data)
+                self.stats["requests"] += 1
+                self.stats["apps"] += len(chunk)
+                self.stats["priced"] += priced
+
+    def get(self, appid):
+        """PriceInfo, 없으면 None"""
+        return self.prices.get(str(appid))
+
+    def apply(self, candidates):
+        """후보 (appid, title, year, price_str, price_value, currency, discount_percent) 의 가격 필드를
+        price_overview 값으로 바꾼 목록 (가격이 없는 앱은 그대로)"""
+        out = []
+        for c in candidates:
+            info = self.get(c[0])
+            if info is None or info.symbol is None:
+                metrics.count("prices.search_fallback")
+                out.append(c)
+                continue
+            metrics.count("prices.api")
+            price_str = info.final_formatted or c[3]
+            out.append((c[0], c[1], c[2], intern_text(price_str), info.price_value,
+                        intern_text(info.symbol), intern_text(f"{info.discount_percent}%")))
+        return out
+
+    def fetch(self, session, candidates):
+        """load + apply (검색 페이지 하나 분량)"""
+        self.load(session, [c[0] for c in candidates])
+        return self.apply(candidates)
+
+    def summary(self):
+        s = self.stats
+        return (f"[가격 일괄] 요청 {s['requests']}회 (실패 {s['failed']}) / 앱 {s['apps']}개 중 "
+                f"price_overview {s['priced']}개, 나머지는 검색 행 가격")
@@ -0,0 +1,216 @@
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from SteamDBMetrics import endpoint_of, metrics
+
+# ===== 설정 =====
+# 호스트별 예산: (초당 요청 수, 버스트 허용량)
+# SteamSpy appdetails는 공식적으로 초당 1회 제한
+HOST_BUDGETS = {
+    "store.steampowered.com": (4.0, 8),
+    "steamspy.com": (1.0, 1),
+}
+DEFAULT_BUDGET = (2.0, 2)
+# URL 패턴별 별도 예산 (호스트 예산보다 우선)
+URL_BUDGETS = {
+    "steamspy.com/api.php?request=all": (1 / 60, 1),  # SteamSpy 전체 목록: 분당 1회
+    "store.steampowered.com/api/appdetails": (0.6, 4),  # 스토어 appdetails: 5분에 약 200회
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0     # 첫 백오프(초)
+BACKOFF_CAP = 60.0     # 최대 백오프(초)
+MIN_RATE_RATIO = 0.1   # 스로틀 시 기본 속도의 10%까지만 감속
+RECOVERY_STEP = 0.05   # 성공할 때마다 기본 속도의 5%씩 회복
+
+
+def _host_of(url):
+    return urlsplit(url).hostname or ""
+
+
+def _bucket_key(url, url_budgets):
+    for pattern in url_budgets:
+        if pattern in url:
+            return pattern
+    return _host_of(url)
+
+
+def parse_retry_after(value):
+    """Retry-After 헤더(초 또는 HTTP 날짜)를 초 단위로 변환"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return max(0.0, (dt - datetime.now(timezone.utc)).total_seconds())
+
+
+# ===== 토큰 버킷 (호스트 1개) =====
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.base_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.failures = 0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """토큰 하나를 예약하고, 호출자가 기다려야 할 시간(초)을 반환"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def backoff(self, retry_after=None):
+        """429/5xx: Retry-After 우선, 없으면 지수 백오프 + 지터. 속도는 절반으로."""
+        with self.lock:
+            self.failures += 1
+            if retry_after is None:
+                delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (self.failures - 1))
+                delay *= random.uniform(0.5, 1.5)
+            else:
+                delay = min(BACKOFF_CAP, retry_after)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            self.rate = max(self.base_rate * MIN_RATE_RATIO, self.rate / 2)
+            return delay
+
+    def recover(self):
+        """성공 응답: 실패 카운터 초기화 + 속도 점진 회복"""
+        with self.lock:
+            self.failures = 0
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + self.base_rate * RECOVERY_STEP)
+
+
+# ===== 호스트별 제한기 =====
+class HostRateLimiter:
+    def __init__(self, budgets=None, default=DEFAULT_BUDGET, url_budgets=None):
+        self.budgets = {**HOST_BUDGETS, **(budgets or {})}
+        self.url_budgets = {**URL_BUDGETS, **(url_budgets or {})}
+        self.default = default
+        self.buckets = {}
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def _bucket(self, host):
+        with self.lock:
+            if host not in self.buckets:
+                rate, burst = self.url_budgets.get(host) or self.budgets.get(host, self.default)
+                self.buckets[host] = TokenBucket(rate, burst)
+                self.stats[host] = {"requests": 0, "retries": 0, "backoffs": 0,
+                                    "wait_sec": 0.0, "fetch_sec": 0.0}
+            return self.buckets[host]
+
+    def _count(self, host, key, amount=1):
+        with self.lock:
+            self.stats[host][key] += amount
+
+    def acquire(self, url):
+        """예산 키(호스트 또는 URL 패턴)를 반환"""
+        host = _bucket_key(url, self.url_budgets)
+        wait = self._bucket(host).reserve()
+        if wait > 0:
+            time.sleep(wait)
+            self._count(host, "wait_sec", wait)
+            metrics.observe("wait", host, wait)
+        return host
+
+    def record_fetch(self, host, elapsed, url=None):
+        self._count(host, "requests")
+        self._count(host, "fetch_sec", elapsed)
+        if url is not None:
+            metrics.observe("fetch", endpoint_of(url), elapsed)
+
+    def record_retry(self, host):
+        self._count(host, "retries")
+
+    def backoff(self, host, retry_after=None):
+        self._count(host, "backoffs")
+        return self._bucket(host).backoff(retry_after)
+
+    def recover(self, host):
+        self._bucket(host).recover()
+
+    def summary(self):
+        with self.lock:
+            lines = []
+            for host, s in sorted(self.stats.items()):
+                rate = self.buckets[host].rate
+                lines.append(
+                    f"[{host}] 요청 {s['requests']}회 (재시도 {s['retries']}, 백오프 {s['backoffs']}) / "
+                    f"대기 {s['wait_sec']:.1f}초 / 요청 {s['fetch_sec']:.1f}초 / 현재 속도 {rate:.2f}req/s"
+                )
+            return "\n".join(lines)
+
+
+# ===== requests 어댑터 =====
+class RateLimitedAdapter(BaseAdapter):
+    """세션에 장착하면 모든 요청이 호스트 예산을 따르고 429/5xx에 자동 백오프.
+    실제 전송은 inner 어댑터(기본 HTTPAdapter)가 맡는다."""
+
+    def __init__(self, limiter, inner=None, max_retries_on_throttle=MAX_RETRIES, **kwargs):
+        super().__init__()
+        self.limiter = limiter
+        self.inner = inner or HTTPAdapter(**kwargs)
+        self.max_retries_on_throttle = max_retries_on_throttle
+
+    def send(self, request, **kwargs):
+        attempt = 0
+        while True:
+            host = self.limiter.acquire(request.url)
+            start = time.monotonic()
+            try:
+                resp = self.inner.send(request, **kwargs)
+            except Exception:
+                self.limiter.record_fetch(host, time.monotonic() - start, request.url)
+                self.limiter.backoff(host)
+                raise
+            self.limiter.record_fetch(host, time.monotonic() - start, request.url)
+
+            if resp.status_code in RETRY_STATUSES and attempt < self.max_retries_on_throttle:
+                delay = self.limiter.backoff(host, parse_retry_after(resp.headers.get("Retry-After")))
+                print(f"[{host}] HTTP {resp.status_code} → {delay:.1f}초 후 재시도")
+                resp.close()
+                attempt += 1
+                self.limiter.record_retry(host)
+                continue
+
+            # 재시도를 다 써서 돌려주는 429/5xx 는 속도를 되돌리지 않음
+            if resp.status_code not in RETRY_STATUSES:
+                self.limiter.recover(host)
+            return resp
+
+    def close(self):
+        self.inner.close()
+
+
+limiter = HostRateLimiter()
+
+
+def install_rate_limiter(session, rate_limiter=None, **adapter_kwargs):
+    """세션의 현재 전송 어댑터(SteamDBTransport.make_session)를 호스트별 제한 어댑터로 감싼다"""
+    rate_limiter = rate_limiter or limiter
+    adapter_kwargs.setdefault("inner", session.get_adapter("https://"))
+    adapter = RateLimitedAdapter(rate_limiter, **adapter_kwargs)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return rate_limiter
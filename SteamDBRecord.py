@@ -0,0 +1,86 @@
+import sys
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from SteamDBCommon import REVIEW_MULTIPLIER, UNAVAILABLE
+from SteamDBSources import SKIPPED
+
+# ===== 메모리를 적게 쓰는 결과 레코드 =====
+# 행을 문자열 10개짜리 list로 들고 있는 대신 슬롯 dataclass 하나로 보관한다.
+# - 숫자(appid/연도/리뷰 수)는 int 그대로, 추정 수익은 필요할 때 계산
+# - 반복되는 짧은 문자열(장르/통화/가격 표기/할인율)은 sys.intern 으로 한 객체만 공유
+# CSV로 쓸 때만 to_row()로 기존과 똑같은 list를 만든다.
+# 조회에 실패한 리뷰 수는 None 으로 두고 CSV에는 리뷰 수/수익 모두 "N/A"로 쓴다.
+# 출처 정책(SteamDBSources)상 묻지 않은 값은 빈 칸.
+
+
+def intern_text(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _native_int(value):
+    """"294100" → 294100, 번들 appid("1,2,3")나 빈 값은 그대로"""
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return value
+
+
+@dataclass(slots=True)
+class GameRecord:
+    appid: Union[int, str]
+    title: str
+    year: Union[int, str]
+    genre: str
+    price: str                        # 표시용 가격 문자열 ("$19.99", "Unknown")
+    price_value: Optional[float]
+    currency: Optional[str]
+    discount: str                     # "50%"
+    total_ss: Optional[int]           # None: 조회 실패
+    total_store: Optional[int]
+    source_ss: Optional[str] = None   # 값을 만든 출처 (SteamDBSources), SKIPPED 면 묻지 않음
+    source_store: Optional[str] = None
+
+    @classmethod
+    def from_candidate(cls, genre, candidate, total_ss, total_store, sources=(None, None)):
+        """수집기 후보 튜플 (appid, title, year, price_str, price_value, currency, discount_percent) → 레코드
+        sources: ReviewSources.get(appid) 의 (SteamSpy 출처, 스토어 출처)"""
+        appid, title, year, price_str, price_value, currency, discount_percent = candidate
+        source_ss, source_store = sources
+        if source_ss == SKIPPED:
+            total_ss = None
+        if source_store == SKIPPED:
+            total_store = None
+        return cls(_native_int(appid), title, _native_int(year), intern_text(genre), intern_text(price_str),
+                   price_value, intern_text(currency), intern_text(discount_percent), total_ss, total_store,
+                   intern_text(source_ss), intern_text(source_store))
+
+    def revenue(self, total_reviews):
+        if total_reviews is None:
+            return None
+        if not self.currency or not self.price_value or total_reviews <= 0:
+            return 0
+        return total_reviews * REVIEW_MULTIPLIER * self.price_value
+
+    def to_row(self, fmt_money, with_sources=False):
+        """기존 CSV 행 (HEADER 순서, 수익은 fmt_money 표기)
+        with_sources: 끝에 출처 열 두 개 (SteamDBSources.SOURCE_HEADER)"""
+        def money(total, source):
+            if source == SKIPPED:
+                return ""
+            if total is None:
+                return UNAVAILABLE
+            return fmt_money(self.revenue(total), self.currency) if self.currency else "0"
+
+        def count(total, source):
+            if source == SKIPPED:
+                return ""
+            return UNAVAILABLE if total is None else total
+        row = [
+            str(self.appid), self.title, self.year, self.genre,
+            self.price, self.discount,
+            count(self.total_ss, self.source_ss), money(self.total_ss, self.source_ss),
+            count(self.total_store, self.source_store), money(self.total_store, self.source_store),
+        ]
+        if with_sources:
+            row += [self.source_ss or "", self.source_store or ""]
+        return row
@@ -0,0 +1,209 @@
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from requests.adapters import BaseAdapter
+
+from SteamDBTransport import DEFAULT_CONCURRENCY, PooledHTTPAdapter
+
+# ===== 녹화/재생 (오프라인 측정·회귀 테스트용) =====
+# - FixtureStore      : URL → 응답 본문을 디렉터리에 저장 (index.jsonl + 본문 파일)
+# - RecordingAdapter  : 실제 네트워크 응답을 FixtureStore에 기록
+# - ReplayServer      : 기록된 응답을 내주는 로컬 대역 서버 (지연/오류 주입 가능)
+# - ReplayAdapter     : 세션 요청을 로컬 대역 서버로 돌림 (원래 URL은 헤더로 전달)
+# 두 어댑터 모두 어댑터 체인의 가장 안쪽(실제 전송 자리)에 끼우므로
+# 요청 예산/캐시는 원래 URL 기준으로 그대로 동작한다.
+REPLAY_HEADER = "X-Replay-URL"
+
+
+class FixtureStore:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self.index_path = os.path.join(path, "index.jsonl")
+        self.entries = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry["url"]] = entry
+
+    def __len__(self):
+        return len(self.entries)
+
+    def save(self, url, status, content_type, body):
+        name = hashlib.sha1(url.encode("utf-8")).hexdigest()[:20] + ".body"
+        entry = {"url": url, "file": name, "status": status, "content_type": content_type or ""}
+        with self.lock:
+            with open(os.path.join(self.path, name), "wb") as f:
+                f.write(body)
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.entries[url] = entry
+
+    def load(self, url):
+        """(status, content_type, body) 또는 None"""
+        entry = self.entries.get(url)
+        if entry is None:
+            return None
+        with open(os.path.join(self.path, entry["file"]), "rb") as f:
+            return entry["status"], entry["content_type"], f.read()
+
+
+# ===== 녹화 =====
+class RecordingAdapter(BaseAdapter):
+    def __init__(self, inner, store):
+        super().__init__()
+        self.inner = inner
+        self.store = store
+
+    def send(self, request, **kwargs):
+        resp = self.inner.send(request, **kwargs)
+        if request.method == "GET":
+            self.store.save(request.url, resp.status_code, resp.headers.get("Content-Type"), resp.content)
+        return resp
+
+    def close(self):
+        self.inner.close()
+
+
+# ===== 재생: 로컬 대역 서버 =====
+class _QuietHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 클라이언트가 keep-alive 연결을 먼저 끊는 것은 정상
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+
+class ReplayServer:
+    """기록된 응답을 내주는 로컬 HTTP 서버.
+
+    latency     : 응답마다 더할 지연(초), 실제 값은 latency * U(0.5, 1.5)
+    error_rate  : 이 확률로 503(Retry-After: 0)을 돌려줌
+    """
+
+    def __init__(self, store, latency=0.0, error_rate=0.0, seed=None):
+        self.store = store
+        self.latency = latency
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.stats = {"served": 0, "missing": 0, "injected_errors": 0}
+        self.lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # 헤더/본문 분할 전송 시 지연 ACK(~40ms) 방지
+
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = _QuietHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+        self.thread = None
+
+    def _count(self, key):
+        with self.lock:
+            self.stats[key] += 1
+
+    def _reply(self, handler, status, content_type, body, extra=()):
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type or "application/octet-stream")
+        handler.send_header("Content-Length", str(len(body)))
+        for k, v in extra:
+            handler.send_header(k, v)
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _handle(self, handler):
+        if self.latency:
+            time.sleep(self.latency * self.random.uniform(0.5, 1.5))
+        if self.error_rate and self.random.random() < self.error_rate:
+            self._count("injected_errors")
+            self._reply(handler, 503, "text/plain", b"injected", [("Retry-After", "0")])
+            return
+        found = self.store.load(handler.headers.get(REPLAY_HEADER, ""))
+        if found is None:
+            self._count("missing")
+            self._reply(handler, 404, "text/plain", b"not recorded")
+            return
+        self._count("served")
+        status, content_type, body = found
+        self._reply(handler, status, content_type, body)
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class ReplayAdapter(PooledHTTPAdapter):
+    """모든 요청을 ReplayServer로 보낸다. 응답의 url은 원래 URL로 되돌린다.
+    연결 풀 크기는 교체되는 전송 어댑터의 동시 요청 수를 따른다."""
+
+    def __init__(self, server_url, **kwargs):
+        self.server_url = server_url.rstrip("/")
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        original = request.url
+        routed = request.copy()
+        routed.url = self.server_url + "/replay"
+        routed.headers[REPLAY_HEADER] = original
+        resp = super().send(routed, **kwargs)
+        resp.url = original
+        resp.request = request
+        return resp
+
+
+# ===== 세션에 장착 =====
+def _install(session, make):
+    """어댑터 체인(.inner)을 따라가 가장 안쪽 전송 어댑터를 make(old)로 교체.
+    http/https가 같은 안쪽 어댑터를 공유하면 한 번만 교체한다."""
+    made = {}
+
+    def replace(adapter):
+        if any(adapter is new for new in made.values()):
+            return adapter
+        if hasattr(adapter, "inner") and not isinstance(adapter, (RecordingAdapter, ReplayAdapter)):
+            adapter.inner = replace(adapter.inner)
+            return adapter
+        if id(adapter) not in made:
+            made[id(adapter)] = make(adapter)
+        return made[id(adapter)]
+
+    for prefix in ("https://", "http://"):
+        session.mount(prefix, replace(session.get_adapter(prefix)))
+
+
+def install_recorder(session, path):
+    store = FixtureStore(path)
+    _install(session, lambda inner: RecordingAdapter(inner, store))
+    print(f"[녹화] 응답을 {path} 에 기록합니다 (기존 {len(store)}개)")
+    return store
+
+
+def install_replay(session, server_url):
+    _install(session, lambda inner: ReplayAdapter(server_url, concurrency=getattr(inner, "concurrency", DEFAULT_CONCURRENCY)))
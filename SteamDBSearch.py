@@ -0,0 +1,105 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from SteamDBMetrics import metrics
+from SteamDBParse import parse_search_rows
+
+# ===== 설정 =====
+# 무한 스크롤용 JSON 엔드포인트: 결과 행 HTML 조각(results_html)과 전체 개수(total_count)만 내려줌
+SEARCH_JSON_TMPL = "https://store.steampowered.com/search/results/?{query}&start={start}&count={count}&infinite=1&json=1"
+SEARCH_HTML_TMPL = "https://store.steampowered.com/search/?{query}&page={page}"
+SEARCH_PAGE_SIZE = 100   # JSON 한 번에 받을 행 수
+HTML_PAGE_SIZE = 25      # 기존 검색 페이지의 행 수
+PREFETCH_PAGES = 3       # 소비 중인 페이지보다 앞서 가져올 페이지 수
+
+
+def _fetch_json(session, query, start, count):
+    url = SEARCH_JSON_TMPL.format(query=query, start=start, count=count)
+    print(f"[검색 JSON {start}~{start + count - 1}] 요청 중: {url}")
+    res = session.get(url, timeout=10)
+    res.raise_for_status()
+    data = res.json()
+    if not data.get("success", 1) or "results_html" not in data:
+        raise ValueError(f"예상치 못한 응답: {list(data)[:5]}")
+    return parse_search_rows(data["results_html"]), data.get("total_count")
+
+
+def _fetch_html(session, query, start, count):
+    """JSON 실패 시: 같은 구간을 기존 HTML 검색 페이지 여러 장으로 채움"""
+    items = []
+    first = start // HTML_PAGE_SIZE + 1
+    for page in range(first, first + max(1, count // HTML_PAGE_SIZE)):
+        url = SEARCH_HTML_TMPL.format(query=query, page=page)
+        print(f"[페이지 {page}] 요청 중: {url}")
+        rows = parse_search_rows(session.get(url, timeout=10).text)
+        items.extend(rows)
+        if len(rows) < HTML_PAGE_SIZE:
+            break
+    return items, None
+
+
+def fetch_search_page(session, query, page, page_size=SEARCH_PAGE_SIZE):
+    """검색 결과 page번째 묶음(page_size행)을 반환: (행 dict 목록, 전체 개수 또는 None).
+
+    query 예: "tags=492&category1=998&l=english&cc=US"
+    JSON 엔드포인트를 우선 쓰고, 실패하면 기존 HTML 경로로 같은 구간을 가져온다.
+    HTML 요청까지 실패하면 예외를 그대로 올린다.
+    """
+    start = (page - 1) * page_size
+    try:
+        result = _fetch_json(session, query, start, page_size)
+        metrics.count("search.json")
+        return result
+    except Exception as e:
+        print(f"[검색 JSON 실패 → HTML 폴백] {e}")
+    metrics.count("search.html_fallback")
+    return _fetch_html(session, query, start, page_size)
+
+
+def iter_search_pages(session, query, start_page=1, prefetch=PREFETCH_PAGES, page_size=SEARCH_PAGE_SIZE,
+                      on_total=None, end_page=None):
+    """(page, 행 목록)을 페이지 순서대로 돌려주는 생산자.
+
+    백그라운드 스레드가 소비 중인 페이지보다 prefetch장 앞서 가져오므로,
+    호출 측이 한 페이지를 보강하는 동안 다음 페이지들의 요청/파싱이 진행된다.
+    첫 응답의 total_count로 마지막 페이지를 미리 계산해 빈 페이지 요청을 하지 않는다.
+    (HTML 폴백처럼 total_count가 없으면 빈 페이지가 나올 때까지)
+    요청이 실패하면 해당 페이지 차례에서 예외를 올린다.
+    on_total(total)은 전체 개수를 알게 되면 한 번 호출된다 (진행률 표시용).
+    end_page가 주어지면 그 페이지까지만 가져온다 (상위 N개만 필요할 때 뒤 페이지를 미리 받지 않도록).
+    """
+    if end_page is not None and start_page > end_page:
+        return
+    items, total = fetch_search_page(session, query, start_page, page_size)
+    if not items:
+        return
+    last_page = -(-total // page_size) if total else None
+    if last_page:
+        print(f"검색 결과 총 {total}개 → 마지막 페이지 {last_page}")
+        if on_total is not None:
+            on_total(total)
+    if end_page is not None:
+        last_page = min(last_page or end_page, end_page)
+
+    pool = ThreadPoolExecutor(max_workers=max(1, prefetch), thread_name_prefix="search")
+    pending = deque()
+    next_page = start_page + 1
+
+    def fill():
+        nonlocal next_page
+        while len(pending) < prefetch and (last_page is None or next_page <= last_page):
+            pending.append((next_page, pool.submit(fetch_search_page, session, query, next_page, page_size)))
+            next_page += 1
+
+    try:
+        fill()
+        yield start_page, items
+        while pending:
+            page, fut = pending.popleft()
+            items, _ = fut.result()
+            if not items:
+                return
+            fill()
+            yield page, items
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
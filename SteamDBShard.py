@@ -0,0 +1,392 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import time
+import zlib
+from contextlib import closing
+
+from SteamDBWriter import StreamingCsvWriter
+
+# ===== 분산 수집 (작업 큐 + 워커 + 결정적 병합) =====
+# plan  : 작업을 나눠 큐(SQLite)에 넣는다
+#   pages : Indie 전체 검색을 페이지 구간별로   (SteamDBCollector_AllIndie)
+#   hash  : Indie 전체 목록을 appid 해시 버킷별로 (목록은 각자 읽고 보강만 나눔)
+#   genre : 장르 태그별                         (SteamDBCollector)
+# work  : 작업을 하나씩 가져가(임대) 부분 CSV를 쓴다. 프로세스마다 자기 요청 예산을 가진다.
+# merge : 부분 CSV를 검색 순서 키(_order)로 정렬·중복 제거해 하나로 합친다.
+# 큐 파일을 공유 디렉터리에 두면 여러 머신이 같은 큐를 쓸 수 있다
+# (네트워크 파일시스템의 SQLite 잠금은 환경에 따라 불안정할 수 있음).
+PAGES_PER_TASK = 5
+HASH_BUCKETS = 8
+LEASE_SEC = 30 * 60   # 이 시간 안에 끝나지 않은 작업은 다른 워커가 다시 가져감
+MAX_ATTEMPTS = 3
+ORDER_COL = "_order"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta  (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS tasks (
+    id         INTEGER PRIMARY KEY,
+    payload    TEXT UNIQUE,
+    status     TEXT DEFAULT 'pending',   -- pending / running / done / failed
+    worker     TEXT,
+    claimed_at REAL,
+    attempts   INTEGER DEFAULT 0,
+    rows       INTEGER,
+    error      TEXT
+);
+"""
+
+
+# ===== 작업 큐 =====
+class ShardQueue:
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def get_meta(self):
+        return {k: json.loads(v) for k, v in self.conn.execute("SELECT key, value FROM meta")}
+
+    def set_meta(self, **values):
+        self.conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                              [(k, json.dumps(v)) for k, v in values.items()])
+
+    def add(self, payloads):
+        self.conn.executemany("INSERT OR IGNORE INTO tasks (payload) VALUES (?)",
+                              [(json.dumps(p, sort_keys=True),) for p in payloads])
+
+    def _expire(self, lease_sec=LEASE_SEC):
+        """마지막 시도에서 워커가 죽어 임대가 만료된 작업은 failed 로 (running 에 영원히 남지 않도록)"""
+        self.conn.execute(
+            "UPDATE tasks SET status = 'failed', error = COALESCE(error, '임대 만료 (워커 중단)') "
+            "WHERE status = 'running' AND attempts >= ? AND claimed_at < ?", (MAX_ATTEMPTS, time.time() - lease_sec))
+
+    def claim(self, worker, lease_sec=LEASE_SEC):
+        """대기 중이거나 임대가 만료된 작업 하나를 가져감. 없으면 None"""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._expire(lease_sec)
+            row = self.conn.execute(
+                "SELECT id, payload FROM tasks WHERE attempts < ? AND "
+                "(status = 'pending' OR (status = 'running' AND claimed_at < ?)) ORDER BY id LIMIT 1",
+                (MAX_ATTEMPTS, now - lease_sec),
+            ).fetchone()
+            if row is not None:
+                self.conn.execute(
+                    "UPDATE tasks SET status = 'running', worker = ?, claimed_at = ?, attempts = attempts + 1 "
+                    "WHERE id = ?", (worker, now, row[0]))
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return None if row is None else (row[0], json.loads(row[1]))
+
+    def complete(self, task_id, rows):
+        self.conn.execute("UPDATE tasks SET status = 'done', rows = ?, error = NULL WHERE id = ?", (rows, task_id))
+
+    def fail(self, task_id, error):
+        # 시도 횟수가 남아 있으면 다시 대기열로
+        self.conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END, error = ? "
+            "WHERE id = ?", (MAX_ATTEMPTS, str(error)[:500], task_id))
+
+    def counts(self):
+        self._expire()
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"))
+
+    def tasks(self, status=None):
+        sql = "SELECT id, payload, status, worker, rows, error FROM tasks"
+        rows = self.conn.execute(sql + (" WHERE status = ?" if status else "") + " ORDER BY id",
+                                 (status,) if status else ()).fetchall()
+        return [(i, json.loads(p), s, w, r, e) for i, p, s, w, r, e in rows]
+
+
+def part_path(out_dir, task_id):
+    return os.path.join(out_dir, f"task_{task_id:05d}.csv")
+
+
+def order_key(group, page, pos):
+    """검색 순서를 보존하는 정렬 키 (문자열 비교 = 숫자 비교)"""
+    return f"{group:04d}{page:06d}{pos:04d}"
+
+
+def bucket_of(appid, buckets):
+    return zlib.crc32(str(appid).encode("utf-8")) % buckets
+
+
+# ===== 계획 =====
+def plan_tasks(split, pages_per_task=PAGES_PER_TASK, buckets=HASH_BUCKETS):
+    """분할 방식 → (작업 목록, 범위 "genre"/"indie")"""
+    if split == "genre":
+        import SteamDBCollector as collector
+        payloads = [{"kind": "genre", "genre": name, "group": i} for i, name in enumerate(collector.GENRE_TAGS)]
+        scope = "genre"
+    elif split == "hash":
+        payloads = [{"kind": "hash", "bucket": b, "buckets": buckets} for b in range(buckets)]
+        scope = "indie"
+    else:
+        import SteamDBCollector_AllIndie as collector
+        from SteamDBSearch import SEARCH_PAGE_SIZE, fetch_search_page
+        # 첫 페이지의 total_count로 마지막 페이지 계산 (요청 1회)
+        query = collector.SEARCH_QUERY_TMPL.format(tag=collector.TAG_INDY)
+        _, total = fetch_search_page(collector.session, query, 1)
+        if not total:
+            raise RuntimeError("검색 결과 개수(total_count)를 알 수 없어 페이지 구간을 나눌 수 없습니다")
+        last_page = -(-total // SEARCH_PAGE_SIZE)
+        payloads = [{"kind": "pages", "start": s, "end": min(s + pages_per_task - 1, last_page)}
+                    for s in range(1, last_page + 1, pages_per_task)]
+        scope = "indie"
+    return payloads, scope
+
+
+def plan(queue, split, pages_per_task=PAGES_PER_TASK, buckets=HASH_BUCKETS, out_dir=None):
+    out_dir = out_dir or queue.path + ".parts"
+    payloads, scope = plan_tasks(split, pages_per_task, buckets)
+    queue.set_meta(split=split, scope=scope, out_dir=out_dir)
+    queue.add(payloads)
+    os.makedirs(out_dir, exist_ok=True)
+    print(f"[분산] {split} 분할: 작업 {len(payloads)}개 → {queue.path} (부분 출력: {out_dir})")
+
+
+# ===== 작업 실행 =====
+def _run_pages(task, sink):
+    import SteamDBCollector_AllIndie as collector
+    from SteamDBSearch import fetch_search_page
+    query = collector.SEARCH_QUERY_TMPL.format(tag=collector.TAG_INDY)
+    seen = set()
+    for page in range(task["start"], task["end"] + 1):
+        items, _ = fetch_search_page(collector.session, query, page)
+        if not items:
+            break
+        candidates, _ = collector.parse_search_items(items, seen)
+        _write(sink, 0, page, candidates, collector.build_rows(candidates, collector.enrich_candidates(candidates)))
+
+
+def _run_hash(task, sink):
+    import SteamDBCollector_AllIndie as collector
+    from SteamDBSearch import iter_search_pages
+    query = collector.SEARCH_QUERY_TMPL.format(tag=collector.TAG_INDY)
+    seen = set()
+    with closing(iter_search_pages(collector.session, query)) as pages:
+        for page, items in pages:
+            candidates, _ = collector.parse_search_items(items, seen)
+            mine = [c for c in candidates if bucket_of(c[0], task["buckets"]) == task["bucket"]]
+            _write(sink, 0, page, candidates, collector.build_rows(mine, collector.enrich_candidates(mine)))
+
+
+def _run_genre(task, sink):
+    import SteamDBCollector as collector
+    from SteamDBSearch import iter_search_pages
+    genre_id = collector.GENRE_TAGS[task["genre"]]
+    query = collector.SEARCH_QUERY_TMPL.format(tag1=genre_id)
+    with closing(iter_search_pages(collector.session, query)) as pages:
+        for page, items in pages:
+            candidates = collector.parse_search_items(items)
+            rows = collector.build_rows([(task["genre"], c) for c in candidates],
+                                        collector.enrich_candidates(candidates))
+            _write(sink, task["group"], page, candidates, rows)
+
+
+def _write(sink, group, page, candidates, rows):
+    """행마다 (그룹, 페이지, 페이지 안 위치) 정렬 키를 붙여 기록. 위치는 필터 전 후보 목록 기준."""
+    pos = {c[0]: i for i, c in enumerate(candidates)}
+    for row in rows:
+        sink.write([order_key(group, page, pos[row[0]])] + row)
+
+
+RUNNERS = {"pages": _run_pages, "hash": _run_hash, "genre": _run_genre}
+
+
+def task_header(split):
+    if split == "genre":
+        from SteamDBCollector import HEADER
+    else:
+        from SteamDBCollector_AllIndie import HEADER
+    return [ORDER_COL] + HEADER
+
+
+def _share_budget(divisor):
+    """같은 IP의 로컬 프로세스 N개가 호스트 예산을 N등분"""
+    if divisor <= 1:
+        return
+    from SteamDBRateLimit import limiter
+    share = lambda rate, burst: (rate / divisor, max(1, burst // divisor))
+    limiter.budgets = {h: share(*budget) for h, budget in limiter.budgets.items()}
+    limiter.url_budgets = {pattern: share(*budget) for pattern, budget in limiter.url_budgets.items()}
+    limiter.default = share(*limiter.default)
+    limiter.buckets.clear()
+
+
+def _install_transport(cache_path=None, replay_url=None):
+    """두 수집기 세션에 캐시 / 녹화 재생을 장착"""
+    if not cache_path and not replay_url:
+        return
+    import SteamDBCollector
+    import SteamDBCollector_AllIndie
+    from SteamDBCache import install_cache
+    from SteamDBReplay import install_replay
+    for module in (SteamDBCollector, SteamDBCollector_AllIndie):
+        if cache_path:
+            install_cache(module.session, cache_path)
+        if replay_url:
+            install_replay(module.session, replay_url)
+
+
+def _load_steamspy_index(split):
+    """순차 수집처럼 SteamSpy 태그 대량 색인을 먼저 채움 (없으면 앱마다 appdetails 호출)"""
+    if split == "genre":
+        import SteamDBCollector as collector
+        tags = list(collector.GENRE_TAGS)
+    else:
+        import SteamDBCollector_AllIndie as collector
+        tags = [collector.SCOPE]
+    collector.steamspy_index.load_tags(collector.session, tags)
+
+
+def run_worker(queue_path, worker=None, budget_divisor=1, cache_path=None, replay_url=None):
+    """큐가 빌 때까지 작업을 가져가 실행"""
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    _share_budget(budget_divisor)
+    _install_transport(cache_path, replay_url)
+    queue = ShardQueue(queue_path)
+    meta = queue.get_meta()
+    _load_steamspy_index(meta["split"])
+    header = task_header(meta["split"])
+    done = 0
+    try:
+        while True:
+            claimed = queue.claim(worker)
+            if claimed is None:
+                break
+            task_id, task = claimed
+            print(f"[분산 {worker}] 작업 {task_id} 시작: {task}")
+            path = part_path(meta["out_dir"], task_id)
+            try:
+                with StreamingCsvWriter(path + ".tmp", header) as sink:
+                    RUNNERS[task["kind"]](task, sink)
+                os.replace(path + ".tmp", path)  # 끝난 부분 출력만 병합 대상
+            except Exception as e:
+                print(f"[분산 {worker}] 작업 {task_id} 실패: {e}")
+                queue.fail(task_id, e)
+                continue
+            queue.complete(task_id, sink.rows)
+            done += 1
+            print(f"[분산 {worker}] 작업 {task_id} 완료 ({sink.rows}행)")
+    finally:
+        queue.close()
+    return done
+
+
+def run_workers(queue_path, processes, share_budget=True, cache_path=None, replay_url=None):
+    """로컬 워커 프로세스 여러 개 실행"""
+    divisor = processes if share_budget else 1
+    with multiprocessing.Pool(processes) as pool:
+        results = [pool.apply_async(run_worker, (queue_path, f"{socket.gethostname()}:w{i}", divisor,
+                                                 cache_path, replay_url))
+                   for i in range(processes)]
+        return sum(r.get() for r in results)
+
+
+# ===== 병합 =====
+def merge(queue, out_path, force=False):
+    """완료된 부분 출력을 _order 순으로 합치고 중복 행 제거 (Indie: AppID, 장르: AppID+Genre)"""
+    meta = queue.get_meta()
+    counts = queue.counts()
+    unfinished = sum(n for status, n in counts.items() if status != "done")
+    if unfinished and not force:
+        raise RuntimeError(f"끝나지 않은 작업이 있습니다: {counts} (--force 로 있는 것만 병합)")
+
+    rows = []
+    header = None
+    for task_id, *_ in queue.tasks("done"):
+        with open(part_path(meta["out_dir"], task_id), newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            rows.extend(reader)
+    return merge_rows(rows, header or task_header(meta["split"]), meta["scope"], out_path)
+
+
+def merge_rows(rows, header, scope, out_path):
+    """(_order 를 앞에 붙인) 행들을 검색 순서로 정렬하고 중복을 지워 out_path 에 기록"""
+    rows.sort(key=lambda r: r[0])
+    key_cols = [header.index("AppID")] + ([header.index("Genre")] if scope == "genre" else [])
+    seen = set()
+    with StreamingCsvWriter(out_path, header[1:]) as sink:
+        for row in rows:
+            key = tuple(row[i] for i in key_cols)
+            if key in seen:
+                continue
+            seen.add(key)
+            sink.write(row[1:])
+    print(f"[분산] 병합 완료: {out_path} ({sink.rows}행, 중복 {len(rows) - sink.rows}행 제거)")
+    return sink.rows
+
+
+# ===== 실행 =====
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="작업 큐 기반 분산 수집")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("plan", help="작업을 나눠 큐에 넣기")
+    p.add_argument("--queue", default="shard_queue.sqlite")
+    p.add_argument("--split", choices=sorted(RUNNERS), default="pages")
+    p.add_argument("--pages-per-task", type=int, default=PAGES_PER_TASK)
+    p.add_argument("--buckets", type=int, default=HASH_BUCKETS)
+    p.add_argument("--out-dir", help="부분 출력 디렉터리 (기본: 큐 경로 + .parts)")
+    p.add_argument("--replay", metavar="DIR", help="네트워크 대신 DIR에 녹화된 응답 사용")
+
+    w = sub.add_parser("work", help="큐가 빌 때까지 작업 실행")
+    w.add_argument("--queue", default="shard_queue.sqlite")
+    w.add_argument("--processes", type=int, default=1, help="이 머신에서 띄울 워커 프로세스 수")
+    w.add_argument("--no-share-budget", action="store_true",
+                   help="프로세스마다 호스트 예산 전체를 사용 (기본: 프로세스 수로 나눔)")
+    w.add_argument("--cache", help="HTTP 응답 캐시 파일 경로 (워커끼리 공유 가능)")
+    w.add_argument("--replay", metavar="DIR", help="네트워크 대신 DIR에 녹화된 응답 사용")
+
+    m = sub.add_parser("merge", help="부분 출력을 하나의 CSV로 병합")
+    m.add_argument("--queue", default="shard_queue.sqlite")
+    m.add_argument("--out", required=True)
+    m.add_argument("--force", action="store_true", help="끝나지 않은 작업이 있어도 병합")
+
+    s = sub.add_parser("status", help="작업 상태")
+    s.add_argument("--queue", default="shard_queue.sqlite")
+    args = parser.parse_args()
+
+    replay = None
+    if getattr(args, "replay", None):
+        from SteamDBReplay import FixtureStore, ReplayServer
+        replay = ReplayServer(FixtureStore(args.replay)).start()
+    replay_url = replay.url if replay is not None else None
+
+    if args.command == "work":
+        if args.processes > 1:
+            n = run_workers(args.queue, args.processes, not args.no_share_budget, args.cache, replay_url)
+        else:
+            n = run_worker(args.queue, cache_path=args.cache, replay_url=replay_url)
+        print(f"[분산] 작업 {n}개 처리")
+    else:
+        q = ShardQueue(args.queue)
+        try:
+            if args.command == "plan":
+                _install_transport(replay_url=replay_url)
+                plan(q, args.split, args.pages_per_task, args.buckets, args.out_dir)
+            elif args.command == "merge":
+                merge(q, args.out, args.force)
+            else:
+                print(f"[분산] {q.counts()}")
+                for task_id, task, status, worker, rows, error in q.tasks():
+                    if status != "done":
+                        print(f"  {task_id} {status} {worker or '-'} {task} {error or ''}")
+        finally:
+            q.close()
+    if replay is not None:
+        replay.stop()
@@ -0,0 +1,113 @@
+import threading
+
+# ===== 리뷰 수 출처 정책 =====
+# 앱마다 SteamSpy / 스토어 리뷰 수를 모두 묻는 대신, 필요한 출처만 묻는다.
+#   both     : 둘 다 (기존 동작, 출력 형식도 그대로)
+#   store    : 스토어만 (appreviews, 0이면 앱 페이지)          → SteamSpy 요청 0회
+#   steamspy : SteamSpy만 (대량 색인, 없으면 appdetails)       → 스토어 요청 0회
+#   cheapest : 싼 값부터 — SteamSpy 는 대량 색인에 있을 때만(요청 없음), 스토어는 appreviews JSON.
+#              무거운 앱 페이지는 appreviews 값이 SteamSpy 값과 임계값 이상 어긋날 때,
+#              또는 appreviews 가 0인데 비교할 SteamSpy 값이 없을 때(진짜 빈칸인지)만 받는다.
+# both 가 아니면 출력 끝에 값마다 어느 출처에서 왔는지 적는 열이 붙는다.
+BOTH = "both"
+STEAMSPY = "steamspy"  # SteamDBFilter 단계 이름과 같음
+STORE = "store"
+CHEAPEST = "cheapest"
+POLICIES = (BOTH, STORE, STEAMSPY, CHEAPEST)
+
+# 값을 만든 출처
+SS_BULK = "steamspy_bulk"        # SteamSpy 태그/전체 목록 색인
+SS_API = "steamspy_appdetails"
+STORE_API = "appreviews"
+STORE_PAGE = "app_page"
+NEGATIVE = "negative_cache"      # 앱 페이지에 리뷰 요약이 없다고 기억된 앱 (0)
+PREVIOUS = "previous"            # 체크포인트/증분 이월 값
+SKIPPED = "skipped"              # 정책상 묻지 않음 (CSV 에는 빈 칸)
+SOURCE_HEADER = ["Source_SteamSpy", "Source_AllLanguages"]
+
+# cheapest: |SteamSpy - 스토어| > max(RECONCILE_MIN_GAP, RECONCILE_THRESHOLD × 큰 쪽) 이면 어긋난 것으로 봄
+RECONCILE_THRESHOLD = 0.5
+RECONCILE_MIN_GAP = 10
+
+
+class ReviewSources:
+    """정책에 따라 조회할 출처를 정하고, 앱마다 값의 출처를 기록"""
+
+    def __init__(self, steamspy_index=None, policy=BOTH, threshold=RECONCILE_THRESHOLD):
+        self.steamspy_index = steamspy_index
+        self.policy = policy
+        self.threshold = threshold
+        self.sources = {}  # appid → {STEAMSPY: 출처, STORE: 출처}
+        self.counts = {}   # (열, 출처) → 앱 수
+        self.stats = {"page_needed": 0, "page_skipped": 0, "page_mismatch": 0}
+        self.lock = threading.Lock()
+
+    def configure(self, policy, threshold=RECONCILE_THRESHOLD):
+        self.policy = policy
+        self.threshold = threshold
+
+    @property
+    def with_columns(self):
+        """출력에 출처 열을 붙이는지 (both 는 기존 형식 유지)"""
+        return self.policy != BOTH
+
+    def asks(self, column):
+        """이 출처에 요청을 보내는지 (cheapest 의 SteamSpy 는 색인 값만 씀)"""
+        return self.policy in (BOTH, column) or (self.policy == CHEAPEST and column == STORE)
+
+    def produces(self, column):
+        """이 열에 값이 나올 수 있는지"""
+        return self.policy in (BOTH, CHEAPEST, column)
+
+    def note(self, appid, column, source):
+        with self.lock:
+            self.sources.setdefault(str(appid), {})[column] = source
+            self.counts[(column, source)] = self.counts.get((column, source), 0) + 1
+
+    def get(self, appid):
+        """(SteamSpy 출처, 스토어 출처). 이번 실행에서 조회하지 않은 값은 PREVIOUS (정책상 안 나오는 열은 SKIPPED),
+        조회에 실패한 값은 None"""
+        with self.lock:
+            noted = self.sources.get(str(appid))
+        return tuple((noted.get(column) if noted is not None else PREVIOUS) if self.produces(column) else SKIPPED
+                     for column in (STEAMSPY, STORE))
+
+    def complete(self, value):
+        """(total_ss, total_store) 에서 정책이 요청하는 값이 모두 있는지 (체크포인트/증분 기록 기준)"""
+        return all(total is not None for column, total in zip((STEAMSPY, STORE), value) if self.asks(column))
+
+    def disagree(self, a, b):
+        return abs(a - b) > max(RECONCILE_MIN_GAP, self.threshold * max(a, b))
+
+    def needs_page(self, appid, total_store):
+        """appreviews 가 total_store 개라고 답했을 때 앱 페이지로 확인할지 (cheapest 가 아니면 0개일 때만)"""
+        if self.policy != CHEAPEST:
+            return total_store == 0
+        total_ss = self.steamspy_index.totals.get(str(appid)) if self.steamspy_index is not None else None
+        if total_ss is None:
+            needed = total_store == 0
+        else:
+            needed = self.disagree(total_ss, total_store)
+        if total_store == 0:
+            key = "page_needed" if needed else "page_skipped"
+        else:
+            key = "page_mismatch" if needed else None
+        if key is not None:
+            with self.lock:
+                self.stats[key] += 1
+        return needed
+
+    def summary(self):
+        with self.lock:
+            counts = sorted(self.counts.items())
+            s = dict(self.stats)
+        lines = [f"[리뷰 출처] 정책 {self.policy}"]
+        for column, label in ((STEAMSPY, "SteamSpy"), (STORE, "스토어")):
+            parts = [f"{source} {n}개" for (col, source), n in counts if col == column]
+            if parts:
+                lines.append(f"[리뷰 출처] {label}: {', '.join(parts)}")
+        if self.policy == CHEAPEST:
+            lines.append(f"[리뷰 출처] appreviews 0개 → 앱 페이지 조회 {s['page_needed']}회 / "
+                         f"SteamSpy 값과 맞아 생략 {s['page_skipped']}회")
+            lines.append(f"[리뷰 출처] appreviews 값이 SteamSpy 와 어긋나 앱 페이지로 확인 {s['page_mismatch']}회")
+        return "\n".join(lines)
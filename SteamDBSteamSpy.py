@@ -0,0 +1,67 @@
+import threading
+from urllib.parse import quote
+
+# ===== SteamSpy 대량 조회 =====
+# appdetails(앱 1개당 1요청) 대신, 태그/전체 목록 응답 한 번에 들어 있는
+# positive/negative 값으로 appid → 총 리뷰 수 색인을 미리 채운다.
+# 색인에 없는 앱만 기존 appdetails로 폴백.
+STEAMSPY_TAG_URL = "https://steamspy.com/api.php?request=tag&tag={tag}"
+STEAMSPY_ALL_URL = "https://steamspy.com/api.php?request=all&page={page}"  # 페이지당 1000개, 분당 1회 제한
+
+
+class SteamSpyIndex:
+    def __init__(self):
+        self.totals = {}
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "requests": 0}
+
+    def _merge(self, data):
+        added = 0
+        for appid, entry in (data or {}).items():
+            if not isinstance(entry, dict):
+                continue
+            try:
+                total = int(entry.get("positive", 0) or 0) + int(entry.get("negative", 0) or 0)
+            except (TypeError, ValueError):
+                continue
+            self.totals[str(appid)] = total
+            added += 1
+        return added
+
+    def load_tags(self, session, tags):
+        for tag in tags:
+            url = STEAMSPY_TAG_URL.format(tag=quote(tag))
+            print(f"[SteamSpy 대량] 태그 '{tag}' 요청 중: {url}")
+            try:
+                added = self._merge(session.get(url, timeout=60).json())
+            except Exception as e:
+                print(f"[SteamSpy 대량] 태그 '{tag}' 실패: {e}")
+                continue
+            self.stats["requests"] += 1
+            print(f"[SteamSpy 대량] 태그 '{tag}': {added}개 (누적 {len(self.totals)}개)")
+
+    def load_all(self, session, pages):
+        """request=all 을 pages장까지 (빈 페이지가 나오면 중단)"""
+        for page in range(pages):
+            url = STEAMSPY_ALL_URL.format(page=page)
+            print(f"[SteamSpy 대량] 전체 목록 {page}페이지 요청 중: {url}")
+            try:
+                added = self._merge(session.get(url, timeout=60).json())
+            except Exception as e:
+                print(f"[SteamSpy 대량] 전체 목록 {page}페이지 실패: {e}")
+                break
+            self.stats["requests"] += 1
+            if not added:
+                break
+
+    def get(self, appid):
+        """색인에 있으면 총 리뷰 수, 없으면 None"""
+        total = self.totals.get(str(appid))
+        with self.lock:
+            self.stats["hits" if total is not None else "misses"] += 1
+        return total
+
+    def summary(self):
+        s = self.stats
+        return (f"[SteamSpy 대량] 색인 {len(self.totals)}개 (요청 {s['requests']}회) / "
+                f"색인 적중 {s['hits']} / appdetails 폴백 {s['misses']}")
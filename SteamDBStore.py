@@ -0,0 +1,302 @@
+import argparse
+import csv
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from datetime import date
+
+from SteamDBCommon import PRICE_RE, REVIEW_MULTIPLIER, SS_COLUMNS, STORE_COLUMNS
+
+# ===== 수집 이력 저장소 (SQLite) =====
+# 실행할 때마다 CSV를 새로 쓰는 대신 (appid, 수집일) 단위 스냅샷으로 쌓아 두고
+# 앱별 리뷰 증가 / 장르×연도 수익 같은 시계열 질의를 인덱스로 바로 푼다.
+# - snapshots       : (appid, crawl_date) 당 한 행. 같은 날 다시 기록하면 값이 있는 열만 덮어씀
+# - snapshot_genres : 스냅샷의 장르 (장르별 수집기는 앱 하나가 여러 장르에 나옴)
+# appid 인덱스는 기본 키(appid, crawl_date)가 겸한다.
+DEFAULT_DB = "steamdb_snapshots.sqlite"
+BATCH_ROWS = 1000  # 이 행 수마다 커밋
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    appid            INTEGER NOT NULL,
+    crawl_date       TEXT    NOT NULL,   -- YYYY-MM-DD
+    name             TEXT,
+    release_year     INTEGER,
+    price            REAL,               -- 무료 0, 알 수 없으면 NULL
+    currency         TEXT,
+    discount_percent INTEGER,
+    reviews_ss       INTEGER,
+    reviews_all      INTEGER,
+    revenue_ss       REAL,
+    revenue_all      REAL,
+    source           TEXT,               -- 마지막으로 기록한 출력/파일 이름
+    PRIMARY KEY (appid, crawl_date)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshot_genres (
+    appid      INTEGER NOT NULL,
+    crawl_date TEXT    NOT NULL,
+    genre      TEXT    NOT NULL,
+    PRIMARY KEY (appid, crawl_date, genre)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_snapshots_year  ON snapshots (release_year, crawl_date);
+CREATE INDEX IF NOT EXISTS idx_snapshots_date  ON snapshots (crawl_date);
+CREATE INDEX IF NOT EXISTS idx_genres_genre    ON snapshot_genres (genre, crawl_date);
+CREATE INDEX IF NOT EXISTS idx_genres_date     ON snapshot_genres (crawl_date, genre);  -- 수집일별 장르 집계
+"""
+
+SNAPSHOT_COLUMNS = ("appid", "crawl_date", "name", "release_year", "price", "currency", "discount_percent",
+                    "reviews_ss", "reviews_all", "revenue_ss", "revenue_all", "source")
+UPSERT_SQL = (
+    f"INSERT INTO snapshots ({', '.join(SNAPSHOT_COLUMNS)}) VALUES ({', '.join('?' * len(SNAPSHOT_COLUMNS))}) "
+    "ON CONFLICT (appid, crawl_date) DO UPDATE SET "
+    + ", ".join(f"{c} = COALESCE(excluded.{c}, {c})" for c in SNAPSHOT_COLUMNS[2:])
+)
+FILE_DATE_RE = re.compile(r"_(\d{4})(\d{2})(\d{2})(?:\D|$)")
+
+
+# ===== 값 변환 =====
+def _int_or_none(value):
+    try:
+        return int(str(value).replace(",", "").strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_price(text):
+    """"$19.99" → (19.99, "$"), "Free" → (0.0, None), "Unknown" → (None, None)"""
+    text = text or ""
+    if "free" in text.lower() or "무료" in text:
+        return 0.0, None
+    m = re.search(PRICE_RE, text)
+    if not m:
+        return None, None
+    return float(m.group(2).replace(",", "")), m.group(1)
+
+
+def revenue(reviews, price, currency):
+    if reviews is None or price is None:
+        return None
+    return reviews * REVIEW_MULTIPLIER * price if currency and price > 0 and reviews > 0 else 0.0
+
+
+def crawl_date_of(path):
+    """파일명의 _YYYYMMDD, 없으면 None (복사/압축 해제로 바뀌는 파일 수정일은 수집일로 쓰지 않음)"""
+    m = FILE_DATE_RE.search(os.path.basename(path))
+    return "-".join(m.groups()) if m else None
+
+
+def _snapshot(appid, name, year, price, currency, discount, reviews_ss, reviews_all):
+    """snapshots 행 값 (crawl_date/source 제외). AppID가 숫자가 아니면(번들 등) None"""
+    appid = str(appid or "").strip()
+    if not appid.isdigit():
+        return None
+    return (int(appid), name, _int_or_none(year), price, currency, discount, reviews_ss, reviews_all,
+            revenue(reviews_ss, price, currency), revenue(reviews_all, price, currency))
+
+
+def snapshot_from_csv(row):
+    """CSV 행(dict, 예전 덤프 형식 포함) → 스냅샷 값"""
+    price, currency = parse_price(row.get("Price"))
+    ss_col = next((c for c in SS_COLUMNS if c in row), None)
+    store_col = next((c for c in STORE_COLUMNS if c in row), None)
+    if ss_col:
+        reviews_ss = _int_or_none(row[ss_col])
+    elif "PositiveReviews" in row:  # SteamDBAll 출력: SteamSpy 긍정/부정
+        pos, neg = _int_or_none(row["PositiveReviews"]), _int_or_none(row.get("NegativeReviews"))
+        reviews_ss = None if pos is None else pos + (neg or 0)
+    else:
+        reviews_ss = None
+    discount = _int_or_none((row.get("DiscountPercent") or "").rstrip("%"))
+    return _snapshot(row.get("AppID"), row.get("Name"), row.get("ReleaseYear"), price, currency, discount,
+                     reviews_ss, _int_or_none(row[store_col]) if store_col else None)
+
+
+def snapshot_from_record(record):
+    """SteamDBRecord.GameRecord → 스냅샷 값"""
+    price = None if record.price_value is None else float(record.price_value)
+    discount = _int_or_none((record.discount or "").rstrip("%"))
+    return _snapshot(record.appid, record.title, record.year, price, record.currency, discount,
+                     record.total_ss, record.total_store)
+
+
+def split_genres(text):
+    return [g.strip() for g in (text or "").split(";") if g.strip()]
+
+
+# ===== 저장소 =====
+class SnapshotStore:
+    def __init__(self, path=DEFAULT_DB):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.pending = []
+        self.stats = {"rows": 0, "skipped": 0}
+
+    # ----- 기록 -----
+    def add(self, snapshot, genres, crawl_date, source):
+        """스냅샷 하나를 버퍼에 담고 BATCH_ROWS 마다 한 트랜잭션으로 기록"""
+        if snapshot is None:
+            self.stats["skipped"] += 1
+            return
+        self.pending.append((snapshot, genres, crawl_date, source))
+        self.stats["rows"] += 1
+        if len(self.pending) >= BATCH_ROWS:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        with self.lock, self.conn:
+            self.conn.executemany(UPSERT_SQL, [
+                (s[0], crawl_date, *s[1:], source) for s, _, crawl_date, source in self.pending
+            ])
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO snapshot_genres (appid, crawl_date, genre) VALUES (?, ?, ?)",
+                [(s[0], crawl_date, g) for s, genres, crawl_date, _ in self.pending for g in genres],
+            )
+        self.pending = []
+
+    def tee(self, rows, header, source, crawl_date=None):
+        """수집기 출력(CSV 행 list 또는 GameRecord)을 그대로 흘려보내며 오늘 날짜 스냅샷으로 기록"""
+        crawl_date = crawl_date or date.today().isoformat()
+        genre_col = header.index("Genre")
+        try:
+            for row in rows:
+                if isinstance(row, (list, tuple)):
+                    self.add(snapshot_from_csv(dict(zip(header, row))), split_genres(row[genre_col]),
+                             crawl_date, source)
+                else:
+                    self.add(snapshot_from_record(row), split_genres(row.genre), crawl_date, source)
+                yield row
+        finally:
+            self.flush()
+
+    def import_csv(self, path, crawl_date=None):
+        """기존 CSV 덤프 하나를 스냅샷으로 가져옴 → (수집일, 기록 행 수, 건너뛴 행 수)"""
+        crawl_date = crawl_date or crawl_date_of(path)
+        if crawl_date is None:
+            raise ValueError(f"{path}: 파일명에 _YYYYMMDD 수집일이 없습니다 (--date 로 지정)")
+        source = os.path.basename(path)
+        before = dict(self.stats)
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                self.add(snapshot_from_csv(row), split_genres(row.get("Genre")), crawl_date, source)
+        self.flush()
+        return crawl_date, self.stats["rows"] - before["rows"], self.stats["skipped"] - before["skipped"]
+
+    def close(self):
+        self.flush()
+        with self.lock:
+            self.conn.execute("PRAGMA optimize")  # 질의 계획용 통계 갱신
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def summary(self):
+        return f"[이력 DB] {self.path}: 스냅샷 {self.stats['rows']}행 기록 (AppID가 숫자가 아닌 행 {self.stats['skipped']}개 제외)"
+
+    # ----- 질의 -----
+    def _query(self, sql, params=()):
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def dates(self):
+        """[(수집일, 앱 수)]"""
+        return self._query("SELECT crawl_date, COUNT(*) FROM snapshots GROUP BY crawl_date ORDER BY crawl_date")
+
+    def latest_date(self):
+        row = self._query("SELECT MAX(crawl_date) FROM snapshots")
+        return row[0][0] if row else None
+
+    def review_history(self, appid):
+        """앱 하나의 [(수집일, SteamSpy 리뷰, 전체 언어 리뷰, 가격, 통화)]"""
+        return self._query(
+            "SELECT crawl_date, reviews_ss, reviews_all, price, currency FROM snapshots "
+            "WHERE appid = ? ORDER BY crawl_date", (int(appid),))
+
+    def review_growth(self, date_from, date_to, limit=20, column="reviews_ss"):
+        """두 수집일 사이 리뷰 증가 상위 [(appid, 이름, 이전, 이후, 증가)]"""
+        if column not in ("reviews_ss", "reviews_all"):
+            raise ValueError(column)
+        return self._query(
+            f"SELECT b.appid, b.name, a.{column}, b.{column}, b.{column} - a.{column} AS growth "
+            "FROM snapshots a JOIN snapshots b ON b.appid = a.appid "
+            f"WHERE a.crawl_date = ? AND b.crawl_date = ? AND a.{column} IS NOT NULL AND b.{column} IS NOT NULL "
+            "ORDER BY growth DESC LIMIT ?", (date_from, date_to, limit))
+
+    def revenue_by_genre_year(self, crawl_date=None, currency="$", column="revenue_all"):
+        """[(장르, 출시 연도, 앱 수, 추정 수익 합계)] — 통화가 섞이지 않게 한 통화만"""
+        if column not in ("revenue_ss", "revenue_all"):
+            raise ValueError(column)
+        return self._query(
+            f"SELECT g.genre, s.release_year, COUNT(*), SUM(s.{column}) "
+            "FROM snapshot_genres g JOIN snapshots s ON s.appid = g.appid AND s.crawl_date = g.crawl_date "
+            "WHERE g.crawl_date = ? AND s.currency = ? GROUP BY g.genre, s.release_year "
+            "ORDER BY g.genre, s.release_year", (crawl_date or self.latest_date(), currency))
+
+
+# ===== 실행 =====
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="수집 이력 DB (SQLite)")
+    parser.add_argument("--db", default=DEFAULT_DB, help="DB 파일 경로")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("import", help="기존 CSV 덤프 가져오기 (수집일: 파일명 _YYYYMMDD, 없으면 --date 필수)")
+    p.add_argument("csv", nargs="+")
+    p.add_argument("--date", help="수집일 지정 (YYYY-MM-DD)")
+    sub.add_parser("dates", help="수집일별 앱 수")
+    p = sub.add_parser("history", help="앱 하나의 리뷰 수 변화")
+    p.add_argument("appid", type=int)
+    p = sub.add_parser("growth", help="두 수집일 사이 리뷰 증가 상위")
+    p.add_argument("date_from")
+    p.add_argument("date_to")
+    p.add_argument("--limit", type=int, default=20)
+    p.add_argument("--all-languages", action="store_true", help="SteamSpy 대신 전체 언어 리뷰 수 기준")
+    p = sub.add_parser("genre-year", help="장르×출시 연도별 추정 수익 합계")
+    p.add_argument("--date", help="수집일 (기본: 가장 최근)")
+    p.add_argument("--currency", default="$")
+    args = parser.parse_args()
+    if args.cmd == "import" and not args.date:
+        undated = [path for path in args.csv if crawl_date_of(path) is None]
+        if undated:
+            parser.error(f"파일명에 _YYYYMMDD 수집일이 없는 CSV: {', '.join(undated)} (--date YYYY-MM-DD 로 지정)")
+
+    with SnapshotStore(args.db) as store:
+        if args.cmd == "import":
+            for path in args.csv:
+                (crawl_date, rows, skipped), ms = _timed(store.import_csv, path, args.date)
+                print(f"{path} → {crawl_date}: {rows}행 ({skipped}행 제외, {ms:.0f}ms)")
+        elif args.cmd == "dates":
+            for crawl_date, apps in store.dates():
+                print(f"{crawl_date}  앱 {apps}개")
+        elif args.cmd == "history":
+            rows, ms = _timed(store.review_history, args.appid)
+            for crawl_date, ss, total, price, currency in rows:
+                print(f"{crawl_date}  SteamSpy {ss}  전체 {total}  가격 {currency or ''}{price}")
+            print(f"({len(rows)}행, {ms:.1f}ms)")
+        elif args.cmd == "growth":
+            column = "reviews_all" if args.all_languages else "reviews_ss"
+            rows, ms = _timed(store.review_growth, args.date_from, args.date_to, args.limit, column)
+            for appid, name, before, after, growth in rows:
+                print(f"{appid:>8}  {name}  {before} → {after}  (+{growth})")
+            print(f"({len(rows)}행, {ms:.1f}ms)")
+        else:
+            rows, ms = _timed(store.revenue_by_genre_year, args.date, args.currency)
+            writer = csv.writer(sys.stdout)
+            writer.writerow(["Genre", "ReleaseYear", "Apps", "EstimatedRevenue"])
+            writer.writerows(rows)
+            print(f"({len(rows)}행, {ms:.1f}ms)")
@@ -0,0 +1,202 @@
+import socket
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.connection import HTTPConnection
+from urllib3.util import make_headers
+
+from SteamDBMetrics import endpoint_of
+
+# ===== 공유 전송 계층 =====
+# 네 스크립트가 같은 방식으로 세션을 만든다 (make_session → install_rate_limiter → 캐시/계측).
+# - 호스트별 연결 풀 크기 = 그 세션의 동시 요청 수
+#   (풀보다 스레드가 많으면 넘치는 연결은 응답 후 버려지고 다음 요청이 TCP+TLS 핸드셰이크를 다시 함)
+# - keep-alive: 세션 하나를 끝까지 재사용 + TCP keepalive 로 유휴 연결이 중간 장비에서 끊기지 않게
+# - Accept-Encoding: gzip/deflate (+ brotli 모듈이 있으면 br)
+# - 선택: httpx HTTP/2 — 호스트당 연결 하나에 요청을 다중화  (pip install "httpx[http2]")
+DEFAULT_CONCURRENCY = 10  # requests 기본 풀 크기와 같음
+POOL_HOSTS = 4            # 연결 풀을 유지할 호스트 수 (store / steamspy / 여유)
+KEEPALIVE_IDLE = 60       # 유휴 연결 keepalive 탐침 시작(초)
+ACCEPT_ENCODING = make_headers(accept_encoding=True)["accept-encoding"]
+HOP_HEADERS = {"connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade"}  # HTTP/2 금지 헤더
+
+SOCKET_OPTIONS = HTTPConnection.default_socket_options + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+if hasattr(socket, "TCP_KEEPIDLE"):
+    SOCKET_OPTIONS.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, KEEPALIVE_IDLE))
+
+
+def _require_httpx():
+    try:
+        import httpx
+        import h2  # noqa: F401
+    except ImportError as e:
+        raise ImportError('HTTP/2 전송에는 httpx[http2] 가 필요합니다: pip install "httpx[http2]"') from e
+    return httpx
+
+
+# ===== HTTP/1.1: urllib3 연결 풀 =====
+class PooledHTTPAdapter(HTTPAdapter):
+    """호스트당 concurrency 개 연결을 유지하는 HTTPAdapter (TCP keepalive 포함)."""
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, **kwargs):
+        self.concurrency = max(1, concurrency)
+        super().__init__(pool_connections=POOL_HOSTS, pool_maxsize=self.concurrency, **kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs.setdefault("socket_options", SOCKET_OPTIONS)
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+
+    def connection_stats(self):
+        """{호스트: (새로 연 연결 수, 요청 수)}"""
+        stats = {}
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                conns, reqs = stats.get(pool.host, (0, 0))
+                stats[pool.host] = (conns + pool.num_connections, reqs + pool.num_requests)
+        return stats
+
+    def summary(self):
+        lines = []
+        for host, (conns, reqs) in sorted(self.connection_stats().items()):
+            reuse = 1 - conns / reqs if reqs else 0.0
+            lines.append(f"[연결] {host}: 요청 {reqs}회 / 새 연결 {conns}개 (재사용 {reuse:.1%}, 풀 {self.concurrency})")
+        return "\n".join(lines)
+
+
+# ===== HTTP/2: httpx =====
+class HttpxAdapter(BaseAdapter):
+    """requests 세션 요청을 httpx.Client(http2=True)로 보낸다.
+
+    인증서/프록시 설정은 클라이언트 기본값을 쓰고, 응답 쿠키는 세션에 저장하지 않는다
+    (수집기에 필요한 쿠키는 세션에 미리 넣어 둔다). 리다이렉트는 requests 가 처리한다.
+    """
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, http2=True):
+        super().__init__()
+        httpx = _require_httpx()
+        self.httpx = httpx
+        self.concurrency = max(1, concurrency)
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency,
+                              keepalive_expiry=KEEPALIVE_IDLE)
+        self.client = httpx.Client(http2=http2, limits=limits, follow_redirects=False)
+        self.versions = Counter()
+        self.lock = threading.Lock()
+
+    def _timeout(self, timeout):
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return self.httpx.Timeout(read, connect=connect)
+        return self.httpx.Timeout(timeout)
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        httpx = self.httpx
+        try:
+            headers = {k: v for k, v in request.headers.items() if k.lower() not in HOP_HEADERS}
+            r = self.client.request(request.method, request.url, headers=headers,
+                                    content=request.body, timeout=self._timeout(timeout))
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e, request=request) from e
+        except httpx.TransportError as e:
+            raise requests.exceptions.ConnectionError(e, request=request) from e
+
+        with self.lock:
+            self.versions[(urlsplit(request.url).hostname or "", r.http_version)] += 1
+
+        resp = requests.Response()
+        resp.status_code = r.status_code
+        resp.reason = r.reason_phrase
+        resp.headers = CaseInsensitiveDict(r.headers.items())
+        resp.encoding = get_encoding_from_headers(resp.headers)
+        resp._content = r.content  # httpx 가 gzip/br 을 이미 풀어 둠
+        resp._content_consumed = True
+        resp.url = request.url
+        resp.request = request
+        resp.elapsed = r.elapsed
+        resp.connection = self
+        return resp
+
+    def summary(self):
+        with self.lock:
+            return "\n".join(f"[연결 httpx] {host} {version}: 요청 {n}회"
+                             for (host, version), n in sorted(self.versions.items()))
+
+    def close(self):
+        self.client.close()
+
+
+# ===== 계측: 가장 바깥 어댑터 (SteamDBMetrics.install_metrics 가 장착) =====
+class MetricsAdapter(BaseAdapter):
+    """가장 바깥에서 엔드포인트별 체감 시간/상태 코드/캐시 적중을 기록"""
+
+    def __init__(self, inner, metrics):
+        super().__init__()
+        self.inner = inner
+        self.metrics = metrics
+
+    def send(self, request, **kwargs):
+        endpoint = endpoint_of(request.url)
+        start = time.perf_counter()
+        try:
+            resp = self.inner.send(request, **kwargs)
+        except Exception:
+            self.metrics.observe("request", endpoint, time.perf_counter() - start)
+            self.metrics.count(f"http.{endpoint}.error")
+            raise
+        self.metrics.observe("request", endpoint, time.perf_counter() - start)
+        status = "cache" if getattr(resp, "from_cache", False) else resp.status_code
+        self.metrics.count(f"http.{endpoint}.{status}")
+        return resp
+
+    def close(self):
+        self.inner.close()
+
+
+def make_adapter(concurrency=DEFAULT_CONCURRENCY, http2=False):
+    return HttpxAdapter(concurrency) if http2 else PooledHTTPAdapter(concurrency)
+
+
+# ===== 세션 =====
+def make_session(headers=None, concurrency=DEFAULT_CONCURRENCY, http2=False):
+    """공유 전송 어댑터를 장착한 세션. 요청 예산/캐시/계측은 이 위에 차례로 감싼다."""
+    session = requests.Session()
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    session.headers.update(headers or {})
+    adapter = make_adapter(concurrency, http2)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _innermost(session):
+    """(가장 안쪽 전송 어댑터, 그 바로 바깥 어댑터 또는 None)"""
+    outer, adapter = None, session.get_adapter("https://")
+    while hasattr(adapter, "inner"):
+        outer, adapter = adapter, adapter.inner
+    return adapter, outer
+
+
+def install_transport(session, concurrency=None, http2=False):
+    """실제 전송 어댑터를 동시 요청 수/HTTP2 설정에 맞게 교체. 캐시/녹화/재생 설치 전에 호출."""
+    old, outer = _innermost(session)
+    transport = make_adapter(concurrency or getattr(old, "concurrency", DEFAULT_CONCURRENCY), http2)
+    if outer is None:
+        session.mount("https://", transport)
+        session.mount("http://", transport)
+    else:
+        outer.inner = transport
+    old.close()
+    return transport
+
+
+def connection_summary(session):
+    """연결 재사용 요약 (전송 어댑터가 지원할 때)"""
+    adapter, _ = _innermost(session)
+    return adapter.summary() if hasattr(adapter, "summary") else ""
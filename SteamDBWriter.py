@@ -0,0 +1,56 @@
+import csv
+import os
+import time
+
+from SteamDBMetrics import metrics
+
+# ===== 스트리밍 CSV 저장 =====
+FSYNC_INTERVAL = 5.0  # 초: 이 간격마다 디스크까지 강제 기록
+
+
+class StreamingCsvWriter:
+    """행이 만들어지는 즉시 기록하는 CSV 싱크.
+
+    매 행마다 파이썬 버퍼를 비워 `tail -f`로 진행 상황을 볼 수 있고,
+    fsync_interval 초마다 os.fsync로 디스크에 확정한다.
+    """
+
+    def __init__(self, path, header, fsync_interval=FSYNC_INTERVAL):
+        self.path = path
+        self.fsync_interval = fsync_interval
+        self.rows = 0
+        self.f = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.writer(self.f)
+        self.writer.writerow(header)
+        self._sync()
+
+    def _sync(self):
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        self.last_sync = time.monotonic()
+
+    def write(self, row):
+        with metrics.timer("write", "csv"):
+            self.writer.writerow(row)
+            self.rows += 1
+            if time.monotonic() - self.last_sync >= self.fsync_interval:
+                self._sync()
+            else:
+                self.f.flush()
+        metrics.progress.add_rows()
+
+    def write_all(self, rows):
+        for row in rows:
+            self.write(row)
+        return self.rows
+
+    def close(self):
+        if not self.f.closed:
+            self._sync()
+            self.f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,287 @@
+"""수집 스크립트 전체 경로(검색 → 파싱 → 보강 → 행 생성) 오프라인 벤치마크.
+
+녹화된 응답(--record 로 만든 디렉터리)을 로컬 대역 서버로 재생하며
+SteamDBCollector / SteamDBCollector_AllIndie / SteamDBAll 을 같은 프로세스에서 실행한다.
+픽스처 디렉터리가 비어 있으면 --apps 개 앱짜리 합성 카탈로그로 응답을 만들어 쓴다.
+
+측정 항목
+  - 행/초 (처음부터 마지막 행까지)
+  - HTML 파싱 시간 합계 (스레드별 호출 시간의 합)
+  - tracemalloc 최대 메모리 (별도 실행, 대역 서버 할당 포함)
+  - 연결 재사용 (요청 수 대비 새로 연 연결 수)
+
+    python bench/bench_collectors.py [--apps 1000] [--latency 0.01] [--error-rate 0.02]
+                                     [--fixtures DIR] [--parser selectolax] [--respect-limits]
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from urllib.parse import quote
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import SteamDBAll  # noqa: E402
+import SteamDBCollector  # noqa: E402
+import SteamDBCollector_AllIndie  # noqa: E402
+import SteamDBParse  # noqa: E402
+from SteamDBCommon import APP_URL_TMPL, APPREVIEWS_TMPL, STEAMSPY_URL  # noqa: E402
+import SteamDBRateLimit  # noqa: E402
+from SteamDBReplay import FixtureStore, ReplayServer, install_replay  # noqa: E402
+from SteamDBSearch import SEARCH_HTML_TMPL, SEARCH_JSON_TMPL, SEARCH_PAGE_SIZE  # noqa: E402
+from SteamDBSteamSpy import STEAMSPY_TAG_URL, SteamSpyIndex  # noqa: E402
+from SteamDBTransport import connection_summary  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "http")
+TAG_INDY = 492
+ALL_PAGE_SIZE = SteamDBAll.HTML_PAGE_SIZE   # SteamDBAll 이 읽는 검색 페이지 행 수
+ALL_MAX_PAGES = SteamDBAll.MAX_PAGES
+
+
+# ===== 합성 카탈로그 =====
+ROW_TMPL = (
+    '<a href="https://store.steampowered.com/app/{a}/Game_{a}/?snr=1_7_7_230_150_1" data-ds-appid="{a}" '
+    'data-ds-tagids="[{tags}]" class="search_result_row ds_collapse_flag">'
+    '<div class="responsive_search_name_combined"><div class="col search_name ellipsis">'
+    '<span class="title">Game {a}</span></div>'
+    '<div class="col search_released responsive_secondrow">{day} {mon}, {year}</div>'
+    '<div class="col search_price_discount_combined responsive_secondrow">{price}</div></div></a>\n'
+)
+PRICE_PLAIN = '<div class="col search_price responsive_secondrow">{p}</div>'
+PRICE_DISCOUNT = (
+    '<div class="discount_block search_discount_block"><div class="discount_pct">-{pct}%</div>'
+    '<div class="discount_prices"><div class="discount_original_price">{o}</div>'
+    '<div class="discount_final_price">{p}</div></div></div>'
+)
+APP_PAGE_TMPL = (
+    '<html><body><div class="game_area_description">{filler}</div><div class="user_reviews">'
+    '<a class="user_reviews_summary_row" data-tooltip-html="90% of the 12 user reviews in the last 30 days are positive.">'
+    '<div class="subtitle column">Recent Reviews:</div></a>'
+    '<a class="user_reviews_summary_row" data-tooltip-html="95% of the {n:,} user reviews for this game are positive.">'
+    '<div class="subtitle column all">All Reviews:</div><span class="responsive_hidden">({n:,})</span>'
+    '<meta itemprop="reviewCount" content="{n}"></a></div></body></html>'
+)
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+def genre_tags():
+    """두 수집기의 장르 태그 합집합 {태그 id: 이름}"""
+    tags = {}
+    for mod in (SteamDBCollector, SteamDBAll):
+        for name, tag in mod.GENRE_TAGS.items():
+            tags[tag] = name
+    return tags
+
+
+def make_catalog(n, seed=0):
+    rnd = random.Random(seed)
+    genres = list(genre_tags())
+    apps = []
+    for i in range(n):
+        price = rnd.choice((0, 499, 999, 1499, 1999, 2999))
+        apps.append({
+            "appid": str(200000 + i),
+            "tags": [TAG_INDY] + rnd.sample(genres, rnd.choice((1, 1, 2, 3))),
+            "year": rnd.randint(2013, 2025),
+            "month": rnd.randint(1, 12),
+            "price": price,
+            "discount": rnd.choice((0, 0, 0, 25, 50)) if price else 0,
+            "positive": rnd.randint(0, 20000),
+            "negative": rnd.randint(0, 3000),
+        })
+    return apps
+
+
+def search_row(app):
+    if not app["price"]:
+        price = PRICE_PLAIN.format(p="Free")
+    elif app["discount"]:
+        final = app["price"] * (100 - app["discount"]) // 100
+        price = PRICE_DISCOUNT.format(pct=app["discount"], o=f"${app['price'] / 100:.2f}", p=f"${final / 100:.2f}")
+    else:
+        price = PRICE_PLAIN.format(p=f"${app['price'] / 100:.2f}")
+    return ROW_TMPL.format(a=app["appid"], tags=",".join(map(str, app["tags"])), day=app["month"] + 3,
+                           mon=MONTHS[app["month"] - 1], year=app["year"], price=price)
+
+
+def synthesize_fixtures(store, apps):
+    """수집기들이 실제로 요청하는 URL 그대로 응답을 만든다."""
+    def put(url, body, content_type="application/json"):
+        store.save(url, 200, content_type, body.encode("utf-8"))
+
+    def put_json_search(query, members, page_size=SEARCH_PAGE_SIZE, max_pages=None):
+        pages = max(1, -(-len(members) // page_size))
+        for page in range(min(pages, max_pages or pages)):
+            chunk = members[page * page_size:(page + 1) * page_size]
+            url = SEARCH_JSON_TMPL.format(query=query, start=page * page_size, count=page_size)
+            put(url, json.dumps({"success": 1, "total_count": len(members),
+                                 "results_html": "".join(map(search_row, chunk))}))
+
+    by_genre = {tag: [a for a in apps if tag in a["tags"]] for tag in genre_tags()}
+
+    # 검색: JSON 엔드포인트 (장르별 / Indie 전체 / SteamDBAll 의 25행 페이지)
+    # SteamDBAll 은 JSON 이 실패하면 같은 쿼리의 HTML 페이지로 폴백하므로 둘 다 만든다
+    for tag, members in by_genre.items():
+        put_json_search(SteamDBCollector.SEARCH_QUERY_TMPL.format(tag1=tag), members)
+        all_query = SteamDBAll.SEARCH_QUERY_TMPL.format(tag1=TAG_INDY, tag2=tag)
+        put_json_search(all_query, members, ALL_PAGE_SIZE, ALL_MAX_PAGES)
+        for page in range(1, ALL_MAX_PAGES + 1):
+            chunk = members[(page - 1) * ALL_PAGE_SIZE:page * ALL_PAGE_SIZE]
+            url = SEARCH_HTML_TMPL.format(query=all_query, page=page)
+            put(url, "<html><body>" + "".join(map(search_row, chunk)) + "</body></html>", "text/html")
+            if not chunk:
+                break
+    put_json_search(SteamDBCollector_AllIndie.SEARCH_QUERY_TMPL.format(tag=TAG_INDY), apps)
+
+    # SteamSpy 태그 대량 조회: 7개 중 1개는 빠뜨려 appdetails 폴백도 거치게 함
+    def spy_entry(a):
+        return {"appid": int(a["appid"]), "positive": a["positive"], "negative": a["negative"]}
+
+    indexed = [a for i, a in enumerate(apps) if i % 7]
+    put(STEAMSPY_TAG_URL.format(tag="Indie"), json.dumps({a["appid"]: spy_entry(a) for a in indexed}))
+    for tag, name in genre_tags().items():
+        members = [a for a in indexed if tag in a["tags"]]
+        put(STEAMSPY_TAG_URL.format(tag=quote(name)), json.dumps({a["appid"]: spy_entry(a) for a in members}))
+
+    # 앱별: SteamSpy appdetails, appreviews JSON, 상세 페이지(10개 중 1개는 JSON이 0이라 HTML 폴백)
+    filler = "<p>" + "lorem ipsum dolor sit amet " * 200 + "</p>"
+    for i, a in enumerate(apps):
+        appid = a["appid"]
+        total = a["positive"] + a["negative"]
+        put(STEAMSPY_URL.format(appid=appid), json.dumps(spy_entry(a)))
+        put(APPREVIEWS_TMPL.format(appid=appid),
+            json.dumps({"success": 1, "query_summary": {"total_reviews": 0 if i % 10 == 0 else total}}))
+        if i % 10 == 0:
+            put(APP_URL_TMPL.format(appid=appid), APP_PAGE_TMPL.format(filler=filler, n=total),
+                "text/html")
+
+
+# ===== 계측 =====
+class ParseTimer:
+    def __init__(self):
+        self.seconds = 0.0
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def wrap(self, fn):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.seconds += time.perf_counter() - start
+                    self.calls += 1
+        return timed
+
+    def reset(self):
+        self.seconds, self.calls = 0.0, 0
+
+
+def lift_limits():
+    """대역 서버 상대로는 호스트 예산이 의미 없으므로 사실상 무제한으로"""
+    lim = SteamDBRateLimit.limiter
+    unlimited = (1e9, 10 ** 9)
+    lim.budgets = {host: unlimited for host in lim.budgets}
+    lim.url_budgets = {pattern: unlimited for pattern in lim.url_budgets}
+    lim.default = unlimited
+    lim.buckets.clear()
+    lim.stats.clear()
+
+
+# ===== 수집기 실행 =====
+def run_genre():
+    mod = SteamDBCollector
+    mod.steamspy_index = SteamSpyIndex()
+    mod.steamspy_index.load_tags(mod.session, list(mod.GENRE_TAGS))
+    return sum(1 for _ in mod.iter_game_rows())
+
+
+def run_all_indie():
+    mod = SteamDBCollector_AllIndie
+    mod.steamspy_index = SteamSpyIndex()
+    mod.steamspy_index.load_tags(mod.session, ["Indie"])
+    return sum(1 for _ in mod.iter_game_rows())
+
+
+def run_all():
+    return len(SteamDBAll.collect_game_data())
+
+
+COLLECTORS = {
+    "SteamDBCollector": run_genre,
+    "SteamDBCollector_AllIndie": run_all_indie,
+    "SteamDBAll": run_all,
+}
+
+
+def measure(fn, timer, memory):
+    timer.reset()
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        if memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        rows = fn()
+        elapsed = time.perf_counter() - start
+        peak = None
+        if memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return rows, elapsed, timer.seconds, peak
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fixtures", default=FIXTURE_DIR, help="녹화 디렉터리 (비어 있으면 합성)")
+    ap.add_argument("--apps", type=int, default=1000, help="합성 카탈로그 앱 수")
+    ap.add_argument("--latency", type=float, default=0.01, help="응답당 평균 지연(초)")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="503 주입 확률")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--parser", choices=sorted(SteamDBParse.BACKENDS))
+    ap.add_argument("--respect-limits", action="store_true", help="호스트별 요청 예산을 그대로 적용")
+    ap.add_argument("--no-memory", action="store_true", help="tracemalloc 실행 생략")
+    ap.add_argument("--only", choices=sorted(COLLECTORS), action="append", help="특정 수집기만 (여러 번 지정 가능)")
+    args = ap.parse_args()
+
+    store = FixtureStore(args.fixtures)
+    if not len(store):
+        print(f"픽스처 없음 → {args.apps}개 앱 합성 카탈로그 생성: {args.fixtures}")
+        synthesize_fixtures(store, make_catalog(args.apps, args.seed))
+    print(f"픽스처 {len(store)}개 / 지연 {args.latency * 1000:.0f}ms / 오류율 {args.error_rate:.0%}")
+
+    # 파서 백엔드에 시간 측정 래퍼 (SteamDBAll 도 같은 백엔드로 검색 행을 파싱)
+    timer = ParseTimer()
+    backend = SteamDBParse.set_parser(args.parser)
+    backend.search_rows = timer.wrap(backend.search_rows)
+    backend.review_rows = timer.wrap(backend.review_rows)
+    if not args.respect_limits:
+        lift_limits()
+
+    server = ReplayServer(store, latency=args.latency, error_rate=args.error_rate, seed=args.seed)
+    with server:
+        for mod in (SteamDBCollector, SteamDBCollector_AllIndie, SteamDBAll):
+            install_replay(mod.session, server.url)
+
+        print(f"HTML 파서: {backend.name}")
+        print(f"{'collector':<26} {'rows':>6} {'sec':>8} {'rows/s':>9} {'parse(s)':>9} {'parse%':>7} {'peak(MB)':>9}")
+        for name, fn in COLLECTORS.items():
+            if args.only and name not in args.only:
+                continue
+            rows, elapsed, parse_sec, _ = measure(fn, timer, memory=False)
+            peak = None if args.no_memory else measure(fn, timer, memory=True)[3]
+            peak_text = "-" if peak is None else f"{peak / 2 ** 20:.1f}"
+            print(f"{name:<26} {rows:>6} {elapsed:>8.2f} {rows / elapsed if elapsed else 0:>9.1f} "
+                  f"{parse_sec:>9.2f} {parse_sec / elapsed if elapsed else 0:>7.0%} {peak_text:>9}")
+    print(f"대역 서버: {server.stats}")
+    for mod in (SteamDBCollector, SteamDBCollector_AllIndie, SteamDBAll):
+        if not args.only or mod.__name__ in args.only:
+            print(f"{mod.__name__} {connection_summary(mod.session)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""CSV vs Parquet/Arrow 로드 + 집계 벤치마크.
+
+같은 데이터셋을 (1) CSV 문자열을 행마다 다시 파싱해서, (2) Parquet, (3) Arrow 에서 바로 읽어
+연도별 추정 수익 합계를 낸다. pandas, pyarrow 필요.
+
+    python bench/bench_columnar.py [old/IndieGameDetailList_AllIndie.csv] [--repeat 5]
+"""
+import argparse
+import csv
+import os
+import re
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import SteamDBColumnar  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+DEFAULT_CSV = os.path.join(ROOT, "old", "IndieGameDetailList_AllIndie.csv")
+
+
+def aggregate_csv(path):
+    """기존 분석 방식: 행마다 "$368,299,491.50" 문자열을 숫자로 되돌림"""
+    totals = defaultdict(float)
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            m = re.search(r"[0-9][0-9,]*(?:\.[0-9]+)?", row["EstimatedRevenue_AllLanguages"] or "")
+            if m and row["AppID"].isdigit() and row["ReleaseYear"].isdigit():  # 변환과 같이 번들 행 제외
+                totals[int(row["ReleaseYear"])] += float(m.group(0).replace(",", ""))
+    return dict(totals)
+
+
+def aggregate_columnar(path):
+    df = SteamDBColumnar.load(path)
+    return df.groupby("ReleaseYear")["EstimatedRevenue_AllLanguages"].sum().to_dict()
+
+
+def bench(fn, path, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(path)
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("csv", nargs="?", default=DEFAULT_CSV)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    frame = SteamDBColumnar.csv_to_frame(args.csv)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {"parquet": os.path.join(tmp, "data.parquet"), "arrow": os.path.join(tmp, "data.arrow")}
+        for fmt, path in paths.items():
+            SteamDBColumnar.write_frame(frame, path, fmt)
+
+        print(f"{os.path.basename(args.csv)}: {len(frame)}행, CSV {os.path.getsize(args.csv):,}B / "
+              + " / ".join(f"{fmt} {os.path.getsize(p):,}B" for fmt, p in paths.items()))
+        base_ms, base = bench(aggregate_csv, args.csv, args.repeat)
+        print(f"{'csv':<8} {base_ms:>9.1f}ms")
+        for fmt, path in paths.items():
+            ms, result = bench(aggregate_columnar, path, args.repeat)
+            same = all(abs(result.get(y, 0) - v) <= max(1.0, abs(v) * 1e-9) for y, v in base.items())
+            print(f"{fmt:<8} {ms:>9.1f}ms   x{base_ms / ms:.1f}   {'합계 일치' if same else '합계 불일치'}")
+
+
+if __name__ == "__main__":
+    main()
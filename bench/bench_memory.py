@@ -0,0 +1,97 @@
+"""결과 행 보관 방식별 메모리 벤치마크.
+
+합성 카탈로그(기본 5만 개 앱)의 검색 행을 파싱해 결과를 전부 메모리에 모은 뒤
+남아 있는 메모리(tracemalloc current)와 최대 메모리(peak)를 비교한다.
+
+  list   : 기존 방식. 행마다 문자열 10개짜리 list (수익은 "$1,234.50" 문자열로 미리 포맷)
+  record : SteamDBRecord.GameRecord (슬롯, 숫자는 int/float 그대로, 반복 문자열 intern)
+
+네트워크는 쓰지 않는다 (리뷰 수는 카탈로그 값을 그대로 사용).
+
+    python bench/bench_memory.py [--apps 50000] [--parser selectolax]
+"""
+import argparse
+import contextlib
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import SteamDBCollector_AllIndie as collector  # noqa: E402
+import SteamDBParse  # noqa: E402
+from SteamDBCommon import estimate_revenue, fmt_money  # noqa: E402
+from SteamDBRecord import intern_text  # noqa: E402
+from SteamDBSearch import SEARCH_PAGE_SIZE  # noqa: E402
+from bench_collectors import make_catalog, search_row  # noqa: E402
+
+
+def legacy_rows(candidates, enriched):
+    """GameRecord 도입 전 build_rows 와 같은 list 행"""
+    for appid, title, year, price_str, price_value, currency, discount_percent in candidates:
+        total_ss, total_all = enriched[appid]
+        revenue_ss = estimate_revenue(total_ss, price_value) if currency else 0
+        revenue_all = estimate_revenue(total_all, price_value) if currency else 0
+        yield [
+            appid, title, year, "Indie",
+            price_str, discount_percent,
+            total_ss, fmt_money(revenue_ss, currency) if currency else "0",
+            total_all, fmt_money(revenue_all, currency) if currency else "0",
+        ]
+
+
+def collect(pages, enriched, mode):
+    """검색 페이지를 차례로 파싱해 결과를 모음 (트리는 페이지마다 버려짐)"""
+    collector.intern_text = intern_text if mode == "record" else (lambda value: value)
+    build = collector.build_records if mode == "record" else legacy_rows
+    results = []
+    seen = set()
+    for html in pages:
+        candidates, _ = collector.parse_search_items(SteamDBParse.parse_search_rows(html), seen)
+        results.extend(build(candidates, enriched))
+    return results
+
+
+def measure(pages, enriched, mode):
+    gc.collect()
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        tracemalloc.start()
+        start = time.perf_counter()
+        results = collect(pages, enriched, mode)
+        elapsed = time.perf_counter() - start
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return results, current, peak, elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--apps", type=int, default=50000, help="합성 카탈로그 앱 수")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--parser", choices=sorted(SteamDBParse.BACKENDS))
+    args = ap.parse_args()
+
+    SteamDBParse.set_parser(args.parser)
+    apps = make_catalog(args.apps, args.seed)
+    pages = ["".join(map(search_row, apps[i:i + SEARCH_PAGE_SIZE])) for i in range(0, len(apps), SEARCH_PAGE_SIZE)]
+    enriched = {a["appid"]: (a["positive"] + a["negative"], a["positive"] + a["negative"] + a["month"]) for a in apps}
+    print(f"합성 카탈로그 {len(apps):,}개 앱 / 검색 페이지 {len(pages)}개 / 파서 {type(SteamDBParse.active_parser()).__name__}")
+
+    measured = {}
+    baseline = None
+    for mode in ("list", "record"):
+        results, current, peak, elapsed = measure(pages, enriched, mode)
+        measured[mode] = results
+        baseline = baseline or current
+        print(f"{mode:<7} {len(results):>7,}행  보관 {current / 2**20:>7.1f}MB ({current / len(results):>5.0f}B/행)"
+              f"  최대 {peak / 2**20:>7.1f}MB  {elapsed:>5.2f}초  x{baseline / current:.2f}")
+
+    same = [r.to_row(fmt_money) for r in measured["record"]] == measured["list"]
+    print("CSV 행 일치" if same else "CSV 행 불일치")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""HTML 파서 백엔드 마이크로 벤치마크.
+
+bench/fixtures/ 아래 저장된 페이지를 사용한다.
+  - search_*.html : 검색 결과 페이지 또는 results_html 조각
+  - app_*.html    : 앱 상세 페이지
+픽스처가 없으면 실제 페이지 크기에 맞춘 합성 페이지로 측정한다.
+
+    python bench/bench_parse.py [--repeat 20]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import SteamDBParse  # noqa: E402
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def _synthetic_search(rows=100):
+    row = (
+        '<a href="https://store.steampowered.com/app/{a}/Game_{a}/?snr=1_7_7_230_150_1" data-ds-appid="{a}" '
+        'data-ds-itemkey="App_{a}" data-ds-tagids="[492,1628,3871,19,4182]" data-ds-crtrids="[1]" '
+        'class="search_result_row ds_collapse_flag" data-search-page="1">'
+        '<div class="col search_capsule"><img src="https://cdn.akamai.steamstatic.com/steam/apps/{a}/capsule_sm_120.jpg"></div>'
+        '<div class="responsive_search_name_combined"><div class="col search_name ellipsis">'
+        '<span class="title">Game {a}</span><div><span class="platform_img win"></span></div></div>'
+        '<div class="col search_released responsive_secondrow">24 Feb, 2017</div>'
+        '<div class="col search_reviewscore responsive_secondrow"><span class="search_review_summary positive" '
+        'data-tooltip-html="Very Positive&lt;br&gt;96% of the 1,234 user reviews for this game are positive."></span></div>'
+        '<div class="col search_price_discount_combined responsive_secondrow"><div class="discount_block search_discount_block">'
+        '<div class="discount_pct">-50%</div><div class="discount_prices"><div class="discount_original_price">$14.99</div>'
+        '<div class="discount_final_price">$7.49</div></div></div></div></div><div style="clear: left;"></div></a>\n'
+    )
+    return "".join(row.format(a=100000 + i) for i in range(rows))
+
+
+def _synthetic_app(filler_kb=600):
+    filler = '<div class="game_area_description"><p>' + ("lorem ipsum dolor sit amet " * 40) + "</p></div>\n"
+    half = filler * (filler_kb * 1024 // len(filler) // 2)
+    block = (
+        '<div class="user_reviews">'
+        '<a class="user_reviews_summary_row" href="#app_reviews_hash" data-tooltip-html="92% of the 1,024 user reviews in the last 30 days are positive.">'
+        '<div class="subtitle column">Recent Reviews:</div><div class="summary column">Very Positive</div></a>'
+        '<a class="user_reviews_summary_row" href="#app_reviews_hash" data-tooltip-html="97% of the 345,678 user reviews for this game are positive.">'
+        '<div class="subtitle column all">All Reviews:</div><div class="summary column"><span class="game_review_summary positive">'
+        'Overwhelmingly Positive</span><span class="responsive_hidden">(345,678)</span>'
+        '<meta itemprop="reviewCount" content="345678"></div></a></div>\n'
+    )
+    return "<html><head><title>x</title></head><body>" + half + block + half + "</body></html>"
+
+
+def load_fixtures():
+    def read(pattern):
+        out = []
+        for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, pattern))):
+            with open(path, encoding="utf-8") as f:
+                out.append(f.read())
+        return out
+    search, apps = read("search_*.html"), read("app_*.html")
+    if not search:
+        search = [_synthetic_search()]
+    if not apps:
+        apps = [_synthetic_app()]
+    return search, apps
+
+
+def bench(fn, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in pages:
+            fn(html)
+    return (time.perf_counter() - start) / (repeat * len(pages)) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    search, apps = load_fixtures()
+    print(f"검색 페이지 {len(search)}개 (평균 {sum(map(len, search)) // len(search):,}B), "
+          f"앱 페이지 {len(apps)}개 (평균 {sum(map(len, apps)) // len(apps):,}B)")
+
+    results = {}
+    for name in SteamDBParse.BACKENDS:
+        try:
+            SteamDBParse.set_parser(name)
+        except ImportError:
+            print(f"{name:<11} 설치 안 됨")
+            continue
+        results[name] = (
+            bench(SteamDBParse.parse_search_rows, search, args.repeat),
+            bench(lambda h: SteamDBParse.parse_review_count(h, partial=False), apps, args.repeat),
+            bench(SteamDBParse.parse_review_count, apps, args.repeat),
+        )
+
+    base = results.get("bs4")
+    print(f"{'backend':<11} {'search(ms)':>11} {'app full(ms)':>13} {'app partial(ms)':>16}")
+    for name, (s, full, part) in results.items():
+        line = f"{name:<11} {s:>11.2f} {full:>13.2f} {part:>16.3f}"
+        if base:
+            line += f"   검색 x{base[0] / s:.1f} / 앱 x{base[1] / part:.0f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
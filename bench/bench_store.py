@@ -0,0 +1,124 @@
+"""CSV 전체 스캔 vs 이력 DB(SteamDBStore) 질의 벤치마크.
+
+old/ 의 CSV 덤프를 임시 DB로 가져온 뒤 같은 질문을 두 방식으로 푼다.
+  history    : 앱 하나의 덤프별 SteamSpy 리뷰 수 (모든 CSV를 처음부터 끝까지 읽음)
+  genre-year : 최신 덤프의 장르×출시 연도별 추정 수익 합계 ($ 가격만)
+그리고 수집 기본 경로(저장소가 켜진 genre/all-indie 실행)가 쓰는 tee() 가 CSV 가져오기와 같은 행을 남기는지 확인한다.
+
+    python bench/bench_store.py [--appid 286160] [--repeat 5] [CSV ...]
+"""
+import argparse
+import csv
+import glob
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from SteamDBStore import SnapshotStore, crawl_date_of, snapshot_from_csv, split_genres  # noqa: E402
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+DEFAULT_CSVS = sorted(glob.glob(os.path.join(ROOT, "old", "IndieGameDetailList*.csv")))
+
+
+def dump_date(path):
+    """벤치용 수집일: 파일명의 _YYYYMMDD, 없으면 파일 수정일 (SteamDBStore import 는 --date 를 요구)"""
+    return crawl_date_of(path) or date.fromtimestamp(os.path.getmtime(path)).isoformat()
+
+
+def history_csv(paths, appid):
+    """덤프마다 전체 행을 읽어 appid 행을 찾음"""
+    found = []
+    for path in paths:
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                if row["AppID"] == str(appid):
+                    snap = snapshot_from_csv(row)
+                    found.append((dump_date(path), snap[6]))
+                    break
+    return sorted(set(found))
+
+
+def genre_year_csv(paths, crawl_date):
+    """해당 수집일 덤프를 모두 읽어 앱당 한 번씩 장르×연도 합산 (DB 와 같은 규칙)"""
+    snaps, genres = {}, defaultdict(set)
+    for path in paths:
+        if dump_date(path) != crawl_date:
+            continue
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                snap = snapshot_from_csv(row)
+                if snap is None:
+                    continue
+                old = snaps.get(snap[0])
+                snaps[snap[0]] = snap if old is None else tuple(n if n is not None else o for n, o in zip(snap, old))
+                genres[snap[0]].update(split_genres(row.get("Genre")))
+    totals = defaultdict(lambda: [0, 0.0])
+    for appid, snap in snaps.items():
+        if snap[4] != "$":
+            continue
+        for genre in genres[appid]:
+            entry = totals[(genre, snap[2])]
+            entry[0] += 1
+            entry[1] += snap[9] or 0.0
+    return totals
+
+
+def check_tee(path, tmp):
+    """수집 출력처럼 CSV 행 list 를 tee() 로 흘려보내 오늘 날짜로 기록 → import_csv 와 행 수 비교"""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        rows = list(reader)
+    with SnapshotStore(os.path.join(tmp, "tee.sqlite")) as teed, SnapshotStore(os.path.join(tmp, "import.sqlite")) as imported:
+        passed = sum(1 for _ in teed.tee(rows, header, os.path.basename(path)))
+        imported.import_csv(path, dump_date(path))
+        ok = passed == len(rows) and [n for _, n in teed.dates()] == [n for _, n in imported.dates()] \
+            and teed.latest_date() == date.today().isoformat()
+    print(f"tee        {os.path.basename(path)}: {passed}행 통과, {teed.stats['rows']}행 기록   {'일치' if ok else '불일치'}")
+    return ok
+
+
+def bench(fn, repeat, *args):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(*args)
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("csv", nargs="*", default=DEFAULT_CSVS)
+    ap.add_argument("--appid", type=int, default=286160)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, SnapshotStore(os.path.join(tmp, "snapshots.sqlite")) as store:
+        start = time.perf_counter()
+        for path in args.csv:
+            store.import_csv(path, dump_date(path))
+        store.conn.execute("PRAGMA optimize")
+        print(f"CSV {len(args.csv)}개 가져오기: {store.stats['rows']}행, {time.perf_counter() - start:.2f}초 (한 번만)")
+        latest = store.latest_date()
+
+        csv_ms, csv_hist = bench(history_csv, args.repeat, args.csv, args.appid)
+        db_ms, db_hist = bench(store.review_history, args.repeat, args.appid)
+        same = csv_hist == [(d, ss) for d, ss, *_ in db_hist]
+        print(f"history    csv {csv_ms:>8.1f}ms   db {db_ms:>7.2f}ms   x{csv_ms / db_ms:,.0f}   {'일치' if same else '불일치'}")
+
+        csv_ms, csv_gy = bench(genre_year_csv, args.repeat, args.csv, latest)
+        db_ms, db_gy = bench(store.revenue_by_genre_year, args.repeat, latest)
+        same = {(g, y): (n, round(v, 2)) for (g, y), (n, v) in csv_gy.items()} == \
+               {(g, y): (n, round(v, 2)) for g, y, n, v in db_gy}
+        print(f"genre-year csv {csv_ms:>8.1f}ms   db {db_ms:>7.2f}ms   x{csv_ms / db_ms:,.0f}   {'일치' if same else '불일치'}")
+
+        if args.csv and not check_tee(args.csv[0], tmp):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()